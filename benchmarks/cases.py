@@ -0,0 +1,278 @@
+import os
+import tempfile
+import time
+from functools import partial
+from types import SimpleNamespace
+from typing import Callable, NamedTuple
+
+import networkx as nx
+import numpy as np
+
+from nneslib.edge import edge_significance
+from nneslib.evaluation import (cascading_failure, community_structure, global_topology, rank_agreement,
+                                 robustness, spreading)
+from nneslib.node import node_significance
+from nneslib.utils import brandes, budget, cache, csr, cut, edge_stream, parallel, similarity
+from nneslib.utils.budget import Budget
+from nneslib.utils.profiling import Profiler, phase, profiled
+
+# The edge list files of the streaming cases, removed when the process exits
+_SCRATCH = tempfile.TemporaryDirectory(prefix="nneslib-benchmarks-")
+
+
+class Case(NamedTuple):
+    """
+    A benchmarked function. `prepare` does the untimed setup on a graph and returns the call to time.
+    Cases whose cost grows too fast only run up to `max_nodes`.
+    """
+    name: str
+    prepare: Callable[[nx.Graph], Callable[[], object]]
+    max_nodes: int = None
+
+
+def _call(function: Callable, *args, **kwargs) -> Callable[[nx.Graph], Callable[[], object]]:
+    """
+    A `prepare` calling function(graph, *args, **kwargs).
+    """
+    return lambda graph: partial(function, graph, *args, **kwargs)
+
+
+def _edge_endpoints(graph: nx.Graph) -> tuple:
+    index = {node: i for i, node in enumerate(graph.nodes())}
+    edges = np.array([(index[u], index[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+    return edges[:, 0], edges[:, 1]
+
+
+def _edge_list(graph: nx.Graph, binary: bool = True) -> str:
+    """
+    Write the edges of graph to a scratch edge list file, binary or text.
+    """
+    sources, targets = _edge_endpoints(graph)
+    if binary:
+        filepath = os.path.join(_SCRATCH.name, "edges.nnes")
+        edge_stream.write_edge_list(filepath, sources, targets)
+    else:
+        filepath = os.path.join(_SCRATCH.name, "edges.txt")
+        np.savetxt(filepath, np.column_stack([sources, targets]), fmt="%d")
+    return filepath
+
+
+def _streaming_degree_centrality(graph: nx.Graph, binary: bool = True) -> Callable[[], object]:
+    return partial(node_significance.streaming_degree_centrality, _edge_list(graph, binary))
+
+
+def _streaming_degree_product(graph: nx.Graph) -> Callable[[], object]:
+    return partial(edge_significance.streaming_degree_product, _edge_list(graph),
+                   os.path.join(_SCRATCH.name, "degree_product.nnes"))
+
+
+def _write_edge_list(graph: nx.Graph) -> Callable[[], object]:
+    sources, targets = _edge_endpoints(graph)
+    return partial(edge_stream.write_edge_list, os.path.join(_SCRATCH.name, "written.nnes"), sources, targets)
+
+
+def _edge_chunks(graph: nx.Graph, binary: bool = True) -> Callable[[], object]:
+    filepath = _edge_list(graph, binary)
+    return lambda: sum(len(sources) for sources, _, _ in edge_stream.edge_chunks(filepath, chunk_size=1024))
+
+
+def _stream_degrees(graph: nx.Graph) -> Callable[[], object]:
+    return partial(edge_stream.stream_degrees, _edge_list(graph))
+
+
+def _label_lookup(graph: nx.Graph) -> Callable[[], object]:
+    return partial(edge_stream.label_lookup, np.unique(np.concatenate(_edge_endpoints(graph))))
+
+
+def _label_indices(graph: nx.Graph) -> Callable[[], object]:
+    sources, targets = _edge_endpoints(graph)
+    return partial(edge_stream.label_indices, np.unique(np.concatenate([sources, targets])), sources)
+
+
+def _uneven_tasks(graph: nx.Graph) -> Callable[[], object]:
+    """
+    A pool of tasks as uneven as the degrees, each sleeping 20 microseconds per neighbor.
+    """
+    return partial(parallel.parallel_map, time.sleep, [2e-5 * degree for _, degree in graph.degree()], 2)
+
+
+def _budgeted_map(graph: nx.Graph) -> Callable[[], object]:
+    nodes = list(graph.nodes())
+    return partial(budget.budgeted_map, abs, nodes, Budget(max_work=len(nodes) // 2), lambda task: 1)
+
+
+@profiled
+def _phases(graph: nx.Graph, phases: int) -> SimpleNamespace:
+    """
+    A profiled method doing nothing but entering `phases` phases, to time the hooks themselves.
+    """
+    for _ in range(phases):
+        with phase("empty"):
+            pass
+    return SimpleNamespace(attrs=None)
+
+
+def _under_profiler(prepare: Callable[[nx.Graph], Callable[[], object]]) -> Callable[[nx.Graph], Callable[[], object]]:
+    """
+    A `prepare` timing the call of `prepare` inside an active Profiler.
+    """
+    def prepare_profiled(graph: nx.Graph) -> Callable[[], object]:
+        call = prepare(graph)
+
+        def profiled_call():
+            with Profiler():
+                return call()
+        return profiled_call
+    return prepare_profiled
+
+
+def _robustness_curve(graph: nx.Graph) -> Callable[[], object]:
+    return partial(robustness.robustness_curve, graph, edge_significance.degree_product(graph))
+
+
+def _robustness_curves(graph: nx.Graph) -> Callable[[], object]:
+    significances = [edge_significance.degree_product(graph), edge_significance.diffusion_importance(graph)]
+    return partial(robustness.robustness_curves, graph, significances)
+
+
+def _cascading_failure(graph: nx.Graph) -> Callable[[], object]:
+    return partial(cascading_failure.cascading_failure, graph, edge_significance.degree_product(graph), 0.5,
+                   attacked=10)
+
+
+def _cascade_sweep(graph: nx.Graph) -> Callable[[], object]:
+    return partial(cascading_failure.cascade_sweep, graph, edge_significance.degree_product(graph),
+                   np.linspace(0, 1, 11), [0.5, 1.0, 1.5], attacked=10)
+
+
+def _rank_agreement(graph: nx.Graph) -> Callable[[], object]:
+    return partial(rank_agreement.rank_agreement, edge_significance.degree_product(graph),
+                   edge_significance.diffusion_importance(graph))
+
+
+def _edge_rankings(graph: nx.Graph) -> list:
+    return [edge_significance.degree_product(graph), edge_significance.diffusion_importance(graph),
+            edge_significance.brightness(graph)]
+
+
+def _aligned_values(graph: nx.Graph) -> Callable[[], object]:
+    return partial(rank_agreement.aligned_values, _edge_rankings(graph))
+
+
+def _agreement_matrix(graph: nx.Graph, metric: str = "kendall", k: int = None) -> Callable[[], object]:
+    return partial(rank_agreement.agreement_matrix, _edge_rankings(graph), metric, k)
+
+
+def _lookup(graph: nx.Graph) -> Callable[[], object]:
+    adjacency = csr.to_csr(graph)[0]
+    sources, targets = _edge_endpoints(graph)
+    return partial(csr.lookup, adjacency, sources, targets)
+
+
+def _binary_adjacency(graph: nx.Graph) -> Callable[[], object]:
+    return partial(csr.binary_adjacency, csr.to_csr(graph)[0])
+
+
+def _common_neighbors(graph: nx.Graph) -> Callable[[], object]:
+    adjacency = csr.binary_adjacency(csr.to_csr(graph)[0])
+    sources, targets = _edge_endpoints(graph)
+    return partial(csr.common_neighbors, adjacency, sources, targets)
+
+
+def _ratio_cut(graph: nx.Graph) -> Callable[[], object]:
+    nodes = list(graph.nodes())
+    return partial(cut.ratio_cut, graph, [nodes[i::4] for i in range(4)])
+
+
+def _partition_cuts(graph: nx.Graph) -> Callable[[], object]:
+    partitions = np.random.default_rng(0).integers(0, 8, size=(100, graph.number_of_nodes()))
+    return partial(cut.partition_cuts, graph, partitions)
+
+
+def _jaccard_similarity(graph: nx.Graph) -> Callable[[], object]:
+    neighborhoods = {node: set(graph.adj[node]) for node in graph.nodes()}
+    pairs = [(neighborhoods[u], neighborhoods[v]) for u, v in graph.edges()]
+    return lambda: [similarity.jaccard_similarity(i, j) for i, j in pairs]
+
+
+# Every public function of node_significance, edge_significance, evaluation.* and utils.*, in the calling process.
+# utils.parallel is covered by the n_jobs variants, which measure pool overhead rather than the computation, and by
+# a pool of uneven tasks, which measures how busy it keeps the workers. utils.budget is covered by the budget
+# variants, whose work limits keep them reproducible where a time limit would not.
+CASES = [
+    Case("node_significance.centrality_metric_spectrum", _call(node_significance.centrality_metric_spectrum, 4),
+         max_nodes=2000),
+    Case("node_significance.degree_centrality", _call(node_significance.degree_centrality)),
+    Case("node_significance.betweenness_centrality", _call(node_significance.betweenness_centrality)),
+    Case("node_significance.betweenness_centrality[k=64]",
+         _call(node_significance.betweenness_centrality, k=64, seed=0)),
+    Case("node_significance.betweenness_centrality[budget max_work=64]",
+         _call(node_significance.betweenness_centrality, seed=0, budget=Budget(max_work=64))),
+    Case("node_significance.closeness_centrality", _call(node_significance.closeness_centrality), max_nodes=1000),
+    Case("node_significance.EffC", _call(node_significance.EffC), max_nodes=400),
+    Case("node_significance.EffC[budget max_work=50]", _call(node_significance.EffC, budget=Budget(max_work=50)),
+         max_nodes=2000),
+    Case("node_significance.streaming_degree_centrality", _streaming_degree_centrality),
+    Case("node_significance.streaming_degree_centrality[text]", partial(_streaming_degree_centrality, binary=False)),
+    Case("edge_significance.betweenness_centrality", _call(edge_significance.betweenness_centrality)),
+    Case("edge_significance.betweenness_centrality[budget max_work=64]",
+         _call(edge_significance.betweenness_centrality, seed=0, budget=Budget(max_work=64))),
+    Case("edge_significance.degree_product", _call(edge_significance.degree_product)),
+    Case("edge_significance.streaming_degree_product", _streaming_degree_product),
+    Case("edge_significance.diffusion_importance", _call(edge_significance.diffusion_importance)),
+    Case("edge_significance.brightness", _call(edge_significance.brightness)),
+    Case("edge_significance.brightness[budget max_work=100]",
+         _call(edge_significance.brightness, budget=Budget(max_work=100))),
+    Case("edge_significance.ERW_Kpath", _call(edge_significance.ERW_Kpath, k=5, ruo=20000, beta=0.01, seed=0)),
+    Case("edge_significance.ERW_Kpath[budget max_work=5000]",
+         _call(edge_significance.ERW_Kpath, k=5, ruo=20000, beta=0.01, seed=0, budget=Budget(max_work=5000))),
+    Case("edge_significance.ERW_Kpath[n_jobs=2]",
+         _call(edge_significance.ERW_Kpath, k=5, ruo=20000, beta=0.01, seed=0, n_jobs=2)),
+    Case("community_structure.significance_index", _call(community_structure.significance_index, 4),
+         max_nodes=2000),
+    Case("community_structure.significance_index_curve",
+         _call(community_structure.significance_index_curve, list(range(2, 11))), max_nodes=2000),
+    Case("community_structure.node_deletion_significance_index",
+         _call(community_structure.node_deletion_significance_index, 4), max_nodes=200),
+    Case("community_structure.node_deletion_significance_index[perturbation]",
+         _call(community_structure.node_deletion_significance_index, 4, method="perturbation"), max_nodes=2000),
+    Case("global_topology.giant_component_fraction", _call(global_topology.giant_component_fraction)),
+    Case("global_topology.normalized_susceptibility", _call(global_topology.normalized_susceptibility)),
+    Case("robustness.robustness_curve", _robustness_curve),
+    Case("robustness.robustness_curves", _robustness_curves),
+    Case("cascading_failure.cascading_failure", _cascading_failure),
+    Case("cascading_failure.cascade_sweep[11 alphas x 3 thetas]", _cascade_sweep),
+    Case("spreading.spreading_influence[10 realizations]",
+         _call(spreading.spreading_influence, 0.1, realizations=10, seed=0)),
+    Case("rank_agreement.rank_agreement", _rank_agreement),
+    Case("rank_agreement.aligned_values[3 rankings]", _aligned_values),
+    Case("rank_agreement.agreement_matrix[3 rankings]", _agreement_matrix),
+    Case("rank_agreement.agreement_matrix[3 rankings, spearman]", partial(_agreement_matrix, metric="spearman")),
+    Case("brandes.brandes_betweenness", _call(brandes.brandes_betweenness)),
+    Case("brandes.brandes_betweenness[epsilon=0.05]", _call(brandes.brandes_betweenness, epsilon=0.05, seed=0)),
+    Case("brandes.brandes_betweenness[n_jobs=2]", _call(brandes.brandes_betweenness, n_jobs=2)),
+    Case("budget.budgeted_map", _budgeted_map),
+    Case("parallel.parallel_map[uneven tasks, n_jobs=2]", _uneven_tasks),
+    Case("cache.graph_fingerprint", _call(cache.graph_fingerprint)),
+    Case("csr.to_csr", _call(csr.to_csr)),
+    Case("csr.edge_indexed_csr", _call(csr.edge_indexed_csr)),
+    Case("csr.binary_adjacency", _binary_adjacency),
+    Case("csr.lookup", _lookup),
+    Case("csr.common_neighbors", _common_neighbors),
+    Case("edge_stream.write_edge_list", _write_edge_list),
+    Case("edge_stream.edge_chunks", _edge_chunks),
+    Case("edge_stream.edge_chunks[text]", partial(_edge_chunks, binary=False)),
+    Case("edge_stream.stream_degrees", _stream_degrees),
+    Case("edge_stream.label_lookup", _label_lookup),
+    Case("edge_stream.label_indices", _label_indices),
+    Case("profiling.phase[1000 phases]", _call(_phases, 1000)),
+    Case("profiling.phase[1000 phases, Profiler]", _under_profiler(_call(_phases, 1000))),
+    Case("edge_significance.diffusion_importance[Profiler]",
+         _under_profiler(_call(edge_significance.diffusion_importance))),
+    Case("cut.ratio_cut", _ratio_cut),
+    Case("cut.partition_cuts[100 partitions]", _partition_cuts),
+    Case("similarity.jaccard_similarity", _jaccard_similarity),
+    Case("similarity.jaccard_edges", _call(similarity.jaccard_edges)),
+    Case("similarity.jaccard_top_k", _call(similarity.jaccard_top_k, 10)),
+    Case("similarity.jaccard_threshold", _call(similarity.jaccard_threshold, 0.2)),
+]
@@ -0,0 +1,40 @@
+import networkx as nx
+
+
+__all__ = ['GRAPH_FAMILIES', 'erdos_renyi', 'barabasi_albert', 'stochastic_block_model']
+
+# Every family has the same average degree, so that sizes are comparable across families
+AVERAGE_DEGREE = 8
+
+
+def erdos_renyi(n: int, seed: int = 0) -> nx.Graph:
+    """
+    G(n, m) random graph with n * AVERAGE_DEGREE / 2 edges.
+    """
+    return nx.gnm_random_graph(n, n * AVERAGE_DEGREE // 2, seed=seed)
+
+
+def barabasi_albert(n: int, seed: int = 0) -> nx.Graph:
+    """
+    Preferential attachment graph, every new node attaching AVERAGE_DEGREE / 2 edges.
+    """
+    return nx.barabasi_albert_graph(n, AVERAGE_DEGREE // 2, seed=seed)
+
+
+def stochastic_block_model(n: int, seed: int = 0, blocks: int = 4, mixing: float = 0.2) -> nx.Graph:
+    """
+    Stochastic block model of equal blocks, where a fraction `mixing` of the expected degree goes to other blocks.
+    """
+    sizes = [n // blocks + (1 if block < n % blocks else 0) for block in range(blocks)]
+    p_in = (1 - mixing) * AVERAGE_DEGREE / max(n / blocks - 1, 1)
+    p_out = mixing * AVERAGE_DEGREE / max(n - n / blocks, 1)
+    probabilities = [[min(p_in, 1.0) if i == j else min(p_out, 1.0) for j in range(blocks)] for i in range(blocks)]
+    graph = nx.stochastic_block_model(sizes, probabilities, seed=seed)
+    return nx.Graph(graph)  # drop the partition metadata
+
+
+GRAPH_FAMILIES = {
+    "er": erdos_renyi,
+    "ba": barabasi_albert,
+    "sbm": stochastic_block_model,
+}
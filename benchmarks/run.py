@@ -0,0 +1,164 @@
+"""
+Benchmark every significance and evaluation method on synthetic graphs of increasing size.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --sizes 250 500 --families ba --cases edge_significance --baseline baseline.json
+
+Every case records the best wall time of `--repeat` runs and the peak Python/numpy memory of one more run traced by
+tracemalloc (worker processes are not traced), then the exponent b of time ~ n^b fitted over the sizes. With
+`--baseline`, the results are compared against an earlier output of the same command and the process exits with
+status 1 if a case got slower or bigger than `--tolerance` times its baseline, or its scaling exponent grew by more
+than `--exponent-tolerance`. Baselines are only comparable on the same machine and dependency versions.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+import networkx as nx
+import numpy as np
+import scipy
+
+from benchmarks.cases import CASES, Case
+from benchmarks.graphs import GRAPH_FAMILIES
+
+
+DEFAULT_SIZES = [250, 500, 1000, 2000]
+
+
+def measure(call: Callable[[], object], repeat: int = 3) -> tuple:
+    """
+    :return: the best wall time in seconds of `repeat` calls and the peak traced memory in bytes of one more call
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def scaling_exponent(sizes: list, seconds: list) -> float:
+    """
+    The slope of the least-squares line through (log n, log t), None with less than two sizes.
+    """
+    if len(sizes) < 2:
+        return None
+    return float(np.polyfit(np.log(sizes), np.log(np.maximum(seconds, 1e-9)), 1)[0])
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "numpy": np.__version__, "scipy": scipy.__version__, "networkx": nx.__version__}
+
+
+def run(cases: List[Case], families: list, sizes: list, repeat: int = 3, seed: int = 0, log=None) -> dict:
+    """
+    Run the cases on every family and size.
+
+    :return: the JSON serializable report with the "results" of every run and the "scaling" of every case and family
+    """
+    results, scaling = [], []
+    for family in families:
+        graphs = {n: GRAPH_FAMILIES[family](n, seed) for n in sizes}
+        for case in cases:
+            measured = []
+            for n, graph in graphs.items():
+                if case.max_nodes is not None and n > case.max_nodes:
+                    continue
+                entry = {"case": case.name, "family": family, "nodes": n, "edges": graph.number_of_edges()}
+                try:
+                    entry["seconds"], entry["peak_bytes"] = measure(case.prepare(graph), repeat)
+                    measured.append((n, entry["seconds"]))
+                except Exception as error:  # keep going, the report shows what failed
+                    entry["error"] = repr(error)
+                results.append(entry)
+                if log is not None:
+                    log(_format_entry(entry))
+            exponent = scaling_exponent([n for n, _ in measured], [seconds for _, seconds in measured])
+            scaling.append({"case": case.name, "family": family, "exponent": exponent})
+    return {"environment": environment(), "sizes": sizes, "repeat": repeat, "seed": seed,
+            "results": results, "scaling": scaling}
+
+
+def _format_entry(entry: dict) -> str:
+    label = f"{entry['case']:<70} {entry['family']:<4} n={entry['nodes']:<6}"
+    if "error" in entry:
+        return f"{label} ERROR {entry['error']}"
+    return f"{label} {entry['seconds']:10.4f}s {entry['peak_bytes'] / 2 ** 20:10.2f}MiB"
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 1.5, exponent_tolerance: float = 0.25,
+            min_seconds: float = 0.01, min_bytes: int = 1 << 20) -> list:
+    """
+    Compare a report with a baseline report. Runs faster than `min_seconds` or smaller than `min_bytes` in the
+    baseline are too noisy to be compared in time or memory respectively.
+
+    :return: the list of regressions, as human readable strings
+    """
+    regressions = []
+    reference = {(entry["case"], entry["family"], entry["nodes"]): entry for entry in baseline["results"]}
+    for entry in report["results"]:
+        label = f"{entry['case']} on {entry['family']} n={entry['nodes']}"
+        old = reference.get((entry["case"], entry["family"], entry["nodes"]))
+        if old is None or "error" in old:
+            continue
+        if "error" in entry:
+            regressions.append(f"{label}: {entry['error']}")
+            continue
+        if old["seconds"] >= min_seconds and entry["seconds"] > tolerance * old["seconds"]:
+            regressions.append(f"{label}: {entry['seconds']:.4f}s, baseline {old['seconds']:.4f}s")
+        if old["peak_bytes"] >= min_bytes and entry["peak_bytes"] > tolerance * old["peak_bytes"]:
+            regressions.append(f"{label}: peak {entry['peak_bytes']} bytes, baseline {old['peak_bytes']} bytes")
+    reference = {(entry["case"], entry["family"]): entry["exponent"] for entry in baseline["scaling"]}
+    for entry in report["scaling"]:
+        old = reference.get((entry["case"], entry["family"]))
+        if old is not None and entry["exponent"] is not None and entry["exponent"] > old + exponent_tolerance:
+            regressions.append(f"{entry['case']} on {entry['family']}: scales as n^{entry['exponent']:.2f}, "
+                               f"baseline n^{old:.2f}")
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark nneslib methods on synthetic graphs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="numbers of nodes")
+    parser.add_argument("--families", nargs="+", default=list(GRAPH_FAMILIES), choices=list(GRAPH_FAMILIES))
+    parser.add_argument("--cases", nargs="+", default=None, help="only run the cases containing one of these")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best one is kept")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the graph generators")
+    parser.add_argument("--output", default=None, help="the JSON file to write the report to")
+    parser.add_argument("--baseline", default=None, help="a JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed time and memory ratio to the baseline")
+    parser.add_argument("--exponent-tolerance", type=float, default=0.25, help="allowed growth of scaling exponents")
+    args = parser.parse_args(argv)
+
+    cases = CASES if args.cases is None else [case for case in CASES if any(part in case.name for part in args.cases)]
+    report = run(cases, args.families, sorted(args.sizes), args.repeat, args.seed, log=print)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            regressions = compare(report, json.load(file), args.tolerance, args.exponent_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
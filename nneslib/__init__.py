@@ -1 +1 @@
-name = "nneslib"
\ No newline at end of file
+__version__ = "0.1"
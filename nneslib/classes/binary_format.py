@@ -0,0 +1,174 @@
+import json
+import struct
+
+import networkx as nx
+import numpy as np
+
+from nneslib.classes.edge_significance import EdgeSignificance
+from nneslib.classes.edge_store import EdgeStore
+from nneslib.classes.node_significance import NodeSignificance
+from nneslib.classes.significance import Significance
+
+
+__all__ = ['save', 'load', 'write_arrays', 'create_arrays', 'read_arrays']
+
+# A file starts with MAGIC, the byte length of the JSON header as a little-endian uint64, and the header itself.
+# The arrays follow, each starting on an ALIGNMENT boundary at the offset the header gives relative to the data start.
+MAGIC = b"NNESLIB\x01"
+ALIGNMENT = 64
+_LENGTH = struct.Struct("<Q")
+
+
+def _encode_label(label):
+    if isinstance(label, tuple):
+        return {"tuple": [_encode_label(item) for item in label]}
+    if isinstance(label, np.generic):
+        return label.item()
+    if label is None or isinstance(label, (str, int, float)):
+        return label
+    raise ValueError(f"Node label {label!r} of type {type(label)} can not be written")
+
+
+def _decode_label(label):
+    if isinstance(label, dict):
+        return tuple(_decode_label(item) for item in label["tuple"])
+    return label
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _write_header(file, header: dict, arrays: dict) -> tuple:
+    """
+    Write the magic, the JSON header and the layout of arrays, a dict of {name: (dtype, shape)}.
+
+    :return: the byte offset of the data start, the dict of {name: offset from the data start} and the data size
+    """
+    layout, offset = {}, 0
+    for name, (dtype, shape) in arrays.items():
+        layout[name] = {"dtype": dtype.str, "shape": list(shape), "offset": offset}
+        offset = _align(offset + dtype.itemsize * int(np.prod(shape)))
+    encoded = json.dumps(dict(header, arrays=layout), default=repr).encode("utf8")
+    file.write(MAGIC + _LENGTH.pack(len(encoded)) + encoded)
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(encoded))
+    return data_start, {name: item["offset"] for name, item in layout.items()}, offset
+
+
+def write_arrays(filepath: str, header: dict, arrays: dict) -> None:
+    """
+    Write a JSON header and raw little-endian arrays to one file.
+
+    :param filepath: the file path to write
+    :param header: the JSON serializable metadata, the "arrays" entry is added
+    :param arrays: a dict of {name: 1-d array}
+    """
+    arrays = {name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("<"))
+              for name, array in arrays.items()}
+    with open(filepath, "wb") as file:
+        data_start, offsets, size = _write_header(file, header, {name: (array.dtype, array.shape)
+                                                                 for name, array in arrays.items()})
+        for name, array in arrays.items():
+            file.seek(data_start + offsets[name])
+            array.tofile(file)
+        file.truncate(data_start + size)
+
+
+def create_arrays(filepath: str, header: dict, arrays: dict) -> dict:
+    """
+    Create a file of :func:`write_arrays` whose arrays are filled later, through writable memory maps. The arrays are
+    zeros until written, and are flushed to the file when the maps are closed or flushed.
+
+    :param filepath: the file path to write
+    :param header: the JSON serializable metadata, the "arrays" entry is added
+    :param arrays: a dict of {name: (dtype, shape)}
+    :return: the dict of {name: writable np.memmap}, an empty array for an empty shape
+    """
+    arrays = {name: (np.dtype(dtype).newbyteorder("<"), tuple(shape)) for name, (dtype, shape) in arrays.items()}
+    with open(filepath, "wb") as file:
+        data_start, offsets, size = _write_header(file, header, arrays)
+        file.truncate(data_start + size)
+    return {name: np.memmap(filepath, dtype=dtype, mode="r+", offset=data_start + offsets[name], shape=shape)
+            if int(np.prod(shape)) else np.empty(shape, dtype=dtype) for name, (dtype, shape) in arrays.items()}
+
+
+def read_arrays(filepath: str, mmap: bool = True) -> tuple:
+    """
+    Read a file of :func:`write_arrays`.
+
+    :param filepath: the file path to read
+    :param mmap: whether to memory-map the arrays (read-only) instead of reading them into memory
+    :return: the header and the dict of {name: array}
+    :raise: :class:`ValueError` if the file is not in this format
+    """
+    with open(filepath, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filepath} is not a nneslib binary file")
+        (length,) = _LENGTH.unpack(file.read(_LENGTH.size))
+        header = json.loads(file.read(length).decode("utf8"))
+    data_start = _align(len(MAGIC) + _LENGTH.size + length)
+    arrays = {}
+    for name, layout in header.pop("arrays").items():
+        dtype, shape, offset = np.dtype(layout["dtype"]), tuple(layout["shape"]), data_start + layout["offset"]
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        elif mmap:
+            arrays[name] = np.memmap(filepath, dtype=dtype, mode="r", offset=offset, shape=shape)
+        else:
+            arrays[name] = np.fromfile(filepath, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+    return header, arrays
+
+
+def save(significance: Significance, filepath: str) -> None:
+    """
+    Write a NodeSignificance or EdgeSignificance to one binary file: the method metadata and the node label table in a
+    JSON header, then float64 values and, for edges, int32 (int64 beyond 2^31 nodes) source and target indices into
+    the label table.
+
+    :param significance: a NodeSignificance or EdgeSignificance object
+    :param filepath: the file path to write
+    :raise: :class:`ValueError` for another Significance or a node label that is not a str, int, float or tuple
+    """
+    header = {"algorithm": significance.method_name, "params": significance.method_parameters,
+              "attrs": getattr(significance, "attrs", None)}
+    if isinstance(significance, EdgeSignificance):
+        store = significance.store
+        header.update(kind="edge", directed=store.directed, labels=[_encode_label(node) for node in store.vertices])
+        arrays = {"sources": store.sources, "targets": store.targets, "values": store.values}
+    elif isinstance(significance, NodeSignificance):
+        header.update(kind="node", labels=[_encode_label(node) for node in significance.labels])
+        arrays = {"values": significance.values}
+    else:
+        raise ValueError(f"Expected an EdgeSignificance or a NodeSignificance, got {type(significance)}")
+    write_arrays(filepath, header, arrays)
+
+
+def load(filepath: str, graph: nx.Graph = None, mmap: bool = True) -> Significance:
+    """
+    Read a Significance written by :func:`save`.
+
+    The arrays are memory-mapped, so opening a file only reads its header, and the dict of significances is only built
+    if `significance` is accessed. Array access (`values`, `store`, `get`, `to_sparse`) reads what it touches.
+
+    :param filepath: the file path to read
+    :param graph: the graph the result refers to, if available
+    :param mmap: whether to memory-map the arrays instead of reading them into memory
+    :return: a NodeSignificance or EdgeSignificance object
+
+    .. rubric:: Example
+
+    >>> from nneslib.classes.binary_format import load
+    >>> from nneslib.edge import edge_significance
+    >>> import networkx as nx
+    >>> G = nx.karate_club_graph()
+    >>> edge_significance.diffusion_importance(G).save("diffusion.nnes")
+    >>> es = load("diffusion.nnes", G)
+    >>> es.store.values[:10]
+    """
+    header, arrays = read_arrays(filepath, mmap)
+    labels = [_decode_label(label) for label in header["labels"]]
+    if header["kind"] == "edge":
+        store = EdgeStore(arrays["sources"], arrays["targets"], arrays["values"], labels, header["directed"])
+        return EdgeSignificance.from_store(store, graph, header["algorithm"], header["params"], header["attrs"])
+    return NodeSignificance.from_arrays(labels, arrays["values"], graph, header["algorithm"], header["params"],
+                                        header["attrs"])
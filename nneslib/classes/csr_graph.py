@@ -0,0 +1,258 @@
+from collections.abc import Sequence
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+
+__all__ = ['CSRGraph']
+
+# Edges whose labels are built at once when iterating over the edges of a CSRGraph
+_ITERATION_CHUNK = 1 << 16
+
+
+def _unique(values: np.ndarray, return_inverse: bool = False):
+    """
+    np.unique with one sort, as its hash table is much slower on large integer keys.
+
+    :return: the sorted unique values, and if return_inverse the position of every value among them
+    """
+    order = np.argsort(values)
+    ordered = values[order]
+    new = np.ones(len(values), dtype=bool)
+    new[1:] = ordered[1:] != ordered[:-1]
+    if not return_inverse:
+        return ordered[new]
+    inverse = np.empty(len(values), dtype=np.int64)
+    inverse[order] = np.cumsum(new) - 1
+    return ordered[new], inverse
+
+
+class _EdgeList(Sequence):
+    """
+    The (source label, target label) edges of a CSRGraph, built from its edge arrays on access rather than stored.
+    """
+    def __init__(self, labels: list, sources: np.ndarray, targets: np.ndarray):
+        self.labels = labels
+        self.sources = sources
+        self.targets = targets
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return _EdgeList(self.labels, self.sources[position], self.targets[position])
+        return self.labels[self.sources[position]], self.labels[self.targets[position]]
+
+    def __iter__(self):
+        labels = self.labels
+        for start in range(0, len(self.sources), _ITERATION_CHUNK):
+            sources = self.sources[start:start + _ITERATION_CHUNK].tolist()
+            targets = self.targets[start:start + _ITERATION_CHUNK].tolist()
+            yield from ((labels[u], labels[v]) for u, v in zip(sources, targets))
+
+
+class CSRGraph(object):
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, labels: np.ndarray, directed: bool = False,
+                 weights: np.ndarray = None):
+        """
+        A lightweight read-only graph over CSR arrays, which may be memory-mapped.
+
+        Row i of the CSR arrays lists the neighbors of node labels[i] (its successors if directed). An undirected edge
+        is stored in the rows of both endpoints, a self-loop once.
+
+        The significance methods accept a CSRGraph wherever they accept a networkx graph and then work on the arrays
+        alone, and the methods computing one value per node or edge return array-backed results. Its edges are the
+        slots (i, j) with i <= j (all slots if directed) in CSR order, and a weighted method uses the stored weights
+        whatever the attribute name it is given.
+
+        :param indptr: the (n + 1) row pointers
+        :param indices: the neighbor index of every slot, sorted within each row
+        :param labels: the node labels, indexed by node index
+        :param directed: whether the graph is directed
+        :param weights: If not None, the weight of every slot
+
+        .. rubric:: Example
+
+        >>> from nneslib.classes.csr_graph import CSRGraph
+        >>> from nneslib.edge import edge_significance
+        >>> G = CSRGraph.from_edges([0, 0, 1, 2], [1, 2, 2, 3])
+        >>> es = edge_significance.degree_product(G)
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.labels = labels
+        self.directed = directed
+        self.weights = weights
+        self._index = None
+
+    @classmethod
+    def from_edges(cls, sources, targets, weights=None, directed: bool = False, nodes=None) -> "CSRGraph":
+        """
+        Build a CSRGraph from edge list arrays, without going through networkx.
+
+        Indices are int32 (int64 beyond 2^31 nodes) and weights float32. Parallel edges are merged, keeping the first
+        weight.
+
+        :param sources: the source label of every edge
+        :param targets: the target label of every edge
+        :param weights: If not None, the weight of every edge
+        :param directed: whether the graph is directed
+        :param nodes: If None, the nodes are the sorted labels found in the edges. Otherwise all node labels, in node
+          index order, e.g. to keep isolated nodes
+        :return: a CSRGraph
+        :raise: :class:`ValueError` if an edge endpoint is not in nodes
+        """
+        sources, targets = np.asarray(sources), np.asarray(targets)
+        if nodes is None:
+            labels, ends = _unique(np.concatenate([sources, targets]), return_inverse=True)
+            rows, cols = ends[:len(sources)], ends[len(sources):]
+        else:
+            labels = np.asarray(nodes)
+            sorter = np.argsort(labels, kind="stable")
+            positions = [np.minimum(np.searchsorted(labels, ends, sorter=sorter), max(len(labels) - 1, 0))
+                         for ends in (sources, targets)]
+            if len(sources) and not all(np.array_equal(labels[sorter[position]], ends)
+                                        for position, ends in zip(positions, (sources, targets))):
+                raise ValueError("Every edge endpoint must be one of nodes")
+            rows, cols = (sorter[position] for position in positions)
+        rows, cols = rows.astype(np.int64), cols.astype(np.int64)
+        values = None if weights is None else np.asarray(weights, dtype=np.float32)
+        positions = np.arange(len(rows))
+        if not directed:  # an undirected edge is stored in the rows of both endpoints
+            off_diagonal = rows != cols
+            rows, cols = np.concatenate([rows, cols[off_diagonal]]), np.concatenate([cols, rows[off_diagonal]])
+            positions = np.concatenate([positions, positions[off_diagonal]])
+            if values is not None:
+                values = np.concatenate([values, values[off_diagonal]])
+        n = len(labels)
+        keys = rows * n + cols
+        if values is None:
+            rows, cols = np.divmod(_unique(keys), n)
+        else:
+            order = np.lexsort((positions, keys))  # the first given of parallel edges wins
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = keys[order][1:] != keys[order][:-1]
+            order = order[first]
+            rows, cols, values = rows[order], cols[order], values[order]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(indptr, cols.astype(np.int32 if n < 2 ** 31 else np.int64), labels, directed, values)
+
+    @classmethod
+    def from_file(cls, filepath: str, delimiter: str = None, comments: str = "#", skiprows: int = 0,
+                  directed: bool = False, weighted: bool = False) -> "CSRGraph":
+        """
+        Build a CSRGraph from a text edge list with one "source target [weight]" line per edge, see
+        :meth:`from_edges`. Labels are integers if they all parse as such, strings otherwise.
+
+        :param filepath: the file path to read
+        :param delimiter: the column separator, None for any whitespace
+        :param comments: the prefix of the comment lines
+        :param skiprows: the number of header lines to skip
+        :param directed: whether the graph is directed
+        :param weighted: whether to read the weights from the third column
+        :return: a CSRGraph
+        """
+        options = dict(delimiter=delimiter, comments=comments, skiprows=skiprows, ndmin=2)
+        try:
+            ends = np.loadtxt(filepath, dtype=np.int64, usecols=(0, 1), **options)
+        except ValueError:
+            ends = np.loadtxt(filepath, dtype=str, usecols=(0, 1), **options)
+        weights = np.loadtxt(filepath, dtype=np.float32, usecols=(2,), **options).ravel() if weighted else None
+        return cls.from_edges(ends[:, 0], ends[:, 1], weights, directed)
+
+    def is_directed(self) -> bool:
+        return self.directed
+
+    def number_of_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    def number_of_edges(self) -> int:
+        if self.directed:
+            return len(self.indices)
+        rows = np.repeat(np.arange(self.number_of_nodes()), np.diff(self.indptr))
+        return int((len(self.indices) + np.count_nonzero(rows == self.indices)) // 2)
+
+    def edge_arrays(self) -> tuple:
+        """
+        The node indices of the edges, in :meth:`edges` order.
+
+        :return: the int64 sources and targets, and the float32 weights (None without weights)
+        """
+        rows = np.repeat(np.arange(self.number_of_nodes(), dtype=np.int64), np.diff(self.indptr))
+        cols = np.asarray(self.indices, dtype=np.int64)
+        if self.directed:
+            return rows, cols, self.weights
+        upper = rows <= cols
+        return rows[upper], cols[upper], None if self.weights is None else np.asarray(self.weights)[upper]
+
+    def edges(self) -> Sequence:
+        """
+        The (source label, target label) edges, in CSR order and built on access.
+        """
+        sources, targets, _ = self.edge_arrays()
+        return _EdgeList(self.nodes(), sources, targets)
+
+    def nodes(self) -> list:
+        """
+        The node labels, in node index order.
+        """
+        return self.labels.tolist() if isinstance(self.labels, np.ndarray) else list(self.labels)
+
+    @property
+    def node_index(self) -> dict:
+        """
+        The {node label: node index} dict, built on first access.
+        """
+        if self._index is None:
+            self._index = {label: index for index, label in enumerate(self.nodes())}
+        return self._index
+
+    @property
+    def degrees(self) -> np.ndarray:
+        """
+        The number of neighbors (successors if directed) of every node.
+        """
+        return np.diff(self.indptr)
+
+    def neighbors(self, node) -> list:
+        """
+        The labels of the neighbors (successors if directed) of a node.
+
+        :param node: node label
+        :raise: `NodeNotFound` if the node doesn't exist
+        """
+        if node not in self.node_index:
+            raise nx.NodeNotFound(f"Node {node} is not in G")
+        index = self.node_index[node]
+        return [self.labels[neighbor] for neighbor in self.indices[self.indptr[index]:self.indptr[index + 1]].tolist()]
+
+    def adjacency(self, weight: str = None) -> sp.csr_matrix:
+        """
+        The adjacency matrix, sharing the index arrays.
+
+        :param weight: If None, all edge weights are 1. Otherwise the stored weights are used, 1 without weights
+        :return: a (n, n) `scipy.sparse.csr_matrix`
+        """
+        n = self.number_of_nodes()
+        if weight is None or self.weights is None:
+            data = np.ones(len(self.indices))
+        else:
+            data = np.asarray(self.weights, dtype=np.float64)
+        return sp.csr_matrix((data, self.indices, self.indptr), shape=(n, n), copy=False)
+
+    def to_networkx(self) -> nx.Graph:
+        """
+        Build the networkx graph, with the nodes in node index order.
+
+        :return: an `nx.Graph` or `nx.DiGraph`
+        """
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        graph.add_nodes_from(self.nodes())
+        if self.weights is None:
+            graph.add_edges_from(self.edges())
+        else:
+            graph.add_weighted_edges_from((u, v, w) for (u, v), w in zip(self.edges(), self.edge_arrays()[2].tolist()))
+        return graph
@@ -1,3 +1,4 @@
+from nneslib.classes.edge_store import EdgeStore
 from nneslib.classes.significance import Significance
 import networkx as nx
 import numpy as np
@@ -7,25 +8,74 @@ class EdgeSignificance(Significance):
     def __init__(self, significances: dict, graph: nx.Graph, method_name: str,
                  method_parameters: dict = None, attrs: dict = None):
         super().__init__(significances, graph, method_name, method_parameters)
-        self.significance_matrix, self.vertices_dict = self._get_numpy_significance_matrix()
         self.attrs = attrs
+        self._store = None
+        self._significance_matrix = None
 
-    def _get_numpy_significance_matrix(self):
+    @classmethod
+    def from_store(cls, store: EdgeStore, graph: nx.Graph, method_name: str, method_parameters: dict = None,
+                   attrs: dict = None) -> "EdgeSignificance":
         """
-        Get a |V| * |V| numpy matrix format representation of all edges.
+        Build an EdgeSignificance from its array storage, e.g. memory-mapped arrays. The dict of significances is
+        only built on first access.
 
-        :return: an n*n matrix of significance and a n-length node name dict.
+        :param store: the EdgeStore of the edges
         """
-        vertices_list: list = list(self.graph.nodes())
-        vertices_dict: dict = {key: index for index, key in enumerate(vertices_list)}
-        significance_matrix: np.ndarray = np.zeros((len(vertices_list), len(vertices_list)))
-        for edge, significance in self.significance.items():
-            source, target = edge[0], edge[1]
-            source, target = vertices_dict[source], vertices_dict[target]
-            significance_matrix[source][target] = significance
-            if not self.graph.is_directed():  # For undirected graph A[u][v] == A[v][u]
-                significance_matrix[target][source] = significance
-        return significance_matrix, vertices_dict
+        significance = cls(None, graph, method_name, method_parameters, attrs)
+        significance._store = store
+        return significance
+
+    def _materialize(self) -> dict:
+        vertices = self.store.vertices
+        edges = zip(self.store.sources.tolist(), self.store.targets.tolist())
+        return dict(zip(((vertices[u], vertices[v]) for u, v in edges), self.store.values.tolist()))
+
+    def _json_significance(self) -> list:
+        # JSON objects only have string keys, edges are written as [source, target, significance]
+        return [[u, v, value] for (u, v), value in self.significance.items()]
+
+    @property
+    def store(self) -> EdgeStore:
+        """
+        The array-backed storage of all edges. It is built on first access and its memory scales with |E|.
+        """
+        if self._store is None:
+            self._store = EdgeStore.from_dict(self.significance, list(self.graph.nodes()), self.graph.is_directed())
+        return self._store
+
+    @property
+    def vertices_dict(self) -> dict:
+        """
+        The {node label: node index} dict of the rows/columns of :meth:`to_sparse` and :meth:`to_dense`.
+        """
+        return self.store.vertices_dict
+
+    @property
+    def significance_matrix(self) -> np.ndarray:
+        """
+        A |V| * |V| numpy matrix format representation of all edges, built on first access.
+
+        .. note:: This allocates |V|^2 floats, prefer :meth:`get` or :meth:`to_sparse` on large graphs.
+        """
+        if self._significance_matrix is None:
+            self._significance_matrix = self.store.to_dense()
+        return self._significance_matrix
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Get a |V| * |V| numpy matrix of significance, 0 where there is no edge, indexed by `vertices_dict`.
+
+        :return: an n*n matrix of significance
+        """
+        return self.store.to_dense()
+
+    def to_sparse(self):
+        """
+        Get a |V| * |V| scipy sparse matrix of significance, indexed by `vertices_dict`.
+
+        :return: a `scipy.sparse.csr_matrix`
+        """
+        return self.store.to_sparse()
 
     def get(self, source, target) -> float:
         """
@@ -41,4 +91,16 @@ class EdgeSignificance(Significance):
         if target not in self.vertices_dict.keys():
             raise nx.NodeNotFound(f"Target {target} is not in G")
         source, target = self.vertices_dict[source], self.vertices_dict[target]
-        return self.significance_matrix[source][target]
\ No newline at end of file
+        return self.store.get(source, target)
+
+    def _value(self, source, target) -> float:
+        value = self.store.get(self.vertices_dict[source], self.vertices_dict[target], None) \
+            if source in self.vertices_dict and target in self.vertices_dict else None
+        if value is None:
+            raise nx.NetworkXError(f"Edge ({source}, {target}) is not in G")
+        return value
+
+    def _ranking_arrays(self) -> tuple:
+        store = self.store
+        return store.values, lambda position: (store.vertices[store.sources[position]],
+                                               store.vertices[store.targets[position]])
@@ -0,0 +1,117 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+def _index_dtype(n: int) -> type:
+    """
+    The dtype of node indices below n: int32, int64 beyond 2^31 nodes as in CSRGraph.
+    """
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+class EdgeStore(object):
+    def __init__(self, sources: np.ndarray, targets: np.ndarray, values: np.ndarray, vertices: list,
+                 directed: bool = False):
+        """
+        Array-backed storage of one value per edge, with memory in O(|E|).
+
+        The parallel (sources, targets, values) arrays are kept as given, and a CSR index with sorted rows is built on
+        first lookup. For undirected graphs an edge is found from both of its endpoints.
+
+        :param sources: the source node index of every edge, kept as int32 (int64 beyond 2^31 nodes)
+        :param targets: the target node index of every edge, as sources
+        :param values: the value of every edge
+        :param vertices: the node labels, indexed by node index
+        :param directed: whether (u, v) and (v, u) are different edges
+        """
+        self.sources = np.asarray(sources, dtype=_index_dtype(len(vertices)))
+        self.targets = np.asarray(targets, dtype=_index_dtype(len(vertices)))
+        self.values = np.asarray(values, dtype=np.float64)
+        self.vertices = vertices
+        self.vertices_dict = {key: index for index, key in enumerate(vertices)}
+        self.directed = directed
+        self._csr = None
+
+    @classmethod
+    def from_dict(cls, significances: dict, vertices: list, directed: bool = False) -> "EdgeStore":
+        """
+        Build the store of a {(source, target): value} dict.
+
+        :param significances: a dict of {(source, target): significance}
+        :param vertices: the node labels, every edge endpoint must be one of them
+        :param directed: whether (u, v) and (v, u) are different edges
+        :return: an EdgeStore object
+        """
+        vertices_dict = {key: index for index, key in enumerate(vertices)}
+        m = len(significances)
+        index_dtype = _index_dtype(len(vertices))
+        sources = np.fromiter((vertices_dict[edge[0]] for edge in significances), dtype=index_dtype, count=m)
+        targets = np.fromiter((vertices_dict[edge[1]] for edge in significances), dtype=index_dtype, count=m)
+        values = np.fromiter(significances.values(), dtype=np.float64, count=m)
+        return cls(sources, targets, values, vertices, directed)
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self.values)
+
+    def _index(self) -> sp.csr_matrix:
+        """
+        The CSR index shared by all lookups, built on first use.
+        """
+        if self._csr is None:
+            sources, targets, values = self.sources, self.targets, self.values
+            positions = np.arange(len(values))
+            if not self.directed:  # For undirected graph A[u][v] == A[v][u]
+                off_diagonal = sources != targets
+                sources, targets = (np.concatenate([self.sources, self.targets[off_diagonal]]),
+                                    np.concatenate([self.targets, self.sources[off_diagonal]]))
+                values = np.concatenate([self.values, self.values[off_diagonal]])
+                positions = np.concatenate([positions, positions[off_diagonal]])
+            # When an edge is given several times the last value wins, as with item assignment
+            order = np.lexsort((-positions, targets, sources))
+            sources, targets, values = sources[order], targets[order], values[order]
+            first = np.ones(len(values), dtype=bool)
+            first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+            sources, targets, values = sources[first], targets[first], values[first]
+            indptr = np.zeros(self.number_of_nodes + 1, dtype=np.int64)
+            np.cumsum(np.bincount(sources, minlength=self.number_of_nodes), out=indptr[1:])
+            self._csr = sp.csr_matrix((values, targets, indptr), shape=(self.number_of_nodes, self.number_of_nodes))
+        return self._csr
+
+    def to_sparse(self) -> sp.csr_matrix:
+        """
+        Get the |V| * |V| scipy sparse matrix of the values. It is symmetric for undirected graphs.
+
+        :return: a `scipy.sparse.csr_matrix` with sorted indices
+        """
+        return self._index().copy()
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Get the |V| * |V| numpy matrix of the values, 0 where there is no edge.
+
+        .. note:: This allocates |V|^2 floats, prefer :meth:`get` or :meth:`to_sparse` on large graphs.
+
+        :return: an n*n matrix
+        """
+        return self._index().toarray()
+
+    def get(self, source: int, target: int, default: float = 0.0) -> float:
+        """
+        Get an edge value by node index in O(log d), d being the degree of source.
+
+        :param source: source node index
+        :param target: target node index
+        :param default: the value returned if there is no such edge
+        :return: the value of edge (source, target)
+        """
+        csr = self._index()
+        start, end = csr.indptr[source], csr.indptr[source + 1]
+        position = start + np.searchsorted(csr.indices[start:end], target)
+        if position < end and csr.indices[position] == target:
+            return float(csr.data[position])
+        return default
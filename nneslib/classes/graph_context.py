@@ -0,0 +1,224 @@
+import importlib
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csgraph
+
+from nneslib.classes.csr_graph import CSRGraph
+from nneslib.utils.cache import graph_fingerprint
+from nneslib.utils.csr import to_csr, edge_indexed_csr, binary_adjacency
+
+
+__all__ = ['GraphContext', 'graph_context', 'compute_all']
+
+
+class GraphContext(object):
+    def __init__(self, graph: nx.Graph):
+        """
+        The artifacts that the significance methods derive from a graph: node ordering, adjacency matrices, degrees,
+        all-pairs distances and the clique index. Each one is built on first use and memoized, so a suite of methods
+        run on the same graph pays for it once.
+
+        The context does not watch the graph: after modifying it, call :meth:`invalidate`. A :class:`CSRGraph` gives
+        its artifacts straight from its arrays.
+
+        :param graph: the networkx graph object (or CSRGraph) to be used
+
+        .. rubric:: Example
+
+        >>> from nneslib.classes.graph_context import GraphContext
+        >>> from nneslib.edge import edge_significance
+        >>> import networkx as nx
+        >>> G = nx.karate_club_graph()
+        >>> context = GraphContext(G)
+        >>> es = edge_significance.degree_product(G, context=context)
+        >>> ed = edge_significance.diffusion_importance(G, context=context)
+        """
+        self.graph = graph
+        self._cache = {}
+
+    def _memoize(self, key: tuple, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def invalidate(self, *names: str) -> None:
+        """
+        Drop memoized artifacts.
+
+        :param names: the names of the artifacts to drop (e.g. "adjacency", "distances"), all of them if none is given
+        """
+        if not names:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] in names]:
+            del self._cache[key]
+
+    @property
+    def cached(self) -> list:
+        """
+        The (name, parameters...) keys of the artifacts built so far.
+        """
+        return list(self._cache)
+
+    @property
+    def nodes(self) -> list:
+        """
+        The nodes in graph.nodes() order, which is the row/column order of every matrix of the context.
+        """
+        return self._memoize(("nodes",), lambda: list(self.graph.nodes()))
+
+    @property
+    def node_index(self) -> dict:
+        """
+        The {node label: row index} dict.
+        """
+        return self._memoize(("node_index",), lambda: {node: i for i, node in enumerate(self.nodes)})
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        The content hash of the graph, see :func:`nneslib.utils.cache.graph_fingerprint`.
+        """
+        return self._memoize(("fingerprint",), lambda: graph_fingerprint(self.graph))
+
+    @property
+    def edges(self) -> list:
+        """
+        The edges in graph.edges() order. Those of a CSRGraph are built on access rather than stored.
+        """
+        if isinstance(self.graph, CSRGraph):
+            return self._memoize(("edges",), self.graph.edges)
+        return self._memoize(("edges",), lambda: list(self.graph.edges()))
+
+    @property
+    def edge_ends(self) -> tuple:
+        """
+        The row indices of the sources and of the targets of :attr:`edges`.
+        """
+        def build():
+            if isinstance(self.graph, CSRGraph):
+                return self.graph.edge_arrays()[:2]
+            index, edges = self.node_index, self.edges
+            sources = np.fromiter((index[u] for u, _ in edges), dtype=np.int64, count=len(edges))
+            targets = np.fromiter((index[v] for _, v in edges), dtype=np.int64, count=len(edges))
+            return sources, targets
+        return self._memoize(("edge_ends",), build)
+
+    def adjacency(self, weight: str = None):
+        """
+        The CSR adjacency matrix, see :func:`nneslib.utils.csr.to_csr`.
+
+        :param weight: If None, all edge weights are 1. Otherwise holds the name of the edge attribute used as weight.
+        :return: a (n, n) `scipy.sparse.csr_matrix`
+        """
+        return self._memoize(("adjacency", weight), lambda: to_csr(self.graph, weight, self.nodes)[0])
+
+    def binary_adjacency(self):
+        """
+        The 0/1 adjacency matrix without self-loops, see :func:`nneslib.utils.csr.binary_adjacency`.
+        """
+        return self._memoize(("binary_adjacency",), lambda: binary_adjacency(self.adjacency()))
+
+    def edge_indexed_csr(self, weight: str = None) -> tuple:
+        """
+        The edge-indexed CSR adjacency, see :func:`nneslib.utils.csr.edge_indexed_csr`.
+        """
+        return self._memoize(("edge_indexed_csr", weight), lambda: edge_indexed_csr(self.graph, weight))
+
+    def degrees(self, weight: str = None) -> np.ndarray:
+        """
+        The (weighted) degree of every node, as graph.degree() counts it: a self-loop adds 2 and the degree of a
+        directed graph is the in-degree plus the out-degree.
+
+        :param weight: If None, every edge counts 1. Otherwise holds the name of the edge attribute used as weight.
+        :return: a float array in :attr:`nodes` order
+        """
+        def build():
+            # bincount adds the weights sequentially in CSR order, so a degree can be reproduced exactly from the
+            # neighbors sorted by node index
+            adjacency = self.adjacency(weight)
+            n = adjacency.shape[0]
+            rows = np.repeat(np.arange(n), np.diff(adjacency.indptr))
+            degrees = np.bincount(rows, weights=adjacency.data, minlength=n)
+            if self.graph.is_directed():
+                return degrees + np.bincount(adjacency.indices, weights=adjacency.data, minlength=n)
+            return degrees + adjacency.diagonal()
+        return self._memoize(("degrees", weight), build)
+
+    def distances(self, weight: str = None) -> np.ndarray:
+        """
+        The all-pairs shortest path distances, np.inf between unreachable nodes.
+
+        .. note:: This allocates |V|^2 floats.
+
+        :param weight: If None, every edge has distance 1. Otherwise holds the name of the edge attribute used as distance.
+        :return: a (n, n) array whose entry [s, t] is the distance from s to t
+        """
+        return self._memoize(("distances", weight), lambda: csgraph.dijkstra(
+            self.adjacency(weight), directed=self.graph.is_directed(), unweighted=weight is None))
+
+    def cliques(self, max_cliques: int = None, time_limit: float = None):
+        """
+        The largest clique of every node and edge, see :class:`nneslib.edge.internal.CliqueIndex`.
+        """
+        from nneslib.edge.internal import CliqueIndex
+        return self._memoize(("cliques", max_cliques, time_limit),
+                             lambda: CliqueIndex(self.graph, max_cliques, time_limit))
+
+
+def graph_context(graph: nx.Graph, context: GraphContext = None) -> GraphContext:
+    """
+    The context a method works with: the given one, or a fresh one that only lives for the call.
+
+    :raise: :class:`ValueError` if context was built for another graph
+    """
+    if context is None:
+        return GraphContext(graph)
+    if context.graph is not graph:
+        raise ValueError("The context was built for another graph")
+    return context
+
+
+def _resolve(method):
+    if callable(method):
+        return method
+    module, _, name = method.partition(".")
+    if module not in ("node", "edge") or not name:
+        raise ValueError(f"Unknown method {method}, expected 'node.<name>' or 'edge.<name>'")
+    module = importlib.import_module(f"nneslib.{module}.{module}_significance")
+    if name not in module.__all__:
+        raise ValueError(f"Unknown method {method}")
+    return getattr(module, name)
+
+
+def compute_all(graph: nx.Graph, methods: list, context: GraphContext = None, cache=None) -> list:
+    """
+    Run several significance methods on one graph, sharing a single :class:`GraphContext`.
+
+    :param graph: the networkx graph object to be used
+    :param methods: the methods to run. Each is a method of :mod:`nneslib.node.node_significance` or
+      :mod:`nneslib.edge.edge_significance`, given as the function or as "node.<name>" / "edge.<name>", optionally in a
+      (method, kwargs) pair
+    :param context: If not None, the context to share, e.g. to keep its artifacts for later calls
+    :param cache: If not None, a :class:`nneslib.utils.cache.ResultCache` the results are read from and stored in
+    :return: the list of Significance objects, in the order of methods
+    :raise: :class:`ValueError` if a method name is unknown
+
+    .. rubric:: Example
+
+    >>> from nneslib.classes.graph_context import compute_all
+    >>> import networkx as nx
+    >>> G = nx.karate_club_graph()
+    >>> results = compute_all(G, ["node.degree_centrality", ("edge.ERW_Kpath", {"k": 5, "ruo": 1000, "beta": 0.01})])
+    """
+    context = graph_context(graph, context)
+    results = []
+    for method in methods:
+        method, kwargs = method if isinstance(method, tuple) else (method, {})
+        method = _resolve(method)
+        if cache is None:
+            results.append(method(graph, context=context, **kwargs))
+        else:
+            results.append(cache.compute(method, graph, context=context, **kwargs))
+    return results
@@ -8,6 +8,39 @@ class NodeSignificance(Significance):
                  method_parameters: dict = None, attrs: dict = None):
         super().__init__(significances, graph, method_name, method_parameters)
         self.attrs = attrs
+        self._labels, self._values = None, None
+
+    @classmethod
+    def from_arrays(cls, labels: list, values: np.ndarray, graph: nx.Graph, method_name: str,
+                    method_parameters: dict = None, attrs: dict = None) -> "NodeSignificance":
+        """
+        Build a NodeSignificance whose dict is only built on first access, e.g. over memory-mapped values.
+
+        :param labels: the node labels
+        :param values: the significance of every node of labels
+        """
+        significance = cls(None, graph, method_name, method_parameters, attrs)
+        significance._labels, significance._values = labels, values
+        return significance
+
+    def _materialize(self) -> dict:
+        return dict(zip(self._labels, np.asarray(self._values).tolist()))
+
+    @property
+    def labels(self) -> list:
+        """
+        The node labels, in the order of :attr:`values`.
+        """
+        return list(self.significance) if self._labels is None else self._labels
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        The float64 significance array aligned with :attr:`labels`.
+        """
+        if self._values is None:
+            return np.fromiter(self.significance.values(), dtype=np.float64, count=len(self.significance))
+        return self._values
 
     def get(self, node) -> float:
         """
@@ -17,6 +50,12 @@ class NodeSignificance(Significance):
         :return: the significance of the node
         :raise: `NodeNotFound` if the node doesn't exist
         """
-        if node in self.significance.keys():
+        if node not in self.significance:
             raise nx.NodeNotFound(f"Node {node} is not in G")
         return self.significance[node]
+
+    def _value(self, node) -> float:
+        return self.get(node)
+
+    def _ranking_arrays(self) -> tuple:
+        return self.values, self.labels.__getitem__
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+__all__ = ['RankingIndex']
+
+
+class RankingIndex(object):
+    def __init__(self, values: np.ndarray, key_of):
+        """
+        Rank queries over an array of significance values, from the most to the least significant.
+
+        The descending order is an argsort built on the first query that needs it and kept, after which top-k and
+        threshold queries cost O(k + log n) and rank or percentile queries O(log n). Before it is built, a top-k query
+        only partitions the values in O(n). Ties are ordered by position, NaN values rank last.
+
+        :param values: the significance of every element
+        :param key_of: the function mapping the position of an element to its key (node or edge)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.values = np.where(np.isnan(values), -np.inf, values)
+        self._key_of = key_of
+        self._order = None
+        self._negated = None  # the negated values in descending order, i.e. ascending
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _build(self) -> None:
+        if self._order is None:
+            self._order = np.argsort(-self.values, kind="stable")
+            self._negated = -self.values[self._order]
+
+    def _items(self, positions: np.ndarray) -> list:
+        return [(self._key_of(position), value) for position, value in
+                zip(positions.tolist(), self.values[positions].tolist())]
+
+    def top_k(self, k: int) -> list:
+        """
+        The k most significant elements.
+
+        :param k: the number of elements, at most all of them are returned
+        :return: a list of (key, value), from the most significant one
+        """
+        k = max(0, min(k, len(self)))
+        if k == 0:
+            return []
+        if self._order is not None:
+            return self._items(self._order[:k])
+        # The k largest values without sorting all of them, taking the first positions among the ties at the boundary
+        kth = -np.partition(-self.values, k - 1)[k - 1]
+        above = np.flatnonzero(self.values > kth)
+        positions = np.concatenate([above, np.flatnonzero(self.values == kth)[:k - len(above)]])
+        positions = positions[np.lexsort((positions, -self.values[positions]))]
+        return self._items(positions)
+
+    def top_fraction(self, fraction: float) -> list:
+        """
+        The most significant fraction of the elements, e.g. 0.01 for the top 1%.
+
+        :return: a list of (key, value), from the most significant one
+        """
+        return self.top_k(int(np.ceil(fraction * len(self))))
+
+    def rank(self, value: float) -> int:
+        """
+        The rank an element of this value has: 1 plus the number of elements that are strictly more significant.
+        """
+        self._build()
+        value = -np.inf if np.isnan(value) else value
+        return int(np.searchsorted(self._negated, -value, side="left")) + 1
+
+    def percentile(self, value: float) -> float:
+        """
+        The percentage of elements whose value is at most this value.
+        """
+        self._build()
+        value = -np.inf if np.isnan(value) else value
+        return 100.0 * (len(self) - np.searchsorted(self._negated, -value, side="left")) / max(len(self), 1)
+
+    def threshold(self, low: float = None, high: float = None) -> list:
+        """
+        The elements whose value lies in [low, high].
+
+        :param low: If None, no lower bound
+        :param high: If None, no upper bound
+        :return: a list of (key, value), from the most significant one
+        """
+        self._build()
+        start = 0 if high is None else np.searchsorted(self._negated, -high, side="left")
+        end = len(self) if low is None else np.searchsorted(self._negated, -low, side="right")
+        return self._items(self._order[start:max(start, end)])
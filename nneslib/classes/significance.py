@@ -1,21 +1,111 @@
 import networkx as nx
+import numpy as np
 import json
 
+from nneslib.classes.ranking_index import RankingIndex
+
 
 class Significance(object):
     def __init__(self, significances: dict, graph: nx.Graph, method_name: str, method_parameters: dict = None):
         """
         Significances representations
 
-        :param significances: a dict of {node : significance} or {[source,target]: significance}}
+        :param significances: a dict of {node : significance} or {(source, target): significance}}
         :param graph: networkx graph object
         :param method_name: algorithm used to generate this significances result
         :param method_parameters: the parameters used by method.
         """
-        self.significance = significances
+        self._significance = significances
         self.graph = graph
         self.method_name = method_name
         self.method_parameters = method_parameters
+        self._ranking = None
+
+    @property
+    def significance(self) -> dict:
+        """
+        The dict of significances. A result loaded from arrays only builds it on first access.
+        """
+        if self._significance is None:
+            self._significance = self._materialize()
+        return self._significance
+
+    @significance.setter
+    def significance(self, significances: dict) -> None:
+        self._significance = significances
+
+    def _materialize(self) -> dict:
+        """
+        Build the dict of significances of a result loaded from arrays. A plain Significance holds its dict from the
+        start, so it has none to build.
+        """
+        return {}
+
+    def _ranking_arrays(self) -> tuple:
+        """
+        The arguments of the :class:`RankingIndex`: the values to rank and the function mapping a position among them
+        to its node (or edge) key. Subclasses read them from their arrays, a plain Significance from its dict.
+        """
+        keys = list(self.significance)
+        return np.fromiter(self.significance.values(), dtype=np.float64, count=len(keys)), keys.__getitem__
+
+    def _value(self, *key) -> float:
+        """
+        The significance of a node (or an edge given as source, target).
+        """
+        return self.significance[key[0] if len(key) == 1 else key]
+
+    @property
+    def ranking(self) -> RankingIndex:
+        """
+        The ranking index of the significances, built on first access and kept. Build a new Significance rather than
+        modifying the dict of one whose ranking is in use.
+        """
+        if self._ranking is None:
+            self._ranking = RankingIndex(*self._ranking_arrays())
+        return self._ranking
+
+    def top_k(self, k: int) -> list:
+        """
+        The k most significant nodes (or edges).
+
+        :return: a list of (node, significance) (or ((source, target), significance)), the most significant first
+        """
+        return self.ranking.top_k(k)
+
+    def top_fraction(self, fraction: float) -> list:
+        """
+        The most significant fraction of the nodes (or edges), e.g. 0.01 for the top 1%.
+
+        :return: a list of (node, significance) (or ((source, target), significance)), the most significant first
+        """
+        return self.ranking.top_fraction(fraction)
+
+    def rank(self, *key) -> int:
+        """
+        The rank of a node (or an edge given as source, target), 1 for the most significant one. Ties share the best
+        rank.
+        """
+        return self.ranking.rank(self._value(*key))
+
+    def percentile(self, *key) -> float:
+        """
+        The percentage of nodes (or edges) at most as significant as a node (or an edge given as source, target).
+        """
+        return self.ranking.percentile(self._value(*key))
+
+    def threshold(self, low: float = None, high: float = None) -> list:
+        """
+        The nodes (or edges) whose significance lies in [low, high].
+
+        :param low: If None, no lower bound
+        :param high: If None, no upper bound
+        :return: a list of (node, significance) (or ((source, target), significance)), the most significant first
+        """
+        return self.ranking.threshold(low, high)
+
+    def _json_significance(self):
+        return self.significance
 
     def write_to_json(self, filepath: str, **kwargs) -> None:
         """
@@ -24,8 +114,17 @@ class Significance(object):
         :param filepath: the file path to write
         :param kwargs: additional keyword arguments
         """
-        significances = {"significance": self.significance, "algorithm": self.method_name,
-                         "params": self.method_parameters}
-        json.dump(significances, open(filepath, 'w', encoding='utf8'), **kwargs)
+        significances = {"significance": self._json_significance(), "algorithm": self.method_name,
+                         "params": self.method_parameters, "attrs": getattr(self, "attrs", None)}
+        with open(filepath, 'w', encoding='utf8') as file:
+            json.dump(significances, file, **kwargs)
 
+    def save(self, filepath: str) -> None:
+        """
+        Write the Significance in the binary format of :mod:`nneslib.classes.binary_format`, which
+        :func:`nneslib.classes.binary_format.load` memory-maps back.
 
+        :param filepath: the file path to write
+        """
+        from nneslib.classes.binary_format import save
+        save(self, filepath)
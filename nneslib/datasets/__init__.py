@@ -1,5 +1,5 @@
-from nneslib.datasets._base import load_twitch
+from nneslib.datasets._base import load_twitch, load_dataset, get_data_home, register_dataset, EdgeListDataset
 
 __all__ = [
-    'load_twitch',
-]
\ No newline at end of file
+    'load_twitch', 'load_dataset', 'get_data_home', 'register_dataset', 'EdgeListDataset'
+]
@@ -1,16 +1,109 @@
-from os.path import dirname
+import os
+from typing import NamedTuple, Union
 
 import networkx as nx
+import numpy as np
 
+from nneslib.classes.binary_format import write_arrays, read_arrays
+from nneslib.classes.csr_graph import CSRGraph
 
-def load_twitch(region: str) -> nx.Graph:
+
+class EdgeListDataset(NamedTuple):
+    """
+    A dataset distributed as a text edge list with integer node ids, at `path` relative to the data home.
+    """
+    name: str
+    path: str
+    delimiter: str = ","
+    skiprows: int = 1
+    directed: bool = False
+
+
+# The datasets load_dataset knows, by name
+DATASETS = {}
+
+# Twitch regions and the directory/file stem of their edge list in https://github.com/benedekrozemberczki/datasets
+TWITCH_REGIONS = {"DE": "DE", "EN": "ENGB", "ES": "ES", "FR": "FR", "PT": "PTBR", "RU": "RU", "TW": "TW"}
+
+
+def register_dataset(dataset: EdgeListDataset) -> None:
+    """
+    Make a dataset available to :func:`load_dataset`.
+
+    :param dataset: the dataset description
+    """
+    DATASETS[dataset.name] = dataset
+
+
+for _region, _stem in TWITCH_REGIONS.items():
+    register_dataset(EdgeListDataset(f"twitch_{_region}", os.path.join("twitch", _stem, f"musae_{_stem}_edges.csv")))
+
+
+def get_data_home(data_home: str = None) -> str:
+    """
+    The directory holding the raw datasets and their preprocessed cache.
+
+    :param data_home: If None, $NNESLIB_DATA or ~/nneslib_data
+    :return: the path of the directory
+    """
+    if data_home is None:
+        data_home = os.environ.get("NNESLIB_DATA", os.path.join(os.path.expanduser("~"), "nneslib_data"))
+    return data_home
+
+
+def load_dataset(name: str, as_csr: bool = False, data_home: str = None) -> Union[nx.Graph, CSRGraph]:
+    """
+    Load a registered dataset.
+
+    The first load parses the raw edge list, which must be available under the data home, and writes its CSR arrays
+    to `<data_home>/cache/<name>.nnes`. Later loads memory-map that cache. It is rebuilt when the raw file changes.
+
+    :param name: the dataset name, one of `DATASETS`
+    :param as_csr: whether to return a :class:`CSRGraph` over the memory-mapped arrays instead of a networkx graph
+    :param data_home: the data directory, see :func:`get_data_home`
+    :return: an `nx.Graph` (`nx.DiGraph` for directed datasets) or a CSRGraph, whose nodes are the sorted node ids
+    :raise: :class:`ValueError` if the dataset is unknown, :class:`FileNotFoundError` if neither its raw edge list nor
+      its cache exists
+    """
+    if name not in DATASETS:
+        raise ValueError(f"Unknown dataset {name}, expected one of {sorted(DATASETS)}")
+    dataset = DATASETS[name]
+    data_home = get_data_home(data_home)
+    raw_path = os.path.join(data_home, dataset.path)
+    cache_path = os.path.join(data_home, "cache", f"{name}.nnes")
+    source = None
+    if os.path.exists(raw_path):
+        status = os.stat(raw_path)
+        source = [status.st_size, status.st_mtime_ns]
+    elif not os.path.exists(cache_path):
+        raise FileNotFoundError(f"The edge list of {name} is missing, please download it to {raw_path}")
+    header = read_arrays(cache_path)[0] if os.path.exists(cache_path) else None
+    if header is None or (source is not None and header.get("source") != source):
+        edges = np.loadtxt(raw_path, delimiter=dataset.delimiter, skiprows=dataset.skiprows, dtype=np.int64,
+                           ndmin=2, usecols=(0, 1))
+        graph = CSRGraph.from_edges(edges[:, 0], edges[:, 1], directed=dataset.directed)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        write_arrays(cache_path, {"dataset": name, "directed": dataset.directed, "source": source},
+                     {"indptr": graph.indptr, "indices": graph.indices, "labels": graph.labels})
+    header, arrays = read_arrays(cache_path)
+    graph = CSRGraph(arrays["indptr"], arrays["indices"], arrays["labels"], header["directed"])
+    return graph if as_csr else graph.to_networkx()
+
+
+def load_twitch(region: str, as_csr: bool = False, data_home: str = None) -> Union[nx.Graph, CSRGraph]:
     """
     Load and return the Twitch Social Network.
     The details about this datasets please refer to https://github.com/benedekrozemberczki/datasets
 
+    The edge list is read from `<data_home>/twitch/<REGION>/musae_<REGION>_edges.csv`, the layout of the repository
+    above (EN and PT are stored as ENGB and PTBR), and cached as described in :func:`load_dataset`.
+
     :param region: one of ["DE", "EN", "ES", "FR", "PT", "RU", "TW"]
+    :param as_csr: whether to return a :class:`CSRGraph` over the memory-mapped cache instead of a networkx graph
+    :param data_home: the data directory, see :func:`get_data_home`
     :return: `nx.Graph`. an networkx graph object
-    :raise: :class:`ValueError` if the region is invalid
+    :raise: :class:`ValueError` if the region is invalid, :class:`FileNotFoundError` if neither its raw edge list nor
+      its cache exists
 
     .. rubric:: Example
 
@@ -18,5 +111,6 @@ def load_twitch(region: str) -> nx.Graph:
     >>> import networkx as nx
     >>> G = load_twitch("DE")
     """
-    module_path = dirname(__file__)
-    raise NotImplementedError()
\ No newline at end of file
+    if region not in TWITCH_REGIONS:
+        raise ValueError(f"Unknown region {region}, expected one of {list(TWITCH_REGIONS)}")
+    return load_dataset(f"twitch_{region}", as_csr, data_home)
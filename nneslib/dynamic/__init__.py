@@ -0,0 +1,7 @@
+from .incremental import IncrementalSignificance, IncrementalDegreeProduct, IncrementalDiffusionImportance, \
+    IncrementalDegreeCentrality
+
+__all__ = [
+    'IncrementalSignificance', 'IncrementalDegreeProduct', 'IncrementalDiffusionImportance',
+    'IncrementalDegreeCentrality'
+]
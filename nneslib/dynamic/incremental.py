@@ -0,0 +1,223 @@
+from abc import ABC, abstractmethod
+
+import networkx as nx
+import numpy as np
+
+from nneslib.classes.edge_significance import EdgeSignificance
+from nneslib.classes.graph_context import GraphContext
+from nneslib.classes.node_significance import NodeSignificance
+from nneslib.classes.significance import Significance
+from nneslib.edge import edge_significance
+from nneslib.node import node_significance
+
+
+__all__ = ['IncrementalSignificance', 'IncrementalDegreeProduct', 'IncrementalDiffusionImportance',
+           'IncrementalDegreeCentrality']
+
+
+class IncrementalSignificance(ABC):
+    def __init__(self, graph: nx.Graph, initial: Significance):
+        """
+        A significance kept up to date while edges are added to or removed from its graph.
+
+        A batch of edge changes is applied to the graph itself, then only the entries depending on the endpoints of
+        the changed edges are recomputed. The result always equals a full recompute on the modified graph.
+
+        :param graph: the networkx graph object to be used, modified in place by the updates. Multigraphs are not
+          supported
+        :param initial: the full result on the graph
+        :raise: :class:`ValueError` for a multigraph
+        """
+        if graph.is_multigraph():
+            raise ValueError("Incremental significances do not support multigraphs")
+        self.graph = graph
+        self.method_name = initial.method_name
+        self.method_parameters = initial.method_parameters
+        self.values = dict(initial.significance)
+        self._position = {node: index for index, node in enumerate(graph.nodes())}
+
+    def _track_nodes(self, nodes) -> None:
+        for node in nodes:
+            if node not in self._position:  # networkx appends new nodes to the node order
+                self._position[node] = len(self._position)
+
+    def _key(self, u, v) -> tuple:
+        """
+        The edge as graph.edges() reports it: undirected edges start at the endpoint that comes first in node order.
+        """
+        if self.graph.is_directed() or self._position[u] <= self._position[v]:
+            return u, v
+        return v, u
+
+    def _sorted(self, nodes) -> list:
+        return sorted(nodes, key=self._position.__getitem__)
+
+    def _incident_edges(self, nodes: set) -> set:
+        edges = set()
+        for node in nodes:
+            edges.update(self._key(node, neighbor) for neighbor in self.graph.adj[node])
+            if self.graph.is_directed():
+                edges.update((neighbor, node) for neighbor in self.graph.pred[node])
+        return edges
+
+    def add_edges(self, edges: list) -> set:
+        """
+        Add a batch of edges and update the affected entries.
+
+        :param edges: (u, v) or (u, v, data) edges, as for `graph.add_edges_from`. New nodes are added.
+        :return: the keys of the recomputed entries
+        """
+        edges = list(edges)
+        touched = {edge[0] for edge in edges} | {edge[1] for edge in edges}
+        self._track_nodes(node for edge in edges for node in edge[:2])
+        self.graph.add_edges_from(edges)
+        return self._update(touched, [])
+
+    def remove_edges(self, edges: list) -> set:
+        """
+        Remove a batch of edges and update the affected entries. Missing edges are ignored, nodes are kept.
+
+        :param edges: (u, v) edges
+        :return: the keys of the recomputed entries
+        """
+        removed = [(u, v) for u, v, *_ in edges if self.graph.has_edge(u, v)]
+        self.graph.remove_edges_from(removed)
+        return self._update({u for u, _ in removed} | {v for _, v in removed}, removed)
+
+    @abstractmethod
+    def _update(self, touched: set, removed: list) -> set:
+        """
+        Recompute the entries depending on the touched nodes, once the graph holds the changes.
+
+        :param touched: the endpoints of the added or removed edges
+        :param removed: the removed edges
+        :return: the keys of the recomputed entries
+        """
+
+    @abstractmethod
+    def to_significance(self) -> Significance:
+        """
+        The current result, as a Significance object holding a copy of the values.
+        """
+
+
+class IncrementalDegreeProduct(IncrementalSignificance):
+    def __init__(self, graph: nx.Graph, weight: str = None, theta: float = 1.0):
+        """
+        :func:`nneslib.edge.edge_significance.degree_product` under edge updates. A batch touching the nodes T
+        recomputes the degrees of T and the products of the edges incident to T.
+
+        :param graph: the networkx graph object to be used, modified in place by the updates
+        :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+        :param theta: a tunable parameter. default value is 1.0
+
+        .. rubric:: Example
+
+        >>> from nneslib.dynamic import IncrementalDegreeProduct
+        >>> import networkx as nx
+        >>> G = nx.karate_club_graph()
+        >>> tracker = IncrementalDegreeProduct(G)
+        >>> tracker.add_edges([(0, 9), (5, 33)])
+        >>> tracker.remove_edges([(0, 1)])
+        >>> es = tracker.to_significance()
+        """
+        context = GraphContext(graph)
+        super().__init__(graph, edge_significance.degree_product(graph, weight, theta, context=context))
+        self.weight, self.theta = weight, theta
+        self.degrees = dict(zip(context.nodes, context.degrees(weight).tolist()))
+
+    def _degree(self, node) -> float:
+        """
+        The degree of a node, summed in the order of :meth:`GraphContext.degrees` so that it is equal to the last bit.
+        """
+        def weight(edges, neighbor):
+            return 1.0 if self.weight is None else float(edges[neighbor].get(self.weight, 1))
+        successors = self.graph.adj[node]
+        degree = 0.0
+        for neighbor in self._sorted(successors):
+            degree += weight(successors, neighbor)
+        if self.graph.is_directed():
+            predecessors, in_degree = self.graph.pred[node], 0.0
+            for neighbor in self._sorted(predecessors):
+                in_degree += weight(predecessors, neighbor)
+            return degree + in_degree
+        return degree + (weight(successors, node) if node in successors else 0.0)
+
+    def _update(self, touched: set, removed: list) -> set:
+        for u, v in removed:
+            self.values.pop(self._key(u, v), None)
+        for node in touched:
+            self.degrees[node] = self._degree(node)
+        updated = list(self._incident_edges(touched))
+        products = np.array([self.degrees[u] * self.degrees[v] for u, v in updated], dtype=np.float64)
+        # numpy's vectorized power, as the full computation uses, can differ from the scalar one in the last bit
+        self.values.update(zip(updated, (products ** self.theta).tolist()))
+        return set(updated)
+
+    def to_significance(self) -> EdgeSignificance:
+        return EdgeSignificance(dict(self.values), self.graph, self.method_name, self.method_parameters)
+
+
+class IncrementalDiffusionImportance(IncrementalSignificance):
+    def __init__(self, graph: nx.Graph):
+        """
+        :func:`nneslib.edge.edge_significance.diffusion_importance` under edge updates.
+
+        Changing an edge (a, b) changes the degrees of a and b, and the triangles through (a, b) and through the edges
+        closing a triangle with it, which are all incident to a or b. So a batch touching the nodes T recomputes the
+        edges incident to T, intersecting the neighborhoods of their endpoints.
+
+        :param graph: the networkx graph object to be used, modified in place by the updates. Treat it as unweighted
+        """
+        super().__init__(graph, edge_significance.diffusion_importance(graph))
+
+    def _successors(self, node) -> set:
+        return set(self.graph.adj[node]) - {node}
+
+    def _predecessors(self, node) -> set:
+        return (set(self.graph.pred[node]) if self.graph.is_directed() else set(self.graph.adj[node])) - {node}
+
+    def _update(self, touched: set, removed: list) -> set:
+        for u, v in removed:
+            self.values.pop(self._key(u, v), None)
+        updated = self._incident_edges(touched)
+        successors = {}
+        for u, v in updated:
+            if u == v:  # self-loops connect nothing
+                self.values[(u, v)] = 0.0
+                continue
+            for node in (u, v):
+                if node not in successors:
+                    successors[node] = self._successors(node)
+            triangles = len(successors[u] & self._predecessors(v))  # the entry (A^2)[u, v]
+            n_uv = len(successors[v]) - 1 - triangles
+            n_vu = len(successors[u]) - 1 - triangles
+            self.values[(u, v)] = (n_uv + n_vu) / 2
+        return updated
+
+    def to_significance(self) -> EdgeSignificance:
+        return EdgeSignificance(dict(self.values), self.graph, self.method_name, self.method_parameters)
+
+
+class IncrementalDegreeCentrality(IncrementalSignificance):
+    def __init__(self, graph: nx.Graph):
+        """
+        :func:`nneslib.node.node_significance.degree_centrality` under edge updates. A batch recomputes the degrees of
+        its endpoints. The normalization by n - 1 is applied when the result is read, since new nodes change it for
+        every node.
+
+        :param graph: the networkx graph object to be used, modified in place by the updates
+        """
+        super().__init__(graph, node_significance.degree_centrality(graph))
+        self.values = dict(graph.degree())
+
+    def _update(self, touched: set, removed: list) -> set:
+        for node in touched:
+            self.values[node] = self.graph.degree(node)
+        return touched
+
+    def to_significance(self) -> NodeSignificance:
+        n = len(self.values)
+        scale = 1 / (n - 1) if n > 1 else None
+        significance = {node: degree * scale if scale is not None else 1.0 for node, degree in self.values.items()}
+        return NodeSignificance(significance, self.graph, self.method_name, self.method_parameters)
@@ -1,17 +1,42 @@
 import networkx as nx
 import numpy as np
+from nneslib.classes import binary_format
+from nneslib.classes.csr_graph import CSRGraph
 from nneslib.classes.edge_significance import EdgeSignificance
-from .internal import edge_random_walk_k_path
+from nneslib.classes.edge_store import EdgeStore, _index_dtype
+from nneslib.classes.graph_context import GraphContext, graph_context
+from nneslib.utils.brandes import brandes_betweenness
+from nneslib.utils.budget import Budget
+from nneslib.utils.csr import common_neighbors
+from nneslib.utils.edge_stream import EDGE_CHUNK_SIZE, edge_chunks, label_indices, label_lookup, stream_degrees
+from nneslib.utils.profiling import phase, profiled
+from .internal import CliqueIndex, edge_random_walk_k_path
 
 
 __all__ = [
     'betweenness_centrality', 'degree_product', 'diffusion_importance', 'brightness',
-    'ERW_Kpath'
+    'ERW_Kpath', 'streaming_degree_product'
 ]
 
 
-def betweenness_centrality(graph: nx.Graph, k: int = None, normalize: bool = True,
-                           weight: str = None, seed: int = None) -> EdgeSignificance:
+def _edge_significance(context: GraphContext, values: np.ndarray, graph: nx.Graph, method_name: str,
+                       method_parameters: dict = None, attrs: dict = None) -> EdgeSignificance:
+    """
+    The EdgeSignificance of values in context.edges order, array-backed for a CSRGraph.
+    """
+    if isinstance(graph, CSRGraph):
+        sources, targets = context.edge_ends
+        store = EdgeStore(sources, targets, values, context.nodes, graph.is_directed())
+        return EdgeSignificance.from_store(store, graph, method_name, method_parameters, attrs)
+    return EdgeSignificance(dict(zip(context.edges, np.asarray(values).tolist())), graph, method_name,
+                            method_parameters, attrs)
+
+
+@profiled
+def betweenness_centrality(graph: nx.Graph, k: int = None, normalize: bool = True, weight: str = None,
+                           seed: int = None, n_jobs: int = None, epsilon: float = None,
+                           delta: float = 0.1, context: GraphContext = None,
+                           budget: Budget = None) -> EdgeSignificance:
     """
     Compute betweenness centrality for edges.
 
@@ -21,7 +46,14 @@ def betweenness_centrality(graph: nx.Graph, k: int = None, normalize: bool = Tru
     :param k: If k is not None use k node samples to estimate betweenness. The value of k = n where n is the number of nodes in the graph. Higher values give better approximation.
     :param normalize:If True the betweenness values are normalized by 2/(n(n-1)) for graphs, and 1/(n(n-1)) for directed graphs where n is the number of nodes in G.
     :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
-    :param seed: Indicator of random number generation state. See :ref:`Randomness `. Note that this is only used if k is not None.
+    :param seed: Indicator of random number generation state. See :ref:`Randomness `. Note that this is only used if k or epsilon is not None.
+    :param n_jobs: If not None, the Brandes source sweeps are split into chunks that run on n_jobs processes (-1 uses all CPUs) and whose partial dependencies are summed.
+    :param epsilon: If not None, sample sources adaptively until every value is within epsilon of the exact betweenness with probability at least 1 - delta. The achieved bound and the number of sampled sources are recorded in `attrs`.
+    :param delta: the failure probability of the adaptive sampling.
+    :param context: If not None, the GraphContext of graph the parallel, adaptive and budgeted modes take the
+      adjacency from. A CSRGraph always runs these Brandes sweeps rather than networkx.
+    :param budget: If not None, a :class:`nneslib.utils.budget.Budget` on the swept sources. When it runs out, the
+      values are extrapolated from the sources swept so far, and the coverage is recorded in `attrs`.
     :return: an EdgeSignificance object
 
 
@@ -38,16 +70,29 @@ def betweenness_centrality(graph: nx.Graph, k: int = None, normalize: bool = Tru
     .. [1] A Faster Algorithm for Betweenness Centrality. Ulrik Brandes, Journal of Mathematical Sociology 25(2):163-177, 2001. http://www.inf.uni-konstanz.de/algo/publications/b-fabc-01.pdf
     .. [2] Ulrik Brandes: On Variants of Shortest-Path Betweenness Centrality and their Generic Computation. Social Networks 30(2):136-145, 2008 http://www.inf.uni-konstanz.de/algo/publications/b-vspbc-08.pdf
 
-    .. note:: This method is implemented by Networkx
+    .. note:: This method is implemented by Networkx, except for the parallel and the adaptive sampling modes.
 
     """
-    ebc = nx.edge_betweenness_centrality(graph, k, normalize, weight, seed)
-    significance = {key: value for key, value in ebc.items()}
-    return EdgeSignificance(significance, graph, "betweenness_centrality",
-                            {"k": k, "normalize": normalize, "weight": weight, "seed": seed})
-
-
-def degree_product(graph: nx.Graph, weight: str = None, theta: float = 1.0) -> EdgeSignificance:
+    attrs = None
+    with phase("shortest_paths", sources=graph.number_of_nodes() if k is None else k) as record:
+        if n_jobs is None and epsilon is None and budget is None and not isinstance(graph, CSRGraph):
+            ebc = nx.edge_betweenness_centrality(graph, k, normalize, weight, seed)
+            significance = {key: value for key, value in ebc.items()}
+        else:
+            significance, attrs = brandes_betweenness(graph, k, weight, normalize, edges=True, n_jobs=n_jobs,
+                                                      epsilon=epsilon, delta=delta, seed=seed, context=context,
+                                                      budget=budget)
+            if record is not None:
+                record["sources"] = attrs["samples"]
+    with phase("result"):
+        return EdgeSignificance(significance, graph, "betweenness_centrality",
+                                {"k": k, "normalize": normalize, "weight": weight, "seed": seed,
+                                 "epsilon": epsilon, "delta": delta}, attrs)
+
+
+@profiled
+def degree_product(graph: nx.Graph, weight: str = None, theta: float = 1.0,
+                   context: GraphContext = None) -> EdgeSignificance:
     """
     Compute the degree product to represent the edge importance.
 
@@ -56,6 +101,7 @@ def degree_product(graph: nx.Graph, weight: str = None, theta: float = 1.0) -> E
     :param graph:  the networkx graph object to be used.
     :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
     :param theta: a tunable parameter. default value is 1.0
+    :param context: If not None, the GraphContext of graph to take the degrees from
     :return: an EdgeSignificance object
 
     .. rubric:: Example
@@ -71,22 +117,31 @@ def degree_product(graph: nx.Graph, weight: str = None, theta: float = 1.0) -> E
     .. [2] Barrat A, Barthelemy M, Pastor-Satorras R, et al. The architecture of complex weighted networks[J]. Proceedings of the national academy of sciences, 2004, 101(11): 3747-3752.
     .. [3] Tang M, Zhou T. Efficient routing strategies in scale-free networks with limited bandwidth[J]. Physical review E, 2011, 84(2): 026116.
     """
-    significance = {
-        [u, v]: (graph.degree(u, weight=weight) * graph.degree(v, weight=weight)) ** theta
-        for u, v in graph.edges()}
-    return EdgeSignificance(significance, graph, "degree_product", {"weight": weight, "theta": theta})
-
-
-def diffusion_importance(graph: nx.Graph) -> EdgeSignificance:
+    context = graph_context(graph, context)
+    with phase("degrees"):
+        degrees = context.degrees(weight)
+        sources, targets = context.edge_ends
+    with phase("products"):
+        products = (degrees[sources] * degrees[targets]) ** theta
+    with phase("result"):
+        return _edge_significance(context, products, graph, "degree_product", {"weight": weight, "theta": theta})
+
+
+@profiled
+def diffusion_importance(graph: nx.Graph, chunk_size: int = None, context: GraphContext = None) -> EdgeSignificance:
     """
     The diffusion importance of an edge takes disease spread process into consideration.
 
     .. math:: D_{e} = \\frac{n_{x \\leftarrow y} + n_{y \leftarrow x}}{2}
 
     where :math:`n_{x \\leftarrow y}` is the number of links of node y connecting outside the nearest neighborhood of
-    node x.
+    node x. With :math:`T_e` the number of triangles through e = (x, y), :math:`n_{x \\leftarrow y} = k_y - 1 - T_e`.
+    The triangles of all edges are counted at once as :math:`A \\circ A^2` over the sparse adjacency matrix.
 
     :param graph: the networkx graph object to be used. Treat it as unweighted
+    :param chunk_size: If None, :math:`A^2` is built at once. Otherwise it is built chunk_size rows at a time, for
+      graphs whose fill-in does not fit in memory.
+    :param context: If not None, the GraphContext of graph to take the adjacency matrix from
     :return: an EdgeSignificance object
 
     .. rubric:: Example
@@ -100,16 +155,23 @@ def diffusion_importance(graph: nx.Graph) -> EdgeSignificance:
 
     .. [1] Liu Y, Tang M, Zhou T, et al. Improving the accuracy of the k-shell method by removing redundant links: From a perspective of spreading dynamics[J]. Scientific reports, 2015, 5: 13172.
     """
-    significance = {}
-    for u, v in graph.edges():
-        u_neighbors, v_neighbors = graph.neighbors(u), graph.neighbors(v)
-        n_uv = len([node for node in u_neighbors if graph.has_edge(v, node) and node != v])
-        n_vu = len([node for node in v_neighbors if graph.has_edge(u, node) and node != u])
-        significance[[u, v]] = (n_uv + n_vu)/2
-    return EdgeSignificance(significance, graph, "diffusion_importance", None)
-
-
-def brightness(graph: nx.Graph) -> EdgeSignificance:
+    context = graph_context(graph, context)
+    with phase("adjacency"):
+        adjacency = context.binary_adjacency()
+        sources, targets = context.edge_ends
+    with phase("triangles", pairs=len(sources)):
+        degrees = np.diff(adjacency.indptr)
+        triangles = common_neighbors(adjacency, sources, targets, chunk_size)
+        n_uv = degrees[targets] - 1 - triangles
+        n_vu = degrees[sources] - 1 - triangles
+        values = np.where(sources == targets, 0, (n_uv + n_vu) / 2)  # self-loops connect nothing
+    with phase("result"):
+        return _edge_significance(context, values, graph, "diffusion_importance", None)
+
+
+@profiled
+def brightness(graph: nx.Graph, max_cliques: int = None, time_limit: float = None,
+               context: GraphContext = None, budget: Budget = None) -> EdgeSignificance:
     """
     The brightness of an edge can reflect the significance in maintaining global connectivity, which only depends on local information
     of network topology.
@@ -118,7 +180,18 @@ def brightness(graph: nx.Graph) -> EdgeSignificance:
 
     where x and y are the two endpoints of the edge E. S is the clique size.
 
+    The largest clique of every node and edge comes from a :class:`CliqueIndex`, built in one pass over the maximal
+    cliques. When clique enumeration explodes, max_cliques or time_limit bound it, and the edges left uncovered use a
+    triangle, or a clique grown greedily until time_limit, instead. The result is then approximate, which is recorded
+    as `attrs["exact"]`.
+
     :param graph: the networkx graph object to be used
+    :param max_cliques: If not None, enumerate at most that many maximal cliques
+    :param time_limit: If not None, stop enumerating maximal cliques after that many seconds
+    :param context: If not None, the GraphContext of graph that memoizes the clique index
+    :param budget: If not None, a :class:`nneslib.utils.budget.Budget` on the enumerated maximal cliques, stopping
+      the enumeration like max_cliques and time_limit do. The fraction of the edges covered by an enumerated clique is
+      recorded as the coverage in `attrs`. The clique index is then not memoized.
     :return: an EdgeSignificance object
 
     .. rubric:: Example
@@ -132,24 +205,29 @@ def brightness(graph: nx.Graph) -> EdgeSignificance:
 
     .. [1]Cheng X Q, Ren F X, Shen H W, et al. Bridgeness: a local index on edge significance in maintaining global connectivity[J]. Journal of Statistical Mechanics: Theory and Experiment, 2010, 2010(10): P10011.
     """
-    cliques = sorted(nx.find_cliques(graph), key=len, reverse=True)
-    significance = {}
-    for u, v in graph.edges():
-        s_u, s_v, s_e = 0, 0, 0
-        for clique in cliques:
-            if s_u * s_v * s_e != 0:    # already find
-                break
-            if u in clique and s_u == 0:
-                s_u = len(clique)
-            if v in clique and s_v == 0:
-                s_v = len(clique)
-            if u in clique and s_e == 0 and v in clique:
-                s_e = len(clique)
-        significance[[u,v]] = np.sqrt(s_u * s_v) / s_e
-    return EdgeSignificance(significance, graph, "brightness", None)
-
-
-def ERW_Kpath(graph: nx.Graph, k: int, ruo: int, beta:float) -> EdgeSignificance:
+    context = graph_context(graph, context)
+    with phase("cliques") as record:
+        if budget is None:
+            index = context.cliques(max_cliques, time_limit)
+        else:
+            index = CliqueIndex(graph, max_cliques, time_limit, budget)
+        if record is not None:
+            record["cliques"] = index.number_of_cliques
+    with phase("brightness"):
+        sources, targets = context.edge_ends
+        s_u, s_v = index.node_size[sources].astype(np.float64), index.node_size[targets].astype(np.float64)
+        s_e = index.edges(context.edges)
+        values = np.sqrt(s_u * s_v) / s_e
+    with phase("result"):
+        return _edge_significance(context, values, graph, "brightness",
+                                  {"max_cliques": max_cliques, "time_limit": time_limit},
+                                  dict(budget.report(index.coverage, index.exact) if budget is not None else {},
+                                       exact=index.exact, cliques=index.number_of_cliques))
+
+
+@profiled
+def ERW_Kpath(graph: nx.Graph, k: int, ruo: int, beta: float, seed: int = None, n_jobs: int = None,
+              context: GraphContext = None, budget: Budget = None) -> EdgeSignificance:
     """
     Edge random walk K path. This method use random walk to estimate the edge k-path centrality.
 
@@ -162,11 +240,77 @@ def ERW_Kpath(graph: nx.Graph, k: int, ruo: int, beta:float) -> EdgeSignificance
     :param k: the max path length
     :param ruo: how many times to iter
     :param beta: update step.
+    :param seed: seed of the random walks. The same seed gives the same result whatever n_jobs is.
+    :param n_jobs: the number of worker processes sharing the walks. None or 1 runs in the calling process,
+      -1 uses all CPUs.
+    :param context: If not None, the GraphContext of graph to take the adjacency from
+    :param budget: If not None, a :class:`nneslib.utils.budget.Budget` on the walks. When it runs out, the weights
+      only count the completed walks, whose number and coverage are recorded in `attrs`.
     :return: an EdgeSignificance object
 
+    .. rubric:: Example
+
+    >>> from nneslib.edge import edge_significance
+    >>> import networkx as nx
+    >>> G = nx.karate_club_graph()
+    >>> es = edge_significance.ERW_Kpath(G, k=5, ruo=10000, beta=0.01, seed=42)
+
     .. rubric:: Reference
     .. [1] Meo, Pasquale De, Emilio Ferrara, Giacomo Fiumara, and Angela Ricciardello 2013A Novel Measure of Edge Centrality in Social Networks. ArXiv.
     """
-    significance = edge_random_walk_k_path(graph, k, ruo, beta)
-    return EdgeSignificance(significance, graph, "ERW_Kpath", {"k": k, "ruo": ruo, "beta": beta})
+    context = graph_context(graph, context)
+    weights = edge_random_walk_k_path(graph, k, ruo, beta, seed, n_jobs, context, budget)
+    attrs = None if budget is None else dict(budget.report(), walks=budget.done)
+    with phase("result"):
+        return _edge_significance(context, weights, graph, "ERW_Kpath",
+                                  {"k": k, "ruo": ruo, "beta": beta, "seed": seed}, attrs)
+
+
+def streaming_degree_product(filepath: str, output: str, weighted: bool = False, theta: float = 1.0,
+                             directed: bool = False, chunk_size: int = EDGE_CHUNK_SIZE, delimiter: str = None,
+                             comments: str = "#", skiprows: int = 0) -> EdgeSignificance:
+    """
+    The degree product of :func:`degree_product` for an edge list too large to build any graph from.
+
+    A first pass over the file counts the degrees, see :func:`nneslib.utils.edge_stream.stream_degrees`, and a
+    second pass writes the product of every edge, in file order, to the binary result file `output` of
+    :func:`nneslib.classes.binary_format.save`. Only the node labels, the degrees and one chunk of edges are held in
+    memory, whatever the number of edges. Unlike a graph, the edge list is not deduplicated: every line is an edge.
 
+    :param filepath: a text edge list with one "source target [weight]" line per edge, or a binary file of
+      :func:`nneslib.utils.edge_stream.write_edge_list`, which is memory-mapped
+    :param output: the file path of the result
+    :param weighted: whether the degrees are the sums of the weights of the third column
+    :param theta: a tunable parameter. default value is 1.0
+    :param directed: whether the edges are directed
+    :param chunk_size: the number of edges read at a time
+    :param delimiter: the column separator of a text file, None for any whitespace
+    :param comments: the prefix of the comment lines of a text file
+    :param skiprows: the number of header lines of a text file to skip
+    :return: the EdgeSignificance of the result file, memory-mapped, without a graph
+
+    .. rubric:: Example
+
+    >>> from nneslib.edge import edge_significance
+    >>> es = edge_significance.streaming_degree_product("edges.txt", "degree_product.nnes")
+    >>> es.store.values[:10]
+    """
+    labels, degrees, m = stream_degrees(filepath, chunk_size, weighted, delimiter, comments, skiprows)
+    header = {"algorithm": "degree_product", "params": {"weighted": weighted, "theta": theta}, "attrs": None,
+              "kind": "edge", "directed": directed, "labels": labels.tolist()}
+    index_dtype = _index_dtype(len(labels))
+    arrays = binary_format.create_arrays(output, header, {"sources": (index_dtype, (m,)),
+                                                          "targets": (index_dtype, (m,)),
+                                                          "values": (np.float64, (m,))})
+    lookup, start = label_lookup(labels), 0
+    for sources, targets, _ in edge_chunks(filepath, chunk_size, False, delimiter, comments, skiprows, labels.dtype):
+        sources, targets = label_indices(labels, sources, lookup), label_indices(labels, targets, lookup)
+        end = start + len(sources)
+        arrays["sources"][start:end], arrays["targets"][start:end] = sources, targets
+        arrays["values"][start:end] = (degrees[sources] * degrees[targets]) ** theta
+        start = end
+    for array in arrays.values():
+        if isinstance(array, np.memmap):
+            array.flush()
+    del arrays
+    return binary_format.load(output)
@@ -1,46 +1,121 @@
 import networkx as nx
-import random
+import numpy as np
 
+from nneslib.classes.graph_context import GraphContext, graph_context
+from nneslib.utils.budget import Budget, budgeted_map
+from nneslib.utils.profiling import phase
 
-def edge_random_walk_k_path(graph: nx.Graph, k: int, ruo: int, beta: float):
-    normlized_deg = _normalized_degree(graph)
-    edge_weight = _initial_edge_weight(graph)
-    for i in range(0, ruo):
-        N, vn = 0, random.choice(list(graph.nodes()))
-        edge_weight = _message_propagation(graph, vn, N, k, beta, edge_weight)
-    return edge_weight
+# Walks simulated together by one task of the engine
+WALK_BATCH_SIZE = 4096
 
+# Edge-indexed CSR adjacency of the graph, shared with the worker processes by `_init_worker`
+_WALK_GRAPH = {}
 
-def _normalized_degree(graph: nx.Graph) -> dict:
+
+def _init_worker(indptr: np.ndarray, neighbors: np.ndarray, slot_edges: np.ndarray, edge_slots: np.ndarray,
+                 edge_ends: np.ndarray) -> None:
+    _WALK_GRAPH.update(indptr=indptr, neighbors=neighbors, slot_edges=slot_edges, edge_slots=edge_slots,
+                       edge_ends=edge_ends)
+
+
+def _walk_graph(context: GraphContext) -> tuple:
+    """
+    Build the edge-indexed CSR adjacency the walks run on. Self-loops and parallel edges are left out, a walk never
+    traverses them.
+
+    :return: the edges (in graph.edges() order) and the arrays passed to `_init_worker`: indptr, the neighbor and
+      the edge id of every slot, the two slots of every edge, and the two endpoints of every edge
+    """
+    _, edges, ends, indptr, neighbors, slot_edges, _ = context.edge_indexed_csr()
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    # edge_slots[e, 0] is the slot of e in the row of ends[e, 0], edge_slots[e, 1] the one in the row of ends[e, 1]
+    edge_slots = np.zeros((len(edges), 2), dtype=np.int64)
+    slots = np.arange(len(rows))
+    from_first_end = rows == ends[slot_edges, 0]
+    edge_slots[slot_edges[from_first_end], 0] = slots[from_first_end]
+    edge_slots[slot_edges[~from_first_end], 1] = slots[~from_first_end]
+    return edges, (indptr, neighbors, slot_edges, edge_slots, ends)
+
+
+def _walk_batch(task: tuple) -> np.ndarray:
     """
-    .. math:: \\delta(v_n) = \\frac{|I(v_n)|}{|V|}
+    Simulate a batch of walks of at most k steps at once.
+
+    Every walk keeps only the k edges it has traversed. At each step, the visited edges incident to the current node
+    are located in its adjacency row, and a uniform draw among the remaining slots is shifted past them.
+
+    :return: how many times every edge was traversed
+    """
+    walks, k, seed = task
+    indptr, neighbors, slot_edges = _WALK_GRAPH["indptr"], _WALK_GRAPH["neighbors"], _WALK_GRAPH["slot_edges"]
+    edge_slots, edge_ends = _WALK_GRAPH["edge_slots"], _WALK_GRAPH["edge_ends"]
+    rng = np.random.default_rng(seed)
+    n = len(indptr) - 1
+    if len(neighbors) == 0:
+        return np.zeros(len(edge_ends), dtype=np.int64)
+    current = rng.integers(n, size=walks)
+    active = np.ones(walks, dtype=bool)
+    visited = np.full((walks, k), -1, dtype=np.int64)
+    for step in range(k):
+        start = indptr[current]
+        degree = indptr[current + 1] - start
+        edge = np.maximum(visited[:, :step], 0)
+        at_first_end = (visited[:, :step] >= 0) & (edge_ends[edge, 0] == current[:, None])
+        at_second_end = (visited[:, :step] >= 0) & (edge_ends[edge, 1] == current[:, None])
+        available = degree - at_first_end.sum(axis=1) - at_second_end.sum(axis=1)
+        active &= available > 0
+        if not active.any():
+            break
+        positions = np.where(at_first_end, edge_slots[edge, 0],
+                             np.where(at_second_end, edge_slots[edge, 1], np.iinfo(np.int64).max)) - start[:, None]
+        positions.sort(axis=1)
+        draw = np.floor(rng.random(walks) * np.maximum(available, 1)).astype(np.int64)
+        for column in range(step):  # skip the visited slots at or before the draw
+            draw += positions[:, column] <= draw
+        slot = start + np.where(active, draw, 0)
+        traversed = np.where(active, slot_edges[np.minimum(slot, len(slot_edges) - 1)], -1)
+        visited[:, step] = traversed
+        current = np.where(active, neighbors[np.minimum(slot, len(neighbors) - 1)], current)
+    return np.bincount(visited[visited >= 0], minlength=len(edge_ends))
+
+
+def edge_random_walk_k_path(graph: nx.Graph, k: int, ruo: int, beta: float, seed: int = None,
+                            n_jobs: int = None, context: GraphContext = None, budget: Budget = None) -> dict:
+    """
+    Batched random walk engine of the ERW-KPath centrality.
+
+    Each of the ruo walks starts at a uniformly chosen node and, for at most k steps, traverses a uniformly chosen
+    incident edge it has not traversed yet, adding beta to its weight. Walks run WALK_BATCH_SIZE at a time over an
+    edge-indexed CSR adjacency. Every batch draws from its own random stream spawned from seed, so the result only
+    depends on seed, and the batches can be spread over n_jobs processes and merged exactly by summing the traversal
+    counts. With a budget, the work units are walks and the result only counts the walks of the completed batches.
 
-    where :math:`I(v_n)` represents the set of edges incident on :math:`v_n`.
-    :param graph: the networkx graph object to be used.
-    :return: a dict of normalized degree
+    :param graph: the networkx graph object to be used
+    :param k: the max path length
+    :param ruo: how many walks to simulate
+    :param beta: update step
+    :param seed: seed of the random streams, None draws fresh entropy
+    :param n_jobs: the number of worker processes, None or 1 runs in the calling process
+    :param context: If not None, the GraphContext holding the edge-indexed adjacency of graph
+    :param budget: If not None, the :class:`Budget` that may stop the walks early
+    :return: the weight of every edge, in graph.edges() order
     """
-    return {node: len(graph.neighbors(node))/graph.number_of_nodes() for node in graph.nodes()}
-
-
-def _initial_edge_weight(graph: nx.Graph) -> dict:
-    edges_number = graph.number_of_edges()
-    return {(u,v): 1/edges_number for u, v in graph.edges()}
-
-
-def _message_propagation(graph, vn, N: int, k: int, ruo: float, edge_weight: dict) -> dict:
-    T = {}
-    for u, v in graph.edges():
-        T[(u,v)] = 0
-        T[(v,u)] = 0
-    while N < k and len(graph.neighbors(vn)) > sum([T[(u,vn)] for u in graph.neighbors(vn)]):
-        edges = [(u, vn) for u in graph.neighbors(vn) if T[(u, vn)] == 0]
-        selected_edge = random.choice(edges)
-        if selected_edge in edge_weight:
-            edge_weight[selected_edge] += ruo
-        else:
-            edge_weight[(selected_edge[1], selected_edge[0])] += ruo
-        T[selected_edge] = 1
-        T[(selected_edge[1], selected_edge[0])] = 1
-        vn = selected_edge[0]
-        N += 1
-    return edge_weight
+    allowed = ruo if budget is None else budget.start(ruo)
+    with phase("adjacency"):
+        edges, initargs = _walk_graph(graph_context(graph, context))
+    if not edges:
+        return np.zeros(0)
+    batches = [min(WALK_BATCH_SIZE, ruo - start) for start in range(0, ruo, WALK_BATCH_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    tasks = [(walks, k, batch_seed) for walks, batch_seed in zip(batches, seeds)]
+    if allowed < ruo:
+        # the batches keep their random stream whatever the budget, so the complete batches of a partial result walk
+        # as in the full one. The truncated last batch draws fewer walks, which shifts its stream
+        tasks = [(min(walks, allowed - start), k, batch_seed) for start, (walks, k, batch_seed)
+                 in zip(range(0, ruo, WALK_BATCH_SIZE), tasks) if start < allowed]
+    counts = np.zeros(len(edges), dtype=np.int64)
+    with phase("walks", walks=ruo, batches=len(batches)):
+        for batch_counts in budgeted_map(_walk_batch, tasks, budget, lambda task: task[0], n_jobs, _init_worker,
+                                         initargs):
+            counts += batch_counts
+    return 1 / len(edges) + beta * counts
@@ -1,3 +1,4 @@
 from .ERW import edge_random_walk_k_path
+from .clique_index import CliqueIndex
 
-__all__ = ['edge_random_walk_k_path']
\ No newline at end of file
+__all__ = ['edge_random_walk_k_path', 'CliqueIndex']
\ No newline at end of file
@@ -0,0 +1,161 @@
+import time
+
+import networkx as nx
+import numpy as np
+
+from nneslib.classes.csr_graph import CSRGraph
+from nneslib.utils.budget import Budget
+from nneslib.utils.csr import to_csr, binary_adjacency, common_neighbors
+
+# Number of clique pairs buffered before they are folded into the index
+_BUFFER_PAIRS = 1 << 16
+
+
+class CliqueIndex(object):
+    def __init__(self, graph: nx.Graph, max_cliques: int = None, time_limit: float = None, budget: Budget = None):
+        """
+        The size of the largest clique containing every node and every edge.
+
+        The maximal cliques are streamed once from `nx.find_cliques` and folded into per node and per edge maxima,
+        without materializing the list of cliques. If max_cliques or time_limit stops the enumeration early, the
+        edges not covered by any enumerated clique get the size of a triangle or of the edge itself. With a time_limit,
+        the remaining time is spent growing cliques greedily from their common neighbors; without one, the bound is
+        left as is so that the approximate index stays cheaper than the exact one. Every size is then only a lower
+        bound (`exact` is False). `coverage` is the fraction of the edges covered by an enumerated clique.
+
+        :param graph: the networkx graph object to be used. Treat it as unweighted. The cliques of a CSRGraph are
+          enumerated on its networkx conversion
+        :param max_cliques: If not None, stop after enumerating that many maximal cliques
+        :param time_limit: If not None, stop enumerating cliques after that many seconds
+        :param budget: If not None, a :class:`Budget` on the enumerated cliques, adding its limits to the ones above.
+          The greedy growth only runs while the budget is not exhausted
+        """
+        self.budget = budget
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        if budget is not None:
+            allowed = budget.start()
+            if allowed is not None:
+                max_cliques = allowed if max_cliques is None else min(max_cliques, allowed)
+            if budget.deadline is not None:
+                deadline = budget.deadline if deadline is None else min(deadline, budget.deadline)
+        adjacency, self.nodes = to_csr(graph)
+        self.adjacency = binary_adjacency(adjacency)
+        self.vertices_dict = {node: index for index, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+        # Edges are identified by the sorted keys min(i, j) * n + max(i, j) of the upper triangle
+        upper = self.adjacency.tocoo()
+        upper_mask = upper.row < upper.col
+        self._edge_keys = np.sort(upper.row[upper_mask].astype(np.int64) * n + upper.col[upper_mask])
+        self.node_size = np.zeros(n, dtype=np.int64)
+        self.edge_size = np.zeros(len(self._edge_keys), dtype=np.int64)
+        self.exact, self.number_of_cliques = self._stream(
+            graph.to_networkx() if isinstance(graph, CSRGraph) else graph, max_cliques, deadline)
+        covered = np.count_nonzero(self.edge_size)
+        self.coverage = 1.0 if self.exact or len(self.edge_size) == 0 else float(covered / len(self.edge_size))
+        if not self.exact:
+            self._complete(deadline)
+        self.node_size = np.maximum(self.node_size, 1)
+
+    def _stream(self, graph: nx.Graph, max_cliques: int, deadline: float) -> tuple:
+        """
+        Fold the maximal cliques into the index, in buffers of about _BUFFER_PAIRS node pairs.
+
+        :return: whether all cliques were enumerated, and how many were
+        """
+        buffer, buffered_pairs, count = [], 0, 0
+        for clique in nx.find_cliques(graph):
+            if (max_cliques is not None and count >= max_cliques) or \
+                    (deadline is not None and time.monotonic() > deadline):
+                self._fold(buffer)
+                if self.budget is not None:
+                    self.budget.advance(len(buffer))  # also records why it stopped
+                return False, count
+            count += 1
+            buffer.append([self.vertices_dict[node] for node in clique])
+            buffered_pairs += len(clique) * (len(clique) - 1) // 2
+            if buffered_pairs >= _BUFFER_PAIRS:
+                self._fold(buffer)
+                if self.budget is not None and not self.budget.advance(len(buffer)):
+                    return False, count
+                buffer, buffered_pairs = [], 0
+        self._fold(buffer)
+        if self.budget is not None:
+            self.budget.advance(len(buffer))
+        return True, count
+
+    def _fold(self, cliques: list) -> None:
+        if not cliques:
+            return
+        sizes = np.array([len(clique) for clique in cliques], dtype=np.int64)
+        members = np.concatenate([np.asarray(clique, dtype=np.int64) for clique in cliques])
+        np.maximum.at(self.node_size, members, np.repeat(sizes, sizes))
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        for size in np.unique(sizes[sizes > 1]):
+            # All the cliques of one size at once: their (len(of_size), size) member matrix and upper pairs
+            of_size = members[offsets[sizes == size, None] + np.arange(size)]
+            first, second = np.triu_indices(size, 1)
+            u, v = of_size[:, first].ravel(), of_size[:, second].ravel()
+            keys = np.minimum(u, v) * len(self.nodes) + np.maximum(u, v)
+            np.maximum.at(self.edge_size, np.searchsorted(self._edge_keys, keys), size)
+
+    def _complete(self, deadline: float) -> None:
+        """
+        Lower bounds for the edges that no enumerated clique covers: the edge itself or a triangle, improved by
+        growing a clique greedily from the common neighbors until the deadline, if there is one, or until the budget
+        is exhausted.
+        """
+        indptr, indices = self.adjacency.indptr, self.adjacency.indices
+        degrees = np.diff(indptr)
+        n = len(self.nodes)
+        uncovered = np.flatnonzero(self.edge_size == 0)
+        u, v = np.divmod(self._edge_keys[uncovered], n)
+        self.edge_size[uncovered] = np.where(common_neighbors(self.adjacency, u, v) > 0, 3, 2)
+        for position in uncovered.tolist() if deadline is not None else ():
+            if time.monotonic() > deadline or (self.budget is not None and self.budget.exhausted):
+                break
+            u, v = divmod(int(self._edge_keys[position]), n)
+            clique = [u, v]
+            candidates = set(indices[indptr[u]:indptr[u + 1]].tolist()) & set(indices[indptr[v]:indptr[v + 1]].tolist())
+            for candidate in sorted(candidates, key=lambda node: -degrees[node]):
+                neighbors = indices[indptr[candidate]:indptr[candidate + 1]]
+                if np.all(np.isin(clique, neighbors)):
+                    clique.append(candidate)
+            self.edge_size[position] = max(len(clique), self.edge_size[position])
+        # A clique containing an edge contains both its endpoints
+        u, v = np.divmod(self._edge_keys, n)
+        np.maximum.at(self.node_size, u, self.edge_size)
+        np.maximum.at(self.node_size, v, self.edge_size)
+
+    def node(self, node) -> int:
+        """
+        The size of the largest (known) clique containing a node.
+
+        :param node: node label
+        :return: the clique size, 1 for an isolated node
+        """
+        return int(self.node_size[self.vertices_dict[node]])
+
+    def edge(self, source, target) -> int:
+        """
+        The size of the largest (known) clique containing an edge.
+
+        :param source: source node label
+        :param target: target node label
+        :return: the clique size, the one of the node for a self-loop
+        """
+        u, v = self.vertices_dict[source], self.vertices_dict[target]
+        if u == v:
+            return int(self.node_size[u])
+        position = np.searchsorted(self._edge_keys, min(u, v) * len(self.nodes) + max(u, v))
+        return int(self.edge_size[position])
+
+    def edges(self, edges: list) -> np.ndarray:
+        """
+        Vectorized :meth:`edge` over a list of (source, target) edges.
+        """
+        u = np.fromiter((self.vertices_dict[source] for source, _ in edges), dtype=np.int64, count=len(edges))
+        v = np.fromiter((self.vertices_dict[target] for _, target in edges), dtype=np.int64, count=len(edges))
+        keys = np.minimum(u, v) * len(self.nodes) + np.maximum(u, v)
+        position = np.minimum(np.searchsorted(self._edge_keys, keys), max(len(self._edge_keys) - 1, 0))
+        sizes = self.edge_size[position] if len(self._edge_keys) else np.zeros(len(edges), dtype=np.int64)
+        return np.where(u == v, self.node_size[u], sizes)
@@ -0,0 +1,216 @@
+from typing import List, NamedTuple, Union
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+
+from nneslib.classes.edge_significance import EdgeSignificance
+from nneslib.classes.graph_context import GraphContext, graph_context
+from nneslib.evaluation.robustness import _removal_order
+from nneslib.utils.parallel import parallel_map
+
+
+__all__ = ['CascadeResult', 'CascadeSweep', 'cascading_failure', 'cascade_sweep']
+
+# Edge arrays of the graph and the attack, shared with the worker processes by `_init_worker`
+_EDGES = {}
+
+
+class CascadeResult(NamedTuple):
+    """
+    The outcome of one cascade: the fraction of failed edges (the attacked ones included), the giant component fraction
+    :math:`R_{GC}` of the surviving graph, the number of cascade steps and the failed edges.
+    """
+    method_name: str
+    alpha: float
+    theta: float
+    failed_fraction: float
+    giant_component_fraction: float
+    steps: int
+    failed: list
+
+
+class CascadeSweep(NamedTuple):
+    """
+    The outcome of the cascades over a grid of tolerance parameters :math:`\\alpha` and load exponents :math:`\\theta`.
+
+    `failed_fraction[i, j]`, `giant_component_fraction[i, j]` and `steps[i, j]` are the ones of `thetas[i]` and
+    `alphas[j]`. `critical_alpha[i]` is the smallest alpha of the grid at which no edge but the attacked ones fails,
+    NaN if the cascade spreads at every alpha.
+    """
+    method_name: str
+    alphas: np.ndarray
+    thetas: np.ndarray
+    failed_fraction: np.ndarray
+    giant_component_fraction: np.ndarray
+    steps: np.ndarray
+    critical_alpha: np.ndarray
+
+
+def _cascade(sources: np.ndarray, targets: np.ndarray, degrees: np.ndarray, attacked: np.ndarray,
+             alphas: np.ndarray, theta: float) -> tuple:
+    """
+    Run the cascades of every alpha together, as the rows of (len(alphas), m) load and state arrays.
+
+    When edge :math:`e = (i, j)` fails, every alive edge :math:`f` incident to i or j receives
+    :math:`\\Delta L_f = L_e L_f / (\\sum_{a \\in \\Gamma_i} L_{ia} + \\sum_{b \\in \\Gamma_j} L_{jb})`, the sums
+    running over the alive edges. The edges failing in the same step are removed together, so the share per unit of
+    load every node passes on is :math:`\\rho_x = \\sum_{e \\ni x} L_e / S_e`, and a whole step is a few bincounts
+    over the node indices offset by row. The load of an edge without alive neighbours is lost.
+
+    :return: the (len(alphas), m) alive mask and the number of steps of every cascade
+    """
+    n, m, rows = len(degrees), len(sources), len(alphas)
+    initial = (degrees[sources] * degrees[targets]) ** theta
+    capacity = (1 + alphas)[:, None] * initial
+    load = np.tile(initial, (rows, 1))
+    failing = np.zeros((rows, m), dtype=bool)
+    failing[:, attacked] = True
+    alive = ~failing
+    offsets = (np.arange(rows) * n)[:, None]
+    row_sources, row_targets = (sources + offsets).ravel(), (targets + offsets).ravel()
+    size = rows * n
+    steps = np.zeros(rows, dtype=np.int64)
+    while failing.any():
+        steps += failing.any(axis=1)
+        alive_load = np.where(alive, load, 0.0).ravel()
+        around = np.bincount(row_sources, alive_load, size) + np.bincount(row_targets, alive_load, size)
+        denominators = around[row_sources] + around[row_targets]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = np.where(failing.ravel() & (denominators > 0), load.ravel() / denominators, 0.0)
+        rho = np.bincount(row_sources, shares, size) + np.bincount(row_targets, shares, size)
+        load = np.where(alive, load * (1 + (rho[row_sources] + rho[row_targets]).reshape(rows, m)), load)
+        failing = alive & (load > capacity)
+        alive &= ~failing
+    return alive, steps
+
+
+def _giant_component_fractions(sources: np.ndarray, targets: np.ndarray, n: int, alive: np.ndarray) -> np.ndarray:
+    """
+    The giant component fraction of the graph of the alive edges of every row of alive.
+    """
+    fractions = np.zeros(len(alive))
+    for row, mask in enumerate(alive):
+        adjacency = sp.csr_matrix((np.ones(int(mask.sum())), (sources[mask], targets[mask])), shape=(n, n))
+        labels = csgraph.connected_components(adjacency, directed=False)[1]
+        fractions[row] = np.bincount(labels).max() / n if n else 0.0
+    return fractions
+
+
+def _init_worker(sources: np.ndarray, targets: np.ndarray, degrees: np.ndarray, attacked: np.ndarray,
+                 alphas: np.ndarray) -> None:
+    _EDGES.update(sources=sources, targets=targets, degrees=degrees, attacked=attacked, alphas=alphas)
+
+
+def _sweep_point(theta: float) -> tuple:
+    """
+    The failed fractions, giant component fractions and steps of the shared graph and attack at theta, over every
+    alpha.
+    """
+    sources, targets, degrees = _EDGES["sources"], _EDGES["targets"], _EDGES["degrees"]
+    alive, steps = _cascade(sources, targets, degrees, _EDGES["attacked"], _EDGES["alphas"], theta)
+    failed = 1 - alive.mean(axis=1) if alive.shape[1] else np.zeros(len(alive))
+    return failed, _giant_component_fractions(sources, targets, len(degrees), alive), steps
+
+
+def _attack(significance: EdgeSignificance, context: GraphContext, attacked: int) -> np.ndarray:
+    """
+    The edge indices of the `attacked` most significant edges.
+    """
+    if not isinstance(significance, EdgeSignificance):
+        raise ValueError(f"Expected an EdgeSignificance, got {type(significance)}")
+    if not 0 < attacked <= len(context.edges):
+        raise ValueError(f"attacked must lie in [1, {len(context.edges)}], got {attacked}")
+    return _removal_order(significance, context)[:attacked]
+
+
+def cascading_failure(graph: nx.Graph, significance: EdgeSignificance, alpha: float, theta: float = 1.0,
+                      attacked: int = 1, context: GraphContext = None) -> CascadeResult:
+    """
+    Attack the most significant edges of a ranking and let the failure cascade with the load redistribution model of
+    Wang and Chen.
+
+    .. math:: L_{ij} = (k_ik_j)^\\theta, C_{ij} = (1 + \\alpha)L_{ij}
+
+    The load of a failed edge is shared among the alive edges incident to its endpoints, in proportion to their loads.
+    Every edge whose load then exceeds its capacity fails at the next step, until no edge fails. The edges are the
+    ones of graph.edges(), the edges of a directed graph being shared by both endpoints as well.
+
+    :param graph: the networkx graph object to be used
+    :param significance: the ranking of the attack
+    :param alpha: the tolerance parameter, :math:`\\alpha \\geq 0`
+    :param theta: the load exponent
+    :param attacked: the number of most significant edges removed to trigger the cascade
+    :param context: If not None, the GraphContext of graph to take the edges and degrees from
+    :return: a CascadeResult
+    :raise: :class:`ValueError` if significance is not an EdgeSignificance or attacked is not in [1, m]
+
+    .. rubric:: Example
+
+    >>> from nneslib.edge import edge_significance
+    >>> from nneslib.evaluation.cascading_failure import cascading_failure
+    >>> import networkx as nx
+    >>> G = nx.barabasi_albert_graph(1000, 3, seed=0)
+    >>> result = cascading_failure(G, edge_significance.degree_product(G), alpha=0.2, attacked=10)
+
+    .. rubric:: Reference
+
+    .. [1] Wang W X, Chen G. Universal robustness characteristic of weighted networks against cascading failure[J]. Physical Review E, 2008, 77(2): 026101.
+    """
+    context = graph_context(graph, context)
+    order = _attack(significance, context, attacked)
+    sources, targets = context.edge_ends
+    degrees = context.degrees()
+    alive, steps = _cascade(sources, targets, degrees, order, np.array([float(alpha)]), theta)
+    edges = context.edges
+    failed = [edges[i] for i in np.flatnonzero(~alive[0]).tolist()]
+    return CascadeResult(significance.method_name, alpha, theta, len(failed) / len(edges),
+                         float(_giant_component_fractions(sources, targets, len(degrees), alive)[0]), int(steps[0]),
+                         failed)
+
+
+def cascade_sweep(graph: nx.Graph, significance: EdgeSignificance, alphas: Union[List[float], np.ndarray],
+                  thetas: Union[List[float], np.ndarray] = (1.0,), attacked: int = 1, n_jobs: int = None,
+                  context: GraphContext = None) -> CascadeSweep:
+    """
+    Run the cascade of :func:`cascading_failure` over a grid of alphas and thetas.
+
+    The cascades of all alphas of a theta run together as the rows of one batch, and the thetas are independent sweep
+    points spread over a process pool.
+
+    :param graph: the networkx graph object to be used
+    :param significance: the ranking of the attack
+    :param alphas: the tolerance parameters
+    :param thetas: the load exponents
+    :param attacked: the number of most significant edges removed to trigger the cascades
+    :param n_jobs: the number of worker processes, see :func:`nneslib.utils.parallel.effective_n_jobs`
+    :param context: If not None, the GraphContext of graph to take the edges and degrees from
+    :return: a CascadeSweep
+    :raise: :class:`ValueError` if significance is not an EdgeSignificance or attacked is not in [1, m]
+
+    .. rubric:: Example
+
+    >>> from nneslib.edge import edge_significance
+    >>> from nneslib.evaluation.cascading_failure import cascade_sweep
+    >>> import networkx as nx
+    >>> import numpy as np
+    >>> G = nx.barabasi_albert_graph(1000, 3, seed=0)
+    >>> sweep = cascade_sweep(G, edge_significance.betweenness_centrality(G), np.linspace(0, 1, 21), [0.5, 1.0, 1.5])
+    >>> sweep.critical_alpha
+    """
+    context = graph_context(graph, context)
+    order = _attack(significance, context, attacked)
+    sources, targets = context.edge_ends
+    alphas, thetas = np.asarray(alphas, dtype=np.float64), np.asarray(thetas, dtype=np.float64)
+    points = parallel_map(_sweep_point, thetas.tolist(), n_jobs, _init_worker,
+                          (sources, targets, context.degrees(), order, alphas))
+    failed, giant, steps = (np.array([point[i] for point in points]).reshape(len(thetas), len(alphas))
+                            for i in range(3))
+    spread = failed > attacked / len(context.edges) + 1e-12
+    critical = np.full(len(thetas), np.nan)
+    for row, mask in enumerate(spread):
+        contained = np.flatnonzero(~mask)
+        if len(contained):
+            critical[row] = alphas[contained].min()
+    return CascadeSweep(significance.method_name, alphas, thetas, failed, giant, steps, critical)
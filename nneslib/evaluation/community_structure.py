@@ -1,8 +1,29 @@
 import networkx as nx
 import numpy as np
+import numpy.linalg as linalg
+import scipy.sparse as sp
 
+from nneslib.classes.graph_context import GraphContext, graph_context
+from nneslib.utils.parallel import parallel_map
 
-def significance_index(graph: nx.Graph, communities_number: int, weight: str = None) -> float:
+
+def _laplacian(context: GraphContext, weight: str = None) -> np.ndarray:
+    """
+    The dense Laplacian D - A of nx.laplacian_matrix, D holding the row sums of the adjacency A (a self-loop counts
+    once), in context.nodes order.
+    """
+    adjacency = context.adjacency(weight)
+    laplacian = -adjacency.toarray().astype(np.float64)
+    laplacian[np.diag_indices_from(laplacian)] += np.asarray(adjacency.sum(axis=1), dtype=np.float64).ravel()
+    return laplacian
+
+
+def _mean_degree(context: GraphContext, weight: str = None) -> float:
+    return float(np.mean(context.degrees(weight))) if len(context.nodes) else np.nan
+
+
+def significance_index(graph: nx.Graph, communities_number: int, weight: str = None,
+                       context: GraphContext = None) -> float:
     """
     Measure significance of communities structure and independent of the partition algorithm.
 
@@ -15,6 +36,7 @@ def significance_index(graph: nx.Graph, communities_number: int, weight: str = N
     :param graph: the network graph object to be used
     :param communities_number: the number of communities
     :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+    :param context: If not None, the GraphContext of graph to take the adjacency and the degrees from
     :return: the significance of communities structure
 
     .. rubric:: Example
@@ -30,12 +52,138 @@ def significance_index(graph: nx.Graph, communities_number: int, weight: str = N
     .. [1] Hu, Yanqing, Yiming Ding, Ying Fan, and Zengru Di. 2010. How to Measure Significance of Community Structure in Complex Networks. arXiv.
 
     """
-    n = graph.number_of_nodes()
-    k = np.mean([d[1] for d in list(graph.degree(weight=weight))])
-    eigenvalues = nx.laplacian_spectrum(graph, weight)  # eigenvalues in ascending order
+    context = graph_context(graph, context)
+    n = len(context.nodes)
+    k = _mean_degree(context, weight)
+    eigenvalues = linalg.eigvalsh(_laplacian(context, weight))  # eigenvalues in ascending order
     beta = np.mean(eigenvalues[1:communities_number])  # the average value of beta_2 through beta_c
     amplification_coeff = sum([1 / (abs(beta - eigenvalue) + 1e-7)
                                for eigenvalue in
                                eigenvalues[communities_number:]])  # plus 1e-7 to prevent divide by zero
     H: float = n / (k * amplification_coeff)
     return H
+
+
+def _significance_from_spectra(eigenvalues: np.ndarray, communities_number: int, n: np.ndarray,
+                               k: np.ndarray) -> np.ndarray:
+    """
+    H of several graphs at once, given their ascending Laplacian spectra as the rows of eigenvalues.
+    """
+    beta = np.mean(eigenvalues[:, 1:communities_number], axis=1, keepdims=True)
+    amplification_coeff = np.sum(1 / (np.abs(beta - eigenvalues[:, communities_number:]) + 1e-7), axis=1)
+    return n / (k * amplification_coeff)
+
+
+def significance_index_curve(graph: nx.Graph, communities_numbers: list, weight: str = None,
+                             context: GraphContext = None) -> dict:
+    """
+    :func:`significance_index` for many numbers of communities, from a single Laplacian spectrum.
+
+    The averages :math:`\\bar{\\beta}` of all c come from one cumulative sum of the spectrum, and the amplification
+    coefficients are summed as one masked (len(communities_numbers), n) array.
+
+    :param graph: the network graph object to be used
+    :param communities_numbers: the numbers of communities c, each at least 2 and below the number of nodes
+    :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+    :param context: If not None, the GraphContext of graph to take the adjacency and the degrees from
+    :return: a dict of {c: H}
+    :raise: :class:`ValueError` if a number of communities is not in [2, n)
+
+    .. rubric:: Example
+    >>> from nneslib.evaluation.community_structure import significance_index_curve
+    >>> import networkx as nx
+    >>> G = nx.karate_club_graph()
+    >>> significance_index_curve(G, range(2, 10))
+    """
+    context = graph_context(graph, context)
+    n = len(context.nodes)
+    cs = np.asarray(list(communities_numbers), dtype=np.int64)
+    if np.any((cs < 2) | (cs >= n)):
+        raise ValueError(f"Every number of communities must be in [2, {n}), got {cs[(cs < 2) | (cs >= n)].tolist()}")
+    k = _mean_degree(context, weight)
+    eigenvalues = linalg.eigvalsh(_laplacian(context, weight))  # eigenvalues in ascending order
+    cumulative = np.concatenate([[0], np.cumsum(eigenvalues)])
+    beta = (cumulative[cs] - cumulative[1]) / (cs - 1)  # the average value of beta_2 through beta_c
+    H = np.empty(len(cs))
+    chunk = max(1, (1 << 22) // max(n, 1))  # bound the masked array to a few million entries
+    for start in range(0, len(cs), chunk):
+        c, b = cs[start:start + chunk, None], beta[start:start + chunk, None]
+        terms = np.where(np.arange(n) >= c, 1 / (np.abs(b - eigenvalues) + 1e-7), 0)  # plus 1e-7 as in significance_index
+        H[start:start + chunk] = n / (k * terms.sum(axis=1))
+    return {int(c): float(h) for c, h in zip(cs, H)}
+
+
+# Laplacian of the graph and the parameters of the deletion sweep, shared with the worker processes
+_SWEEP = {}
+
+
+def _init_worker(laplacian: np.ndarray, communities_number: int, n: np.ndarray, k: np.ndarray) -> None:
+    _SWEEP.update(laplacian=laplacian, communities_number=communities_number, n=n, k=k)
+
+
+def _deletion_chunk(removed_nodes: np.ndarray) -> np.ndarray:
+    """
+    H after deleting each of removed_nodes, from the exact spectrum of the Laplacian of G - v. That Laplacian is the
+    Laplacian of G without the row and column of v, whose diagonal loses the weights of the edges to v.
+    """
+    laplacian = _SWEEP["laplacian"]
+    spectra = np.empty((len(removed_nodes), len(laplacian) - 1))
+    for row, v in enumerate(removed_nodes):
+        keep = np.arange(len(laplacian)) != v
+        reduced = laplacian[np.ix_(keep, keep)]
+        reduced[np.diag_indices_from(reduced)] += laplacian[keep, v]
+        spectra[row] = linalg.eigvalsh(reduced)
+    return _significance_from_spectra(spectra, _SWEEP["communities_number"], _SWEEP["n"][removed_nodes],
+                                      _SWEEP["k"][removed_nodes])
+
+
+def node_deletion_significance_index(graph: nx.Graph, communities_number: int, weight: str = None,
+                                     method: str = "exact", n_jobs: int = None,
+                                     context: GraphContext = None) -> dict:
+    """
+    :func:`significance_index` of every graph G - v obtained by deleting a single node v.
+
+    "exact" decomposes the n Laplacians of size n - 1, spread over n_jobs processes. "perturbation" decomposes the
+    Laplacian of G once and estimates all deletions in one vectorized step: deleting v has the spectrum of
+    :math:`L - \\sum_{u \\in N(v)} w_{uv}(e_u - e_v)(e_u - e_v)^T` minus one zero eigenvalue, whose eigenvalues are
+    shifted to first order by :math:`-\\sum_{u \\in N(v)} w_{uv}(x_{ju} - x_{jv})^2`; the mode most localized on v is
+    dropped. It is approximate, in particular for degenerate eigenvalues, and meant to rank the nodes of graphs too
+    large for the exact sweep.
+
+    :param graph: the network graph object to be used
+    :param communities_number: the number of communities
+    :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+    :param method: "exact" or "perturbation"
+    :param n_jobs: the number of worker processes of the exact method, None or 1 runs in the calling process
+    :param context: If not None, the GraphContext of graph to take the adjacency and the degrees from
+    :return: a dict of {v: H of G - v}
+    :raise: :class:`ValueError` if the method is unknown
+    """
+    context = graph_context(graph, context)
+    nodes = context.nodes
+    n = len(nodes)
+    laplacian = _laplacian(context, weight)
+    adjacency = context.adjacency(weight)
+    off_diagonal = np.asarray(adjacency.sum(axis=1)).ravel() - adjacency.diagonal()  # weighted degree without loops
+    degrees = context.degrees(weight)
+    # G - v loses v and the edges to v from the other endpoints' degrees
+    remaining_n = np.full(n, n - 1, dtype=np.float64)
+    remaining_k = (degrees.sum() - degrees - off_diagonal) / max(n - 1, 1)
+    if method == "exact":
+        chunks = np.array_split(np.arange(n), max(1, -(-n // 16)))
+        H = np.concatenate(parallel_map(_deletion_chunk, chunks, n_jobs, _init_worker,
+                                        (laplacian, communities_number, remaining_n, remaining_k)))
+    elif method == "perturbation":
+        eigenvalues, X = linalg.eigh(laplacian)
+        loopless = adjacency - sp.diags(adjacency.diagonal())
+        shift = loopless @ (X * X) - 2 * X * (loopless @ X) + off_diagonal[:, None] * X * X
+        # v becomes isolated: drop the mode most localized on v, the one that turns into its zero eigenvalue
+        localization = X * X
+        localization[:, 0] = -1  # the constant mode stays the zero eigenvalue of G - v
+        kept = np.ones((n, n), dtype=bool)
+        kept[np.arange(n), np.argmax(localization, axis=1)] = False
+        spectra = np.sort((eigenvalues[None, :] - shift)[kept].reshape(n, n - 1), axis=1)
+        H = _significance_from_spectra(spectra, communities_number, remaining_n, remaining_k)
+    else:
+        raise ValueError(f"Unknown method {method}, expected 'exact' or 'perturbation'")
+    return {node: float(h) for node, h in zip(nodes, H)}
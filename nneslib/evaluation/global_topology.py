@@ -1,5 +1,17 @@
 import networkx as nx
+import numpy as np
 from collections import Counter
+from scipy.sparse import csgraph
+
+from nneslib.classes.csr_graph import CSRGraph
+
+
+def _component_sizes(graph: CSRGraph) -> np.ndarray:
+    """
+    The sizes of the (weakly) connected components of a CSRGraph, from the largest one.
+    """
+    labels = csgraph.connected_components(graph.adjacency(), directed=False)[1]
+    return np.sort(np.bincount(labels))[::-1]
 
 
 def giant_component_fraction(graph: nx.Graph) -> float:
@@ -8,9 +20,11 @@ def giant_component_fraction(graph: nx.Graph) -> float:
 
     .. math:: R_{GC} = \\frac{|GC|}{|G|}
 
-    :param graph: the graph/graph_view object to be used
+    :param graph: the graph/graph_view object to be used, or a CSRGraph
     :return: the fraction of nodes contained in the giant component
     """
+    if isinstance(graph, CSRGraph):
+        return float(_component_sizes(graph)[0] / graph.number_of_nodes())
     # obtain the biggest component
     giant_component = sorted(nx.connected_components(graph), key=len, reverse=True)[0]
     return len(giant_component) / graph.number_of_nodes()
@@ -25,9 +39,12 @@ def normalized_susceptibility(graph: nx.Graph) -> float:
     where :math:`n_s` is the number of components with size :math:`s`. :math:`N` is the size of the whole network,
     and the sum runs over all components but the largest one.
 
-    :param graph: the graph/graph_view object to be used
+    :param graph: the graph/graph_view object to be used, or a CSRGraph
     :return: the normalized susceptibility of the graph
     """
+    if isinstance(graph, CSRGraph):
+        sizes = _component_sizes(graph)[1:].astype(np.float64)
+        return float(np.sum(sizes * sizes) / graph.number_of_nodes())
     connected_components = sorted(nx.connected_components(graph), key=len, reverse=True)[1:]  # all but largest
     components_size_count = Counter([len(component) for component in connected_components])
     N = graph.number_of_nodes()
@@ -0,0 +1,192 @@
+from typing import List, NamedTuple
+
+import numpy as np
+from scipy import stats
+
+from nneslib.classes.edge_significance import EdgeSignificance
+from nneslib.classes.node_significance import NodeSignificance
+from nneslib.classes.significance import Significance
+
+
+__all__ = ['RankAgreement', 'aligned_values', 'rank_agreement', 'agreement_matrix']
+
+
+class RankAgreement(NamedTuple):
+    """
+    The agreement of two rankings of the same nodes (or edges).
+
+    `kendall_tau` is Kendall's :math:`\\tau_b` and `spearman` Spearman's :math:`\\rho`. `overlap[i]` is the fraction
+    :math:`|T_k(a) \\cap T_k(b)| / k` of the top k = `ks[i]` elements they share and `jaccard[i]` is
+    :math:`|T_k(a) \\cap T_k(b)| / |T_k(a) \\cup T_k(b)|`. `size` is the number of elements ranked by both.
+    """
+    method_names: tuple
+    size: int
+    kendall_tau: float
+    spearman: float
+    ks: np.ndarray
+    overlap: np.ndarray
+    jaccard: np.ndarray
+
+
+def _keys(significance: Significance, index: dict, vertices: list, directed: bool) -> np.ndarray:
+    """
+    The integer key of every element of the arrays of a significance: the node index in `index`, or
+    source * n + target for an edge (smaller endpoint first when undirected). Unknown nodes get the key -1.
+    """
+    if isinstance(significance, NodeSignificance):
+        labels = significance.labels
+        return np.fromiter((index.get(label, -1) for label in labels), dtype=np.int64, count=len(labels))
+    store = significance.store
+    if store.vertices is vertices:
+        remap = np.arange(len(vertices), dtype=np.int64)
+    else:
+        remap = np.fromiter((index.get(label, -1) for label in store.vertices), dtype=np.int64,
+                            count=len(store.vertices))
+    sources, targets = remap[store.sources], remap[store.targets]
+    if not directed:
+        sources, targets = np.minimum(sources, targets), np.maximum(sources, targets)
+    return np.where((sources >= 0) & (targets >= 0), sources * len(vertices) + targets, -1)
+
+
+def aligned_values(significances: List[Significance]) -> np.ndarray:
+    """
+    Align several NodeSignificance (or several EdgeSignificance) by node (or edge) index, keeping the elements
+    ranked by all of them. The values are taken from the arrays of the results, no dict is built.
+
+    :param significances: NodeSignificance objects, or EdgeSignificance objects
+    :return: the (len(significances), size) values, columns in node (or edge) index order
+    :raise: :class:`ValueError` if node and edge results are mixed or there are fewer than two of them
+    """
+    if len(significances) < 2:
+        raise ValueError(f"Expected at least two significances, got {len(significances)}")
+    if not any(all(isinstance(significance, kind) for significance in significances)
+               for kind in (NodeSignificance, EdgeSignificance)):
+        raise ValueError("Expected only NodeSignificance or only EdgeSignificance objects")
+    first = significances[0]
+    if isinstance(first, NodeSignificance):
+        vertices, directed = first.labels, False
+    else:
+        vertices, directed = first.store.vertices, first.store.directed
+    index = {label: i for i, label in enumerate(vertices)}
+    keyed = []
+    for significance in significances:
+        keys = _keys(significance, index, vertices, directed)
+        values = significance.values if isinstance(significance, NodeSignificance) else significance.store.values
+        # when an element is given twice the last value wins, as with item assignment
+        unique, last = np.unique(keys[::-1], return_index=True)
+        keep = unique >= 0
+        keyed.append((unique[keep], np.asarray(values)[::-1][last[keep]]))
+    common = keyed[0][0]
+    for keys, _ in keyed[1:]:
+        common = np.intersect1d(common, keys, assume_unique=True)
+    aligned = [values[np.searchsorted(keys, common)] for keys, values in keyed]
+    return np.array(aligned, dtype=np.float64).reshape(len(keyed), len(common))
+
+
+def _positions(values: np.ndarray) -> np.ndarray:
+    """
+    The 0-based position of every element in the descending order of values, ties in element order.
+    """
+    positions = np.empty(len(values), dtype=np.int64)
+    positions[np.argsort(-values, kind="stable")] = np.arange(len(values))
+    return positions
+
+
+def _top_k_curves(a: np.ndarray, b: np.ndarray) -> tuple:
+    """
+    The overlap and Jaccard curves of all k from 1 to the size at once: an element is in both top k iff the larger of
+    its two positions is below k, so the intersections are a cumulative count.
+    """
+    size = len(a)
+    ks = np.arange(1, size + 1)
+    shared = np.cumsum(np.bincount(np.maximum(_positions(a), _positions(b)), minlength=size))
+    return ks, shared / ks, shared / (2 * ks - shared)
+
+
+def _curve_at(curve: np.ndarray, k) -> np.ndarray:
+    return curve[np.clip(np.asarray(k, dtype=np.int64), 1, len(curve)) - 1] if len(curve) else np.zeros(np.shape(k))
+
+
+def rank_agreement(first: Significance, second: Significance, ks: List[int] = None) -> RankAgreement:
+    """
+    Compare two rankings of the same graph by Kendall's :math:`\\tau_b`, Spearman's :math:`\\rho` and the top-k
+    overlap and Jaccard curves.
+
+    The results are aligned by node (or edge) index, keeping the elements ranked by both. Kendall's :math:`\\tau_b`
+    uses Knight's O(n log n) algorithm, Spearman's :math:`\\rho` the average ranks of ties, and the top-k curves one
+    sort per ranking for all k (ties in the top k are broken by node, or edge, index).
+
+    :param first: a NodeSignificance or an EdgeSignificance
+    :param second: a significance of the same kind
+    :param ks: the k of the top-k curves, all k from 1 to size if None. k larger than size is clipped to size
+    :return: a RankAgreement
+    :raise: :class:`ValueError` if first and second are not of the same kind
+
+    .. rubric:: Example
+
+    >>> from nneslib.edge import edge_significance
+    >>> from nneslib.evaluation.rank_agreement import rank_agreement
+    >>> import networkx as nx
+    >>> G = nx.karate_club_graph()
+    >>> agreement = rank_agreement(edge_significance.degree_product(G), edge_significance.betweenness_centrality(G))
+    >>> agreement.kendall_tau, agreement.overlap[9]
+
+    .. rubric:: Reference
+
+    .. [1] Knight W R. A computer method for calculating Kendall's tau with ungrouped data[J]. Journal of the American Statistical Association, 1966, 61(314): 436-439.
+    """
+    a, b = aligned_values([first, second])
+    all_ks, overlap, jaccard = _top_k_curves(a, b)
+    if ks is not None:
+        all_ks = np.asarray(ks, dtype=np.int64)
+        overlap, jaccard = _curve_at(overlap, all_ks), _curve_at(jaccard, all_ks)
+    kendall = stats.kendalltau(a, b)[0] if len(a) > 1 else np.nan
+    spearman = stats.spearmanr(a, b)[0] if len(a) > 1 else np.nan
+    return RankAgreement((first.method_name, second.method_name), len(a), float(kendall), float(spearman), all_ks,
+                         overlap, jaccard)
+
+
+def agreement_matrix(significances: List[Significance], metric: str = "kendall", k: int = None) -> np.ndarray:
+    """
+    Compare many rankings at once, see :func:`rank_agreement`. All results are aligned together, on the elements
+    ranked by all of them.
+
+    :param significances: NodeSignificance objects, or EdgeSignificance objects
+    :param metric: "kendall", "spearman", "overlap" or "jaccard". Spearman's :math:`\\rho` of all pairs comes from
+      one correlation matrix of the ranks
+    :param k: the k of "overlap" and "jaccard"
+    :return: the symmetric (p, p) matrix of the metric, with 1 on the diagonal
+    :raise: :class:`ValueError` if the metric is unknown, k is missing for a top-k metric or the kinds are mixed
+
+    .. rubric:: Example
+
+    >>> from nneslib.edge import edge_significance
+    >>> from nneslib.evaluation.rank_agreement import agreement_matrix
+    >>> import networkx as nx
+    >>> G = nx.karate_club_graph()
+    >>> results = [edge_significance.degree_product(G), edge_significance.betweenness_centrality(G),
+    ...            edge_significance.diffusion_importance(G)]
+    >>> agreement_matrix(results, "kendall")
+    """
+    if metric not in ("kendall", "spearman", "overlap", "jaccard"):
+        raise ValueError(f"Unknown metric {metric!r}")
+    if metric in ("overlap", "jaccard") and k is None:
+        raise ValueError(f"The {metric} metric needs k")
+    values = aligned_values(significances)
+    p, size = values.shape
+    if metric == "spearman":
+        if size < 2:
+            return np.where(np.eye(p, dtype=bool), 1.0, np.nan)
+        matrix = np.corrcoef(stats.rankdata(values, axis=1))
+        np.fill_diagonal(matrix, 1.0)
+        return matrix
+    matrix = np.eye(p)
+    for i in range(p):
+        for j in range(i + 1, p):
+            if metric == "kendall":
+                score = stats.kendalltau(values[i], values[j])[0] if size > 1 else np.nan
+            else:
+                _, overlap, jaccard = _top_k_curves(values[i], values[j])
+                score = _curve_at(overlap if metric == "overlap" else jaccard, k)
+            matrix[i, j] = matrix[j, i] = score
+    return matrix
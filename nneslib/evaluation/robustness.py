@@ -0,0 +1,203 @@
+from typing import List, NamedTuple
+
+import networkx as nx
+import numpy as np
+
+from nneslib.classes.edge_significance import EdgeSignificance
+from nneslib.classes.graph_context import GraphContext
+from nneslib.classes.node_significance import NodeSignificance
+from nneslib.classes.significance import Significance
+
+
+__all__ = ['RobustnessCurve', 'robustness_curve', 'robustness_curves']
+
+
+class RobustnessCurve(NamedTuple):
+    """
+    The giant component fraction and the normalized susceptibility of a graph along an attack.
+
+    `fractions[i]` is the fraction of removed edges (or nodes), `giant_component_fraction[i]` and
+    `normalized_susceptibility[i]` are :math:`R_{GC}` and :math:`\\tilde{S}` after that removal.
+    """
+    method_name: str
+    fractions: np.ndarray
+    giant_component_fraction: np.ndarray
+    normalized_susceptibility: np.ndarray
+
+
+def _removal_steps(total: int, step: float) -> tuple:
+    """
+    The removal fractions of the curve and the number of removed elements at each of them.
+    """
+    if not 0 < step <= 1:
+        raise ValueError(f"step must lie in (0, 1], got {step}")
+    fractions = np.minimum(np.arange(0, 1 + step, step), 1.0)
+    fractions[-1] = 1.0
+    fractions = np.unique(fractions)
+    return fractions, np.rint(fractions * total).astype(np.int64)
+
+
+def _edge_keys(sources: np.ndarray, targets: np.ndarray, n: int, directed: bool) -> np.ndarray:
+    """
+    One int64 key per edge of node indices below n, the same for (u, v) and (v, u) unless directed.
+    """
+    sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+    if not directed:
+        sources, targets = np.minimum(sources, targets), np.maximum(sources, targets)
+    return sources * n + targets
+
+
+def _removal_order(significance: Significance, context: GraphContext) -> np.ndarray:
+    """
+    Row indices of the edges (for an EdgeSignificance) or nodes of the context from the most to the least significant
+    one, the ones without significance come last.
+    """
+    n = len(context.nodes)
+    if isinstance(significance, EdgeSignificance):
+        store = significance.store
+        sources, targets, values = store.sources, store.targets, store.values
+        if store.vertices != context.nodes:
+            to_context = np.fromiter((context.node_index.get(node, -1) for node in store.vertices), dtype=np.int64,
+                                     count=len(store.vertices))
+            sources, targets = to_context[sources], to_context[targets]
+            known = (sources >= 0) & (targets >= 0)
+            sources, targets, values = sources[known], targets[known], values[known]
+        # When an edge is given several times the last value wins, as in the EdgeStore
+        keys, last = np.unique(_edge_keys(sources, targets, n, store.directed)[::-1], return_index=True)
+        values = values[::-1][last]
+        wanted = _edge_keys(*context.edge_ends, n, store.directed)
+        if len(keys) == 0:
+            return np.arange(len(wanted))
+        position = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+        scores = np.where(keys[position] == wanted, values[position], -np.inf)
+    else:
+        labels = significance.labels
+        positions = np.fromiter((context.node_index.get(label, -1) for label in labels), dtype=np.int64,
+                                count=len(labels))
+        known = positions >= 0
+        scores = np.full(n, -np.inf)
+        scores[positions[known]] = np.asarray(significance.values, dtype=np.float64)[known]
+    return np.argsort(-scores, kind="stable")
+
+
+def _percolation(n: int, order: np.ndarray, removed_counts: np.ndarray, edges: np.ndarray = None,
+                 adjacency=None) -> tuple:
+    """
+    Add the removed elements back from the least significant one with a union-find (Newman-Ziff), recording the
+    largest component size and the sum of squared component sizes whenever the number of removed elements hits one of
+    removed_counts.
+
+    Edge percolation starts from n isolated nodes and adds `edges[order]`. Node percolation starts from an empty graph
+    and activates the nodes `order`, joining each of them to its active neighbours in `adjacency`.
+    """
+    parent = list(range(n))
+    size = [1] * n
+    active = [edges is not None] * n
+    largest, squares = (1 if n else 0, n) if edges is not None else (0, 0)
+    records = {}
+    wanted = set(removed_counts.tolist())
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:  # path compression
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(x, y):
+        nonlocal largest, squares
+        x, y = find(x), find(y)
+        if x == y:
+            return
+        if size[x] < size[y]:
+            x, y = y, x
+        squares += 2 * size[x] * size[y]  # (a + b)^2 - a^2 - b^2
+        parent[y] = x
+        size[x] += size[y]
+        largest = max(largest, size[x])
+
+    total = len(order)
+    if total in wanted:
+        records[total] = (largest, squares)
+    if edges is not None:
+        sources, targets = edges[order, 0].tolist(), edges[order, 1].tolist()
+    else:
+        indptr, indices, order_list = adjacency.indptr, adjacency.indices.tolist(), order.tolist()
+    for removed in range(total - 1, -1, -1):
+        if edges is not None:
+            union(sources[removed], targets[removed])
+        else:
+            node = order_list[removed]
+            active[node] = True
+            largest, squares = max(largest, 1), squares + 1
+            for neighbor in indices[indptr[node]:indptr[node + 1]]:
+                if active[neighbor]:
+                    union(node, neighbor)
+        if removed in wanted:
+            records[removed] = (largest, squares)
+    largest, squares = np.array([records[count] for count in removed_counts.tolist()], dtype=np.float64).T
+    return largest, squares
+
+
+def robustness_curve(graph: nx.Graph, significance: Significance, step: float = 0.01) -> RobustnessCurve:
+    """
+    Attack a graph by removing its edges (for an EdgeSignificance) or nodes (for a NodeSignificance) from the most to
+    the least significant one, and compute :math:`R_{GC}` and :math:`\\tilde{S}` along the way.
+
+    .. math:: R_{GC} = \\frac{|GC|}{N}, \\tilde{S} = \\sum_{s < s_{max}}\\frac{n_ss^2}{N}
+
+    The whole curve is computed in one near-linear pass, by adding the elements back in reverse order with a
+    union-find that tracks the largest component and the sum of the squared component sizes. N is always the number
+    of nodes of the intact graph.
+
+    :param graph: the networkx graph object (or CSRGraph) to be used
+    :param significance: the ranking of the attack
+    :param step: the granularity of the removal fraction
+    :return: a RobustnessCurve
+    :raise: :class:`ValueError` if step is not in (0, 1] or significance is neither a Node- nor an EdgeSignificance
+
+    .. rubric:: Example
+
+    >>> from nneslib.edge import edge_significance
+    >>> from nneslib.evaluation.robustness import robustness_curve
+    >>> import networkx as nx
+    >>> G = nx.karate_club_graph()
+    >>> curve = robustness_curve(G, edge_significance.betweenness_centrality(G), step=0.05)
+
+    .. rubric:: Reference
+
+    .. [1] Newman M E J, Ziff R M. Efficient Monte Carlo algorithm and high-precision results for percolation[J]. Physical Review Letters, 2000, 85(19): 4104.
+    """
+    return robustness_curves(graph, [significance], step)[0]
+
+
+def robustness_curves(graph: nx.Graph, significances: List[Significance], step: float = 0.01) -> List[RobustnessCurve]:
+    """
+    Compute the robustness curve of several rankings of the same graph, see :func:`robustness_curve`.
+
+    :param graph: the networkx graph object (or CSRGraph) to be used
+    :param significances: a list of EdgeSignificance or NodeSignificance objects
+    :param step: the granularity of the removal fraction
+    :return: a list of RobustnessCurve, in the order of significances
+    """
+    context = GraphContext(graph)
+    adjacency, nodes, edge_list = context.adjacency(), context.nodes, context.edges
+    n = len(nodes)
+    edges = np.stack(context.edge_ends, axis=1).reshape(-1, 2)
+    curves = []
+    for significance in significances:
+        if isinstance(significance, EdgeSignificance):
+            fractions, removed_counts = _removal_steps(len(edge_list), step)
+            order = _removal_order(significance, context)
+            largest, squares = _percolation(n, order, removed_counts, edges=edges)
+        elif isinstance(significance, NodeSignificance):
+            fractions, removed_counts = _removal_steps(n, step)
+            order = _removal_order(significance, context)
+            largest, squares = _percolation(n, order, removed_counts, adjacency=adjacency)
+        else:
+            raise ValueError(f"Expected an EdgeSignificance or a NodeSignificance, got {type(significance)}")
+        N = max(n, 1)
+        curves.append(RobustnessCurve(significance.method_name, fractions, largest / N,
+                                      (squares - largest * largest) / N))
+    return curves
@@ -1,50 +1,156 @@
 import networkx as nx
-from nneslib.classes.node_significance import NodeSignificance
-
-
-def _efficiency(shortest_path: dict, source, target, removed_node=None, graph: nx.Graph = None, weight=None) -> float:
-    """
-    The efficiency is equal to the inverse of the shortest path length
-    :param shortest_path:
-    :param source: source node
-    :param target: target node
-    :param removed_node: efficiency after removing a node
-    :param graph: the graph object to be used (will be ignored if removed_node is None)
-    :param weight: If None, every edge has weight/distance/cost 1. If a string, use this edge attribute as the edge
-    weight. Any edge attribute not present defaults to 1. This should be same with shortest_path.
-    :return: the efficiency of <source, target>
-    """
-    if removed_node is None:
-        distance = shortest_path[source].get(target, [])
-        # if there is no path between source and target, return 0
-        return 0 if len(distance) == 0 else 1 / (len(distance) - 1)
-    else:
-        if removed_node == source or removed_node == target:
-            return 0
-        distance = shortest_path[source].get(target, [])
-        if len(distance) == 0:  # if there is no path, remove node there still no path
-            return 0
-        if removed_node not in distance:  # if removed_node not in the shortest-path, the efficiency will not change
-            return 1 / (len(distance) - 1)
-        subgraph = graph.subgraph([node for node in graph.nodes() if node != removed_node])
-        try:
-            distance = nx.shortest_path(subgraph, source, target, weight=weight)
-        except:
-            distance = []
-        return 0 if len(distance) == 0 else 1 / (len(distance) - 1)
-
-
-def efficiency_centrality(graph: nx.Graph, weight: str = None) -> dict:
-    shortest_path = nx.shortest_path(graph, weight=weight)
-    nodes = list(graph.nodes())
-    E = sum([_efficiency(shortest_path, source, target) for index, source in enumerate(nodes[:-1])
-             for target in nodes[index + 1:]]) / (len(nodes) * len(nodes) - len(nodes))
-    significance = {}
-    # removed_N = len(nodes) - 1
-    removed_N = len(nodes)
-    for node in nodes:
-        E_hat = sum([_efficiency(shortest_path, source, target, node, graph, weight)
-                     for index, source in enumerate(nodes[:-1]) for target in nodes[index + 1:]])
-        E_hat /= (removed_N * removed_N - removed_N)
-        significance[node] = (E - E_hat) / E
-    return significance
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+
+from nneslib.classes.graph_context import GraphContext, graph_context
+from nneslib.utils.budget import Budget, budgeted_map
+from nneslib.utils.profiling import phase
+
+# Edge list of the graph, shared with the worker processes by `_init_worker`
+_EDGES = {}
+
+
+def _init_worker(row: np.ndarray, col: np.ndarray, data: np.ndarray, n: int, unweighted: bool) -> None:
+    _EDGES.update(row=row, col=col, data=data, n=n, unweighted=unweighted)
+
+
+def _adjacency(removed_node: int = None) -> sp.csr_matrix:
+    """
+    The CSR adjacency matrix of the shared graph, masking out every edge incident to removed_node.
+    """
+    row, col, data, n = _EDGES["row"], _EDGES["col"], _EDGES["data"], _EDGES["n"]
+    if removed_node is not None:
+        keep = (row != removed_node) & (col != removed_node)
+        row, col, data = row[keep], col[keep], data[keep]
+    return sp.csr_matrix((data, (row, col)), shape=(n, n))
+
+
+def _sweep(adjacency: sp.csr_matrix, sources: np.ndarray) -> tuple:
+    """
+    One BFS (unweighted) or Dijkstra (weighted) sweep per source.
+
+    :return: the (len(sources), n) distances, and the efficiencies 1/d(s, t) which are 0 for s == t and for
+      unreachable t
+    """
+    distances = csgraph.dijkstra(adjacency, directed=True, indices=sources, unweighted=_EDGES["unweighted"])
+    with np.errstate(divide="ignore"):
+        efficiency = 1 / distances
+    efficiency[~np.isfinite(efficiency)] = 0
+    return distances, efficiency
+
+
+def _base_sweep(sources: np.ndarray) -> tuple:
+    """
+    Sweep the intact graph from every source and find the nodes whose removal changes a distance from the source.
+
+    A node t keeps its distance from s after removing v unless every predecessor of t in the shortest-path DAG of s is
+    v or is itself affected. The affected node closest to s therefore has v as its unique DAG predecessor, so v only
+    matters for s if v is the unique predecessor of some node.
+
+    :return: the per source efficiency sums, the per target efficiency sums, and the (source, critical node,
+      1/d(source, critical node)) triples
+    """
+    row, col, data, n = _EDGES["row"], _EDGES["col"], _EDGES["data"], _EDGES["n"]
+    distances, efficiency = _sweep(_adjacency(), sources)
+    weights = np.ones_like(data) if _EDGES["unweighted"] else data
+    critical_sources, critical_nodes = [], []
+    for position, source in enumerate(sources):
+        distance = distances[position]
+        reachable = np.isfinite(distance[row])
+        tight = np.zeros(len(row), dtype=bool)
+        tight[reachable] = np.isclose(distance[row[reachable]] + weights[reachable], distance[col[reachable]],
+                                      rtol=1e-12, atol=0)
+        predecessors_count = np.bincount(col[tight], minlength=n)
+        unique = tight & (predecessors_count[col] == 1)
+        nodes = np.unique(row[unique])
+        nodes = nodes[nodes != source]
+        critical_sources.append(np.full(len(nodes), source))
+        critical_nodes.append(nodes)
+    critical_sources, critical_nodes = np.concatenate(critical_sources), np.concatenate(critical_nodes)
+    position = np.searchsorted(sources, critical_sources)
+    return (efficiency.sum(axis=1), efficiency.sum(axis=0),
+            (critical_sources, critical_nodes, efficiency[position, critical_nodes]))
+
+
+def _removal_sweep(task: tuple) -> tuple:
+    """
+    Remove a node once and re-sweep the masked graph from every source whose shortest-path DAG depends on it.
+
+    :return: the removed node and the efficiency sum of the re-swept sources
+    """
+    removed_node, sources = task
+    adjacency = _adjacency(removed_node)
+    total = 0.0
+    for start in range(0, len(sources), 256):
+        total += _sweep(adjacency, sources[start:start + 256])[1].sum()
+    return removed_node, total
+
+
+def efficiency_centrality(graph: nx.Graph, weight: str = None, n_jobs: int = None,
+                          context: GraphContext = None, budget: Budget = None) -> dict:
+    """
+    Incremental efficiency centrality engine.
+
+    The intact graph is swept once from every source. A removed node v only forces a new sweep from the sources whose
+    shortest-path DAG uses it (see :func:`_base_sweep`); for the other sources the lost efficiency is just the one of
+    the pairs involving v. Each node is removed once, and the sweeps of the removed nodes are spread over n_jobs
+    processes.
+
+    With a budget, the work units are single source sweeps. The base sweep has to complete before any node is
+    known, then the removals run from the cheapest one, and the result only holds the nodes whose removal completed.
+
+    :param graph: the graph object to be used
+    :param weight: If None, every edge has distance 1. Otherwise holds the name of the edge attribute used as distance.
+    :param n_jobs: the number of worker processes, None or 1 runs in the calling process
+    :param context: If not None, the GraphContext holding the adjacency matrix of graph
+    :param budget: If not None, the :class:`Budget` that may stop the sweeps early
+    :return: a dict of {node: relative drop of the network efficiency after removing the node}
+    """
+    if budget is not None:
+        budget.start()  # the total is known after the base sweep
+    context = graph_context(graph, context)
+    with phase("adjacency"):
+        adjacency, nodes = context.adjacency(weight), context.nodes
+        n = len(nodes)
+        if n == 0:
+            return {}
+        coo = adjacency.tocoo()
+        initargs = (coo.row.astype(np.int64), coo.col.astype(np.int64), coo.data, n, weight is None)
+
+    chunks = [np.arange(start, min(start + 256, n)) for start in range(0, n, 256)]
+    with phase("shortest_paths", sources=n):
+        base = budgeted_map(_base_sweep, chunks, budget, len, n_jobs, _init_worker, initargs)
+    if len(base) < len(chunks):
+        return {}
+    from_sum = np.concatenate([from_sources for from_sources, _, _ in base])
+    to_sum = np.sum([to_targets for _, to_targets, _ in base], axis=0)
+    critical_sources = np.concatenate([critical[0] for _, _, critical in base])
+    critical_nodes = np.concatenate([critical[1] for _, _, critical in base])
+    critical_efficiency = np.concatenate([critical[2] for _, _, critical in base])
+
+    E = from_sum.sum()  # twice the network efficiency of an undirected graph, up to the normalization
+    if E == 0:
+        return {node: 0.0 for node in nodes}
+    # Without re-sweeping, removing v only loses the pairs starting or ending at v
+    E_hat = E - from_sum - to_sum
+    order = np.argsort(critical_nodes, kind="stable")
+    critical_sources, critical_nodes = critical_sources[order], critical_nodes[order]
+    critical_efficiency = critical_efficiency[order]
+    removed_nodes, starts = np.unique(critical_nodes, return_index=True)
+    tasks = list(zip(removed_nodes, np.split(critical_sources, starts[1:])))
+    processed = np.ones(n, dtype=bool)
+    if budget is not None:
+        budget.total = n + len(critical_sources)
+        tasks.sort(key=lambda task: len(task[1]))
+        processed[removed_nodes] = False
+    # The re-swept sources replace their stale efficiency sums (the pair with v itself was already subtracted)
+    np.subtract.at(E_hat, critical_nodes, from_sum[critical_sources] - critical_efficiency)
+    with phase("removals", removals=len(tasks), sources=len(critical_sources)):
+        removals = budgeted_map(_removal_sweep, tasks, budget, lambda task: len(task[1]), n_jobs, _init_worker,
+                                initargs)
+        for removed_node, total in removals:
+            E_hat[removed_node] += total
+            processed[removed_node] = True
+    significance = (E - E_hat) / E
+    return {node: float(significance[index]) for index, node in enumerate(nodes) if processed[index]}
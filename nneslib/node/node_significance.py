@@ -2,16 +2,40 @@ import networkx as nx
 import numpy as np
 
 import numpy.linalg as linalg
+from scipy.sparse.linalg import eigsh
+from nneslib.classes.csr_graph import CSRGraph
+from nneslib.classes.graph_context import GraphContext, graph_context
 from nneslib.classes.node_significance import NodeSignificance
+from nneslib.utils.brandes import brandes_betweenness
+from nneslib.utils.budget import Budget
+from nneslib.utils.edge_stream import EDGE_CHUNK_SIZE, stream_degrees
+from nneslib.utils.profiling import phase, profiled
 from .internal import efficiency_centrality
 
 __all__ = [
     "centrality_metric_spectrum", "degree_centrality", "betweenness_centrality", "closeness_centrality",
-    "EffC"
+    "EffC", "streaming_degree_centrality"
 ]
 
+# Graphs up to this size are decomposed densely by centrality_metric_spectrum(backend="auto")
+DENSE_SPECTRUM_MAX_NODES = 500
 
-def centrality_metric_spectrum(graph: nx.Graph, communities_number: int, weight: str = None) -> NodeSignificance:
+
+def _node_significance(context: GraphContext, values: np.ndarray, graph: nx.Graph, method_name: str,
+                       method_parameters: dict = None, attrs: dict = None) -> NodeSignificance:
+    """
+    The NodeSignificance of values in context.nodes order, array-backed for a CSRGraph.
+    """
+    if isinstance(graph, CSRGraph):
+        return NodeSignificance.from_arrays(context.nodes, np.asarray(values, dtype=np.float64), graph, method_name,
+                                            method_parameters, attrs)
+    return NodeSignificance(dict(zip(context.nodes, np.asarray(values).tolist())), graph, method_name,
+                            method_parameters, attrs)
+
+
+@profiled
+def centrality_metric_spectrum(graph: nx.Graph, communities_number: int, weight: str = None,
+                               backend: str = "auto", context: GraphContext = None) -> NodeSignificance:
     """
     Centrality metric based on the spectrum of the Adjacency Matrix.
 
@@ -24,40 +48,70 @@ def centrality_metric_spectrum(graph: nx.Graph, communities_number: int, weight:
     :param graph: the networkx graph object to be used.
     :param communities_number: the number of communities
     :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+    :param backend: "dense" decomposes the full adjacency matrix, "sparse" only computes the `communities_number`
+      largest eigenpairs of the sparse adjacency matrix with the symmetric Lanczos solver (ARPACK). "auto" uses the
+      dense backend for graphs up to `DENSE_SPECTRUM_MAX_NODES` nodes and the sparse one otherwise, and records the
+      one it used as `attrs["backend"]`.
+    :param context: If not None, the GraphContext of graph to take the adjacency matrix from
     :return: an NodeSignificance object
+    :raise: :class:`ValueError` if the backend is unknown
 
     .. rubric:: Reference
 
     .. [1] Wang, Yang, Zengru Di, and Ying Fan. 2011. Identifying and Characterizing Nodes Important to Community Structure Using the Spectrum of the Graph. PLoS ONE 6: e27418. https://doi.org/10.1371/journal.pone.0027418.
     """
-    matrix = nx.to_numpy_matrix(graph, weight=weight)
-    eigenvalues, eigenvectors = linalg.eig(matrix)
-    lagest_eigenvalues_idx = np.argpartition(-eigenvalues, communities_number)[:communities_number]
-    significance = {}
-    eigenvectors_dot = [np.sum([v * v for v in eigenvectors[:, i].flatten().tolist()[0]]) for i in range(len(eigenvalues))]
-    for k, node_name in enumerate(list(graph.nodes())):
-        significance[node_name] = sum([eigenvectors[k, idx]**2/ eigenvectors_dot[idx]
-                                       for idx in lagest_eigenvalues_idx]) / communities_number
-    # TODO: Distinguish Two Kinds of Importance Nodes? or not?
-    return NodeSignificance(significance, graph, "centrality_metric_spectrum",
-                            {"communities_number": communities_number, "weight": weight})
-
-
-def degree_centrality(graph: nx.Graph) -> NodeSignificance:
+    context = graph_context(graph, context)
+    with phase("adjacency"):
+        matrix, nodes = context.adjacency(weight), context.nodes
+    n = len(nodes)
+    resolved = backend
+    if backend == "auto":
+        # ARPACK needs communities_number < n - 1
+        resolved = "dense" if n <= DENSE_SPECTRUM_MAX_NODES or communities_number >= n - 1 else "sparse"
+    if resolved not in ("dense", "sparse"):
+        raise ValueError(f"Unknown backend {backend}, expected one of 'auto', 'dense' or 'sparse'")
+    with phase("eigensolver", backend=resolved, eigenpairs=communities_number):
+        if resolved == "dense":
+            eigenvalues, eigenvectors = linalg.eigh(matrix.toarray())
+            eigenvectors = eigenvectors[:, np.argsort(-eigenvalues, kind="stable")[:communities_number]]
+        else:
+            v0 = np.random.default_rng(0).random(n)  # fixed start vector keeps the result reproducible
+            eigenvalues, eigenvectors = eigsh(matrix, k=communities_number, which="LA", v0=v0)
+    with phase("scores"):
+        scores = np.sum(eigenvectors ** 2 / np.sum(eigenvectors ** 2, axis=0), axis=1) / communities_number
+    with phase("result"):
+        # TODO: Distinguish Two Kinds of Importance Nodes? or not?
+        return _node_significance(context, scores, graph, "centrality_metric_spectrum",
+                                  {"communities_number": communities_number, "weight": weight, "backend": backend},
+                                  {"backend": resolved})
+
+
+@profiled
+def degree_centrality(graph: nx.Graph, context: GraphContext = None) -> NodeSignificance:
     """
     Degree centrality.
 
     .. math:: C_D(v) = \\sum_{u \in V}a_{u,v}
 
+    The degrees are normalized by n - 1, as networkx does.
+
     :param graph: the graph object to be used
+    :param context: If not None, the GraphContext of graph to take the degrees from
     :return: a NodeSignificance object
     """
-    significance = nx.degree_centrality(graph)
-    return NodeSignificance(significance, graph, "degree_centrality", None)
-
-
-def betweenness_centrality(graph: nx.Graph, k: int = None,
-                           normalized: bool = True, weight: str = None) -> NodeSignificance:
+    context = graph_context(graph, context)
+    with phase("degrees"):
+        n = len(context.nodes)
+        values = context.degrees() * (1 / (n - 1)) if n > 1 else np.ones(n)
+    with phase("result"):
+        return _node_significance(context, values, graph, "degree_centrality", None)
+
+
+@profiled
+def betweenness_centrality(graph: nx.Graph, k: int = None, normalized: bool = True, weight: str = None,
+                           seed: int = None, n_jobs: int = None, epsilon: float = None,
+                           delta: float = 0.1, context: GraphContext = None,
+                           budget: Budget = None) -> NodeSignificance:
     """
     Compute the shortest-path betweenness centrality for nodes.
 
@@ -83,14 +137,38 @@ def betweenness_centrality(graph: nx.Graph, k: int = None,
       is the number of nodes in G.
     :param weight: If None, all edge weights are considered equal.
       Otherwise holds the name of the edge attribute used as weight.
+    :param seed: seed of the sampled sources, used if k or epsilon is not None.
+    :param n_jobs: If not None, the Brandes source sweeps are split into chunks that run on n_jobs processes
+      (-1 uses all CPUs) and whose partial dependencies are summed.
+    :param epsilon: If not None, sample sources adaptively until every value is within epsilon of the exact
+      betweenness with probability at least 1 - delta. The achieved bound and the number of sampled sources are
+      recorded in `attrs`.
+    :param delta: the failure probability of the adaptive sampling.
+    :param context: If not None, the GraphContext of graph the parallel, adaptive and budgeted modes take the
+      adjacency from. A CSRGraph always runs these Brandes sweeps rather than networkx.
+    :param budget: If not None, a :class:`nneslib.utils.budget.Budget` on the swept sources. When it runs out, the
+      values are extrapolated from the sources swept so far, and the coverage is recorded in `attrs`.
     :return: an NodeSignificance object
     """
-    significance = nx.betweenness_centrality(graph, k=k, normalized=normalized, weight=weight)
-    return NodeSignificance(significance, graph, "betweenness_centrality",
-                            {"k": k, "normalized": normalized, "weight": weight})
-
-
-def closeness_centrality(graph: nx.Graph, distance: str = None, wf_improved: bool = True) -> NodeSignificance:
+    attrs = None
+    with phase("shortest_paths", sources=graph.number_of_nodes() if k is None else k) as record:
+        if n_jobs is None and epsilon is None and budget is None and not isinstance(graph, CSRGraph):
+            significance = nx.betweenness_centrality(graph, k=k, normalized=normalized, weight=weight, seed=seed)
+        else:
+            significance, attrs = brandes_betweenness(graph, k, weight, normalized, edges=False, n_jobs=n_jobs,
+                                                      epsilon=epsilon, delta=delta, seed=seed, context=context,
+                                                      budget=budget)
+            if record is not None:
+                record["sources"] = attrs["samples"]
+    with phase("result"):
+        return NodeSignificance(significance, graph, "betweenness_centrality",
+                                {"k": k, "normalized": normalized, "weight": weight, "seed": seed,
+                                 "epsilon": epsilon, "delta": delta}, attrs)
+
+
+@profiled
+def closeness_centrality(graph: nx.Graph, distance: str = None, wf_improved: bool = True,
+                         context: GraphContext = None) -> NodeSignificance:
     """
    Compute closeness centrality for nodes.
 
@@ -126,25 +204,79 @@ def closeness_centrality(graph: nx.Graph, distance: str = None, wf_improved: boo
     :param wf_improved: If True, scale by the fraction of nodes reachable. This gives the
       Wasserman and Faust improved formula. For single component graphs
       it is the same as the original formula.
+    :param context: If not None, the all-pairs distances of this GraphContext are used (and memoized there) instead
+      of running networkx. They take |V|^2 floats. A CSRGraph always uses them.
     :return: a NodeSignificance object
     """
-    significance = nx.closeness_centrality(graph, distance=distance, wf_improved=wf_improved)
-    return NodeSignificance(significance, graph, "closeness_centrality",
-                            {"distance": distance, "wf_improved": wf_improved})
-
-
-def EffC(graph: nx.Graph, weight: str = None) -> NodeSignificance:
+    parameters = {"distance": distance, "wf_improved": wf_improved}
+    if context is None and not isinstance(graph, CSRGraph):
+        with phase("shortest_paths"):
+            significance = nx.closeness_centrality(graph, distance=distance, wf_improved=wf_improved)
+        with phase("result"):
+            return NodeSignificance(significance, graph, "closeness_centrality", parameters)
+    context = graph_context(graph, context)
+    with phase("shortest_paths"):
+        incoming = context.distances(distance).T  # row u holds d(v, u)
+    reachable = np.isfinite(incoming)
+    total = np.where(reachable, incoming, 0).sum(axis=1)
+    r = reachable.sum(axis=1)  # including u itself
+    n = len(context.nodes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        closeness = np.where(total > 0, (r - 1) / total, 0.0)
+    if wf_improved and n > 1:
+        closeness *= (r - 1) / (n - 1)
+    with phase("result"):
+        return _node_significance(context, closeness, graph, "closeness_centrality", parameters)
+
+
+@profiled
+def EffC(graph: nx.Graph, weight: str = None, n_jobs: int = None, context: GraphContext = None,
+         budget: Budget = None) -> NodeSignificance:
     """
     The efficiency centrality :math:`C^P{EffC}_k` of node k is defined as the relative drop in the network efficiency
     caused by the removal of the node k from initial graph G:
 
     :param graph: the graph object to be used
     :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+    :param n_jobs: the number of worker processes sharing the node removals. None or 1 runs in the calling process,
+      -1 uses all CPUs.
+    :param context: If not None, the GraphContext of graph to take the adjacency matrix from
+    :param budget: If not None, a :class:`nneslib.utils.budget.Budget` on the single source sweeps. When it runs out,
+      only the nodes whose removal was fully evaluated are in the result, their number and coverage in `attrs`.
     :return: an NodeSignificance object
 
     .. rubric:: Reference
 
     .. [1] Wang, Shasha, Yuxian Du, and Yong Deng 2017A New Measure of Identifying Influential Nodes: Efficiency Centrality. Communications in Nonlinear Science and Numerical Simulation 47: 151–163.
     """
-    significance = efficiency_centrality(graph, weight)
-    return NodeSignificance(significance, graph, "EffC", {"weight": weight})
\ No newline at end of file
+    significance = efficiency_centrality(graph, weight, n_jobs, context, budget)
+    attrs = None
+    if budget is not None:
+        n = graph.number_of_nodes()
+        attrs = dict(budget.report(len(significance) / n if n else 1.0, len(significance) == n),
+                     processed=len(significance))
+    with phase("result"):
+        return NodeSignificance(significance, graph, "EffC", {"weight": weight}, attrs)
+
+
+def streaming_degree_centrality(filepath: str, weighted: bool = False, chunk_size: int = EDGE_CHUNK_SIZE,
+                                delimiter: str = None, comments: str = "#", skiprows: int = 0) -> NodeSignificance:
+    """
+    The degree centrality of :func:`degree_centrality` for an edge list too large to build any graph from, counted in
+    one pass over the file, see :func:`nneslib.utils.edge_stream.stream_degrees`. Only the node labels, the degrees
+    and one chunk of edges are held in memory. Unlike a graph, the edge list is not deduplicated: every line is an
+    edge.
+
+    :param filepath: a text edge list with one "source target [weight]" line per edge, or a binary file of
+      :func:`nneslib.utils.edge_stream.write_edge_list`, which is memory-mapped
+    :param weighted: whether the degrees are the sums of the weights of the third column, still normalized by n - 1
+    :param chunk_size: the number of edges read at a time
+    :param delimiter: the column separator of a text file, None for any whitespace
+    :param comments: the prefix of the comment lines of a text file
+    :param skiprows: the number of header lines of a text file to skip
+    :return: a NodeSignificance object without a graph, its nodes in sorted label order
+    """
+    labels, degrees, _ = stream_degrees(filepath, chunk_size, weighted, delimiter, comments, skiprows)
+    n = len(labels)
+    values = degrees * (1 / (n - 1)) if n > 1 else np.ones(n)
+    return NodeSignificance.from_arrays(labels.tolist(), values, None, "degree_centrality", {"weighted": weighted})
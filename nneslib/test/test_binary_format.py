@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+import networkx as nx
+import numpy as np
+from nneslib.classes.binary_format import load
+from nneslib.edge.edge_significance import diffusion_importance
+from nneslib.node.node_significance import betweenness_centrality
+
+
+class BinaryFormatTestCase(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.relabel_nodes(nx.karate_club_graph(), {0: ("a", 0), 1: "b", 2: 2.5})
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_edge_significance(self):
+        expected = diffusion_importance(self.graph)
+        filepath = os.path.join(self.directory.name, "edges.nnes")
+        expected.save(filepath)
+        actual = load(filepath, self.graph)
+        self.assertIsNone(actual._significance)  # nothing but the header is read yet
+        self.assertEqual(expected.get(("a", 0), "b"), actual.get("b", ("a", 0)))
+        np.testing.assert_array_equal(expected.to_dense(), actual.to_dense())
+        self.assertEqual(expected.significance, actual.significance)
+        self.assertEqual(list(expected.significance), list(actual.significance))
+        self.assertEqual(expected.method_name, actual.method_name)
+
+    def test_node_significance(self):
+        expected = betweenness_centrality(self.graph, n_jobs=1)
+        filepath = os.path.join(self.directory.name, "nodes.nnes")
+        expected.save(filepath)
+        for mmap in (True, False):
+            actual = load(filepath, mmap=mmap)
+            self.assertEqual(expected.significance, actual.significance)
+            self.assertEqual(expected.method_parameters, actual.method_parameters)
+            self.assertEqual(expected.attrs, actual.attrs)
+
+    def test_write_to_json(self):
+        significance = diffusion_importance(nx.karate_club_graph())
+        filepath = os.path.join(self.directory.name, "edges.json")
+        significance.write_to_json(filepath)
+        with open(filepath, encoding="utf8") as file:
+            written = json.load(file)
+        self.assertEqual(significance.significance, {(u, v): value for u, v, value in written["significance"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
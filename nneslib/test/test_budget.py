@@ -0,0 +1,75 @@
+import unittest
+import networkx as nx
+from nneslib.edge import edge_significance
+from nneslib.edge.internal import CliqueIndex
+from nneslib.node import node_significance
+from nneslib.utils.budget import Budget
+
+
+class BudgetTestCase(unittest.TestCase):
+    def test_unlimited(self):
+        graph = nx.karate_club_graph()
+        full = node_significance.EffC(graph, budget=Budget())
+        self.assertEqual(node_significance.EffC(graph).significance, full.significance)
+        self.assertEqual((1.0, True, None), (full.attrs["coverage"], full.attrs["complete"], full.attrs["stopped"]))
+        walks = edge_significance.ERW_Kpath(graph, 5, 10000, 0.01, seed=1, budget=Budget())
+        self.assertEqual(edge_significance.ERW_Kpath(graph, 5, 10000, 0.01, seed=1).significance, walks.significance)
+        self.assertEqual(10000, walks.attrs["walks"])
+        expected = edge_significance.betweenness_centrality(graph).significance
+        actual = edge_significance.betweenness_centrality(graph, budget=Budget()).significance
+        for edge, value in expected.items():
+            self.assertAlmostEqual(value, actual[edge])
+
+    def test_partial(self):
+        graph = nx.karate_club_graph()
+        partial = node_significance.EffC(graph, budget=Budget(max_work=60))
+        full = node_significance.EffC(graph).significance
+        self.assertEqual("work", partial.attrs["stopped"])
+        self.assertEqual(partial.attrs["processed"], len(partial.significance))
+        self.assertLess(len(partial.significance), 34)
+        for node, value in partial.significance.items():
+            self.assertEqual(full[node], value)
+        walks = edge_significance.ERW_Kpath(graph, 5, 10000, 0.01, seed=1, budget=Budget(max_work=2500))
+        self.assertEqual((2500, 0.25, False), (walks.attrs["walks"], walks.attrs["coverage"], walks.attrs["complete"]))
+        graph = nx.barabasi_albert_graph(500, 3, seed=0)
+        progress = []
+        sampled = node_significance.betweenness_centrality(graph, seed=0, budget=Budget(
+            callback=lambda done, total: progress.append((done, total)) or done < 128))
+        self.assertEqual([(64, 500), (128, 500)], progress)
+        self.assertEqual((128, 128 / 500, "cancelled"),
+                         (sampled.attrs["samples"], sampled.attrs["coverage"], sampled.attrs["stopped"]))
+        self.assertEqual(500, len(sampled.significance))
+        cliques = edge_significance.brightness(nx.gnp_random_graph(60, 0.3, seed=1), budget=Budget(max_work=10))
+        self.assertEqual((10, False), (cliques.attrs["cliques"], cliques.attrs["complete"]))
+        self.assertLess(cliques.attrs["coverage"], 1.0)
+        # the work limit also skips the greedy growth of the uncovered cliques, even with time left
+        graph = nx.gnp_random_graph(60, 0.3, seed=1)
+        index, first = CliqueIndex(graph, budget=Budget(time_limit=60, max_work=1)), next(nx.find_cliques(graph))
+        for u, v in graph.edges():
+            expected = len(first) if u in first and v in first else 3 if set(graph[u]) & set(graph[v]) else 2
+            self.assertEqual(expected, index.edge(u, v))
+
+    def test_cancel_before_start(self):
+        graph = nx.karate_club_graph()
+        budget = Budget()
+        budget.cancel()
+        for _ in range(2):
+            partial = node_significance.EffC(graph, budget=budget)
+            self.assertEqual((False, "cancelled"), (partial.attrs["complete"], partial.attrs["stopped"]))
+            self.assertLess(partial.attrs["processed"], 34)
+        # a callback only stops its own computation
+        calls = []
+        budget = Budget(callback=lambda done, total: calls.append(done) or len(calls) > 1)
+        self.assertEqual("cancelled", node_significance.EffC(graph, budget=budget).attrs["stopped"])
+        self.assertTrue(node_significance.EffC(graph, budget=budget).attrs["complete"])
+
+    def test_time_limit_in_pool(self):
+        # a chunk of 64 sources takes about a second, the workers must stop at the deadline rather than finish them
+        graph = nx.barabasi_albert_graph(4000, 3, seed=0)
+        sampled = node_significance.betweenness_centrality(graph, seed=0, n_jobs=2, budget=Budget(time_limit=0.5))
+        self.assertEqual("time", sampled.attrs["stopped"])
+        self.assertLess(sampled.attrs["samples"], 4000)
+
+
+if __name__ == '__main__':
+    unittest.main()
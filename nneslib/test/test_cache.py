@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import networkx as nx
+import numpy as np
+from nneslib.classes.edge_significance import EdgeSignificance
+from nneslib.classes.graph_context import compute_all
+from nneslib.edge import edge_significance
+from nneslib.node import node_significance
+from nneslib.utils.budget import Budget
+from nneslib.utils.cache import ResultCache, graph_fingerprint
+
+
+class ResultCacheTestCase(unittest.TestCase):
+    def test_graph_fingerprint(self):
+        graph = nx.karate_club_graph()
+        self.assertEqual(graph_fingerprint(graph), graph_fingerprint(graph.copy()))
+        weighted = graph.copy()
+        weighted[0][1]["weight"] = 2
+        self.assertNotEqual(graph_fingerprint(graph), graph_fingerprint(weighted))
+        self.assertNotEqual(graph_fingerprint(graph), graph_fingerprint(nx.DiGraph(graph)))
+
+    def test_compute(self):
+        graph = nx.karate_club_graph()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(directory)
+            expected = cache.compute(node_significance.EffC, graph)
+            actual = cache.compute(node_significance.EffC, graph, n_jobs=2)
+            self.assertEqual(expected.significance, actual.significance)
+            self.assertIs(graph, actual.graph)
+            self.assertEqual((1, 1), (cache.hits, cache.misses))
+            # a random call is never cached, a seeded one is
+            cache.compute(edge_significance.ERW_Kpath, graph, k=3, ruo=100, beta=0.01)
+            self.assertEqual(1, cache.stats["entries"])
+            results = compute_all(graph, [("edge.ERW_Kpath", {"k": 3, "ruo": 100, "beta": 0.01, "seed": 1})] * 2,
+                                  cache=cache)
+            self.assertIsInstance(results[1], EdgeSignificance)
+            self.assertEqual(results[0].significance, results[1].significance)
+            self.assertEqual({"hits": 2, "misses": 2, "evictions": 0, "entries": 2},
+                             {key: value for key, value in cache.stats.items() if key != "bytes"})
+
+    def test_budget(self):
+        graph = nx.barabasi_albert_graph(100, 2, seed=0)
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(directory)
+            for max_work in (3, None) * 5:
+                result = cache.compute(edge_significance.betweenness_centrality, graph, seed=0,
+                                       budget=Budget(max_work=max_work))
+                self.assertEqual(max_work is None, result.attrs["complete"])
+            self.assertEqual(0, cache.stats["entries"])  # a budgeted result is never stored
+            expected = cache.compute(edge_significance.betweenness_centrality, graph, seed=0)
+            actual = cache.compute(edge_significance.betweenness_centrality, graph, seed=0, budget=Budget(max_work=3))
+            self.assertEqual(1, cache.hits)
+            self.assertEqual(expected.significance, actual.significance)
+
+    def test_key(self):
+        self.assertEqual(ResultCache.key("graph", "method", {"k": 3}),
+                         ResultCache.key("graph", "method", {"k": np.int64(3)}))
+        with self.assertRaises(TypeError):
+            ResultCache.key("graph", "method", {"k": object()})
+        with mock.patch("nneslib.utils.cache.__version__", "0.0"):
+            older = ResultCache.key("graph", "method", {"k": 3})
+        self.assertNotEqual(older, ResultCache.key("graph", "method", {"k": 3}))
+
+    def test_stale_entry(self):
+        graph = nx.karate_club_graph()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(directory)
+            expected = node_significance.degree_centrality(graph).significance
+            key = ResultCache.key(graph_fingerprint(graph), "nneslib.node.node_significance.degree_centrality", {})
+            # entries pickled by a tree whose classes moved or were renamed
+            for stale in (b"cnneslib.moved\nNodeSignificance\n.", b"cnneslib.classes.significance\nMoved\n."):
+                with open(os.path.join(directory, f"{key}.pkl"), "wb") as file:
+                    file.write(stale)
+                self.assertIsNone(cache.get(key, graph))
+                self.assertEqual(0, cache.stats["entries"])
+                self.assertEqual(expected, cache.compute(node_significance.degree_centrality, graph).significance)
+                os.remove(os.path.join(directory, f"{key}.pkl"))
+
+    def test_eviction(self):
+        graph = nx.karate_club_graph()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(directory)
+            cache.compute(node_significance.degree_centrality, graph)
+            entry_size = cache.stats["bytes"]
+            cache.max_bytes = 2 * entry_size
+            first = os.path.join(directory, os.listdir(directory)[0])
+            os.utime(first, (0, 0))  # the least recently used entry
+            cache.compute(node_significance.closeness_centrality, graph)
+            cache.compute(node_significance.betweenness_centrality, graph)
+            self.assertGreaterEqual(cache.stats["evictions"], 1)
+            self.assertFalse(os.path.exists(first))
+            self.assertLessEqual(cache.stats["bytes"], cache.max_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import networkx as nx
+import numpy as np
+from nneslib.edge.edge_significance import betweenness_centrality, degree_product
+from nneslib.evaluation.cascading_failure import cascading_failure, cascade_sweep
+from nneslib.node.node_significance import degree_centrality
+
+
+def naive_cascade(graph, attacked, alpha, theta):
+    load = {frozenset(edge): (graph.degree(edge[0]) * graph.degree(edge[1])) ** theta for edge in graph.edges()}
+    capacity = {edge: (1 + alpha) * value for edge, value in load.items()}
+    failing = {frozenset(edge) for edge in attacked}
+    alive, steps = set(load) - failing, 0
+    while failing:
+        steps += 1
+        around = {}
+        for edge in alive:
+            for node in edge:
+                around[node] = around.get(node, 0) + load[edge]
+        delta = {}
+        for edge in failing:
+            denominator = sum(around.get(node, 0) for node in edge)
+            for neighbor in alive:
+                if denominator and neighbor & edge:
+                    delta[neighbor] = delta.get(neighbor, 0) + load[edge] * load[neighbor] / denominator
+        for edge, value in delta.items():
+            load[edge] += value
+        failing = {edge for edge in alive if load[edge] > capacity[edge]}
+        alive -= failing
+    return 1 - len(alive) / len(load), steps
+
+
+class CascadingFailureTestCase(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.barabasi_albert_graph(120, 2, seed=8)
+
+    def test_naive(self):
+        significance = betweenness_centrality(self.graph)
+        attacked = [edge for edge, _ in significance.top_k(2)]
+        for alpha in [0.0, 0.2, 0.3, 1.0]:
+            for theta in [0.5, 1.2]:
+                result = cascading_failure(self.graph, significance, alpha, theta, attacked=2)
+                failed, steps = naive_cascade(self.graph, attacked, alpha, theta)
+                self.assertAlmostEqual(failed, result.failed_fraction)
+                self.assertEqual(steps, result.steps)
+                survivors = self.graph.edge_subgraph(set(self.graph.edges()) - set(result.failed))
+                giant = max([len(c) for c in nx.connected_components(survivors)], default=1)
+                self.assertAlmostEqual(giant / 120, result.giant_component_fraction)
+
+    def test_sweep(self):
+        significance = degree_product(self.graph)
+        alphas, thetas = [0.0, 0.1, 0.5, 1.0], [0.5, 1.0, 1.5]
+        sweep = cascade_sweep(self.graph, significance, alphas, thetas, attacked=3, n_jobs=2)
+        self.assertEqual((3, 4), sweep.failed_fraction.shape)
+        for i, theta in enumerate(thetas):
+            for j, alpha in enumerate(alphas):
+                result = cascading_failure(self.graph, significance, alpha, theta, attacked=3)
+                self.assertAlmostEqual(result.failed_fraction, sweep.failed_fraction[i, j])
+                self.assertAlmostEqual(result.giant_component_fraction, sweep.giant_component_fraction[i, j])
+                self.assertEqual(result.steps, sweep.steps[i, j])
+            contained = [alpha for j, alpha in enumerate(alphas) if sweep.steps[i, j] == 1]
+            self.assertEqual(min(contained) if contained else None,
+                             None if np.isnan(sweep.critical_alpha[i]) else sweep.critical_alpha[i])
+        with self.assertRaises(ValueError):
+            cascade_sweep(self.graph, degree_centrality(self.graph), alphas)
+        with self.assertRaises(ValueError):
+            cascading_failure(self.graph, significance, 0.1, attacked=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
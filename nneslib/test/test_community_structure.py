@@ -1,6 +1,9 @@
 import unittest
-from nneslib.evaluation.community_structure import significance_index
+from nneslib.evaluation.community_structure import significance_index, significance_index_curve, \
+    node_deletion_significance_index
 import networkx as nx
+import numpy as np
+from scipy import stats
 
 
 class MyTestCase(unittest.TestCase):
@@ -23,6 +26,34 @@ class MyTestCase(unittest.TestCase):
             H_remove = significance_index(subgraph, communities_number)
             self.assertAlmostEqual(expected[key], H_remove - H_oring, delta=1e-2)
 
+    def test_significance_index_curve(self):
+        graph = nx.karate_club_graph()
+        curve = significance_index_curve(graph, range(2, 12))
+        for communities_number, H in curve.items():
+            self.assertAlmostEqual(significance_index(graph, communities_number), H)
+        for communities_numbers in ([1, 2], [2, 34], [35]):
+            with self.assertRaises(ValueError):
+                significance_index_curve(graph, communities_numbers)
+
+    def test_node_deletion_significance_index(self):
+        graph = nx.connected_watts_strogatz_graph(40, 4, 0.2, seed=1)
+        for u, v in graph.edges():
+            graph[u][v]["weight"] = 1 + (u * v) % 3
+        exact = node_deletion_significance_index(graph, 3, weight="weight")
+        self.assertEqual(exact, node_deletion_significance_index(graph, 3, weight="weight", n_jobs=2))
+        for node in graph.nodes():
+            subgraph = graph.subgraph([other for other in graph.nodes() if other != node])
+            self.assertAlmostEqual(significance_index(subgraph, 3, weight="weight"), exact[node])
+        approximate = node_deletion_significance_index(graph, 3, weight="weight", method="perturbation")
+        self.assertEqual(set(approximate), set(exact))
+        # the first-order estimate is close for most nodes and ranks them alike
+        expected = np.array([exact[node] for node in graph.nodes()])
+        actual = np.array([approximate[node] for node in graph.nodes()])
+        self.assertLess(np.median(np.abs(actual - expected) / expected), 0.05)
+        self.assertGreater(stats.spearmanr(expected, actual)[0], 0.7)
+        with self.assertRaises(ValueError):
+            node_deletion_significance_index(graph, 3, method="unknown")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import networkx as nx
+import numpy as np
+from nneslib.classes.csr_graph import CSRGraph
+from nneslib.edge import edge_significance
+from nneslib.evaluation import community_structure
+from nneslib.evaluation.global_topology import giant_component_fraction, normalized_susceptibility
+from nneslib.evaluation.robustness import robustness_curve
+from nneslib.node import node_significance
+
+
+def by_edge(significance):
+    return {frozenset(edge): value for edge, value in significance.significance.items()}
+
+
+class CSRGraphTestCase(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.barabasi_albert_graph(120, 2, seed=3)
+        self.graph.add_edge(5, 5)
+        self.graph.add_node(120)
+        for u, v in self.graph.edges():
+            self.graph[u][v]["weight"] = 1 + (u + v) % 4
+        sources, targets = np.array(self.graph.edges()).T
+        weights = [weight for _, _, weight in self.graph.edges(data="weight")]
+        # parallel and reversed edges are merged, keeping the first weight
+        self.csr = CSRGraph.from_edges(np.concatenate([sources, targets[:3]]), np.concatenate([targets, sources[:3]]),
+                                       weights + [100] * 3, nodes=list(self.graph.nodes()))
+
+    def test_build(self):
+        self.assertEqual(np.int32, self.csr.indices.dtype)
+        self.assertEqual(np.float32, self.csr.weights.dtype)
+        self.assertEqual(self.graph.number_of_edges(), self.csr.number_of_edges())
+        self.assertEqual(self.graph.number_of_edges(), len(self.csr.edges()))
+        self.assertTrue(nx.utils.graphs_equal(self.graph, self.csr.to_networkx()))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "edges.txt")
+            with open(path, "w") as file:
+                file.write("# source target weight\n" + "".join(f"{u} {v} {w}\n" for u, v, w in
+                                                                 self.graph.edges(data="weight")))
+            graph = CSRGraph.from_file(path, weighted=True).to_networkx()
+            self.assertEqual(sorted(self.graph.edges(data="weight")), sorted(graph.edges(data="weight")))
+            with open(path, "w") as file:
+                file.write("a,b\nb,c\n")
+            self.assertEqual([("a", "b"), ("b", "c")], list(CSRGraph.from_file(path, delimiter=",").edges()))
+        with self.assertRaises(ValueError):
+            CSRGraph.from_edges([0], [7], nodes=[0, 1])
+
+    def test_methods(self):
+        for method, kwargs in [(node_significance.degree_centrality, {}),
+                               (node_significance.betweenness_centrality, {"weight": "weight"}),
+                               (node_significance.closeness_centrality, {})]:
+            expected, actual = method(self.graph, **kwargs).significance, method(self.csr, **kwargs).significance
+            for node, value in expected.items():
+                self.assertAlmostEqual(value, actual[node])
+        for method, kwargs in [(edge_significance.degree_product, {"weight": "weight"}),
+                               (edge_significance.diffusion_importance, {}),
+                               (edge_significance.betweenness_centrality, {}),
+                               (edge_significance.brightness, {})]:
+            result = method(self.csr, **kwargs)
+            if method is not edge_significance.betweenness_centrality:
+                self.assertIsNone(result._significance)  # array-backed
+            expected, actual = by_edge(method(self.graph, **kwargs)), by_edge(result)
+            for edge, value in expected.items():
+                self.assertAlmostEqual(value, actual[edge])
+        np.testing.assert_allclose(
+            robustness_curve(self.graph, edge_significance.degree_product(self.graph), 0.1).giant_component_fraction,
+            robustness_curve(self.csr, edge_significance.degree_product(self.csr), 0.1).giant_component_fraction)
+        self.assertAlmostEqual(giant_component_fraction(self.graph), giant_component_fraction(self.csr))
+        self.assertAlmostEqual(normalized_susceptibility(self.graph), normalized_susceptibility(self.csr))
+
+    def test_community_structure(self):
+        for weight in (None, "weight"):
+            self.assertAlmostEqual(community_structure.significance_index(self.graph, 3, weight),
+                                   community_structure.significance_index(self.csr, 3, weight))
+            expected = community_structure.significance_index_curve(self.graph, [2, 4, 8], weight)
+            actual = community_structure.significance_index_curve(self.csr, [2, 4, 8], weight)
+            for c, value in expected.items():
+                self.assertAlmostEqual(value, actual[c])
+            for method in ("exact", "perturbation"):
+                expected = community_structure.node_deletion_significance_index(self.graph, 3, weight, method)
+                actual = community_structure.node_deletion_significance_index(self.csr, 3, weight, method)
+                for node, value in expected.items():
+                    self.assertAlmostEqual(value, actual[node])
+
+
+if __name__ == '__main__':
+    unittest.main()
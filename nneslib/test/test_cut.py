@@ -0,0 +1,46 @@
+import unittest
+import networkx as nx
+import numpy as np
+from nneslib.utils.cut import partition_cuts, ratio_cut
+
+
+class CutTestCase(unittest.TestCase):
+    def test_ratio_cut(self):
+        graph = nx.karate_club_graph()
+        communities = [[node for node in graph if graph.nodes[node]["club"] == club] for club in ("Mr. Hi", "Officer")]
+        expected = sum(nx.cut_size(graph, community) / len(community) for community in communities)
+        self.assertAlmostEqual(expected, ratio_cut(graph, communities))
+
+    def test_partition_cuts(self):
+        for graph in (nx.karate_club_graph(), nx.gnp_random_graph(40, 0.15, seed=1, directed=True)):
+            graph.add_edge(3, 3, weight=2.0)
+            nodes = list(graph)
+            partitions = np.random.default_rng(0).integers(0, 3, size=(20, len(nodes)))
+            scores = partition_cuts(graph, partitions, weight="weight", chunk_size=6)
+            total = sum(degree for _, degree in graph.degree(weight="weight"))
+            for partition, cut_size, ratio, normalized, conductance in zip(partitions, *scores):
+                communities = [[node for node, label in zip(nodes, partition) if label == community]
+                               for community in np.unique(partition)]
+                cuts = [nx.cut_size(graph, community, set(nodes) - set(community), weight="weight")
+                        for community in communities]
+                volumes = [sum(degree for _, degree in graph.degree(community, weight="weight"))
+                           for community in communities]
+                self.assertAlmostEqual(sum(cuts) / 2, cut_size)
+                self.assertAlmostEqual(sum(cut / len(community) for cut, community in zip(cuts, communities)), ratio)
+                self.assertAlmostEqual(sum(cut / volume for cut, volume in zip(cuts, volumes)), normalized)
+                self.assertAlmostEqual(max(cut / min(volume, total - volume) for cut, volume in zip(cuts, volumes)),
+                                       conductance)
+        # one partition, as an array or a dict
+        graph = nx.karate_club_graph()
+        labels = {node: graph.nodes[node]["club"] for node in graph}
+        single = partition_cuts(graph, labels)
+        self.assertAlmostEqual(nx.normalized_cut_size(graph, [node for node in graph if labels[node] == "Officer"]),
+                               single.normalized_cut)
+        self.assertEqual(single, partition_cuts(graph, np.array([labels[node] for node in graph])))
+        self.assertEqual(0.0, partition_cuts(graph, np.zeros((1, 34))).conductance[0])
+        with self.assertRaises(ValueError):
+            partition_cuts(graph, np.zeros(33))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+import networkx as nx
+from nneslib.datasets import load_twitch
+
+
+class DatasetsTestCase(unittest.TestCase):
+    def test_load_twitch(self):
+        graph = nx.gnm_random_graph(50, 200, seed=1)
+        graph.add_edge(7, 7)
+        with tempfile.TemporaryDirectory() as data_home:
+            os.makedirs(os.path.join(data_home, "twitch", "ENGB"))
+            raw_path = os.path.join(data_home, "twitch", "ENGB", "musae_ENGB_edges.csv")
+            with open(raw_path, "w") as file:
+                file.write("from,to\n" + "".join(f"{v},{u}\n" for u, v in graph.edges()))
+            self.assertTrue(nx.utils.graphs_equal(graph, load_twitch("EN", data_home=data_home)))
+            self.assertTrue(os.path.exists(os.path.join(data_home, "cache", "twitch_EN.nnes")))
+            csr_graph = load_twitch("EN", as_csr=True, data_home=data_home)
+            self.assertEqual(graph.number_of_edges(), csr_graph.number_of_edges())
+            self.assertEqual(sorted(graph[7]), sorted(csr_graph.neighbors(7)))
+            # the cache is rebuilt when the raw edge list changes, and used alone once it is gone
+            with open(raw_path, "a") as file:
+                file.write("0,50\n")
+            self.assertTrue(load_twitch("EN", data_home=data_home).has_edge(0, 50))
+            os.remove(raw_path)
+            self.assertTrue(load_twitch("EN", data_home=data_home).has_edge(0, 50))
+            with self.assertRaises(FileNotFoundError):
+                load_twitch("DE", data_home=data_home)
+        with self.assertRaises(ValueError):
+            load_twitch("XX")
+
+
+if __name__ == '__main__':
+    unittest.main()
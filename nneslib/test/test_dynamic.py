@@ -0,0 +1,41 @@
+import random
+import unittest
+import networkx as nx
+from nneslib.dynamic import IncrementalDegreeProduct, IncrementalDiffusionImportance, IncrementalDegreeCentrality
+from nneslib.edge.edge_significance import degree_product, diffusion_importance
+from nneslib.node.node_significance import degree_centrality
+
+
+class IncrementalSignificanceTestCase(unittest.TestCase):
+    def test_updates_equal_full_recompute(self):
+        rng = random.Random(0)
+        methods = [(lambda graph: IncrementalDegreeProduct(graph, "weight", 1.5),
+                    lambda graph: degree_product(graph, "weight", 1.5)),
+                   (IncrementalDiffusionImportance, diffusion_importance),
+                   (IncrementalDegreeCentrality, degree_centrality)]
+        for directed in (False, True):
+            initial = nx.gnm_random_graph(40, 120, seed=1, directed=directed)
+            for u, v in initial.edges():
+                initial[u][v]["weight"] = rng.random()
+            initial.add_edge(3, 3, weight=0.5)
+            for incremental, full in methods:
+                graph = initial.copy()
+                tracker = incremental(graph)
+                for step in range(10):
+                    if step % 2 == 0:  # new nodes come with some of the added edges
+                        tracker.add_edges([(rng.randrange(45), rng.randrange(45), {"weight": rng.random()})
+                                           for _ in range(4)])
+                    else:
+                        tracker.remove_edges(rng.sample(list(graph.edges()), 4) + [(0, 100)])
+                    self.assertEqual(full(graph).significance, tracker.to_significance().significance)
+
+    def test_recomputed_entries(self):
+        graph = nx.path_graph(6)
+        tracker = IncrementalDegreeProduct(graph)
+        self.assertEqual({(0, 1), (1, 2), (4, 5)}, tracker.add_edges([(1, 5)]) - {(1, 5)})
+        with self.assertRaises(ValueError):
+            IncrementalDegreeCentrality(nx.MultiGraph())
+
+
+if __name__ == '__main__':
+    unittest.main()
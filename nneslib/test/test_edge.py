@@ -0,0 +1,90 @@
+import unittest
+import networkx as nx
+import numpy as np
+from nneslib.edge.edge_significance import betweenness_centrality, diffusion_importance, brightness, ERW_Kpath, \
+    degree_product
+from nneslib.edge.internal import CliqueIndex
+
+
+class EdgeImportanceTestCase(unittest.TestCase):
+    def test_edge_store(self):
+        graph = nx.karate_club_graph()
+        edge_significance = betweenness_centrality(graph)
+        nodes = list(graph.nodes())
+        expected = np.zeros((len(nodes), len(nodes)))
+        for (u, v), value in edge_significance.significance.items():
+            expected[nodes.index(u), nodes.index(v)] = expected[nodes.index(v), nodes.index(u)] = value
+        np.testing.assert_array_equal(expected, edge_significance.to_dense())
+        np.testing.assert_array_equal(expected, edge_significance.to_sparse().toarray())
+        for u, v in graph.edges():
+            self.assertEqual(edge_significance.significance[(u, v)], edge_significance.get(u, v))
+            self.assertEqual(edge_significance.significance[(u, v)], edge_significance.get(v, u))
+        self.assertEqual(0.0, edge_significance.get(0, 9))
+        with self.assertRaises(nx.NodeNotFound):
+            edge_significance.get(0, 100)
+
+    def test_diffusion_importance(self):
+        graph = nx.karate_club_graph()
+        expected = {}
+        for u, v in graph.edges():
+            u_neighbors, v_neighbors = set(graph[u]), set(graph[v])
+            n_uv = len(v_neighbors - u_neighbors - {u})  # links of v connecting outside the neighborhood of u
+            n_vu = len(u_neighbors - v_neighbors - {v})
+            expected[(u, v)] = (n_uv + n_vu) / 2
+        self.assertEqual(expected, diffusion_importance(graph).significance)
+        self.assertEqual(expected, diffusion_importance(graph, chunk_size=5).significance)
+
+    def test_brightness(self):
+        graph = nx.karate_club_graph()
+        cliques = sorted(nx.find_cliques(graph), key=len, reverse=True)
+        actual = brightness(graph)
+        self.assertTrue(actual.attrs["exact"])
+        for u, v in graph.edges():
+            s_u = max(len(clique) for clique in cliques if u in clique)
+            s_v = max(len(clique) for clique in cliques if v in clique)
+            s_e = max(len(clique) for clique in cliques if u in clique and v in clique)
+            self.assertAlmostEqual(np.sqrt(s_u * s_v) / s_e, actual.significance[(u, v)])
+        approximate = brightness(graph, max_cliques=3)
+        self.assertFalse(approximate.attrs["exact"])
+        self.assertEqual(set(actual.significance), set(approximate.significance))
+        # without a time limit the uncovered edges keep the triangle bound
+        index, first = CliqueIndex(graph, max_cliques=1), next(nx.find_cliques(graph))
+        for u, v in graph.edges():
+            expected = len(first) if u in first and v in first else 3 if set(graph[u]) & set(graph[v]) else 2
+            self.assertEqual(expected, index.edge(u, v))
+
+    def test_ERW_Kpath(self):
+        graph = nx.karate_club_graph()
+        m = graph.number_of_edges()
+        single_steps = ERW_Kpath(graph, k=1, ruo=5000, beta=1.0, seed=0).significance
+        self.assertEqual(set(graph.edges()), set(single_steps))
+        # the karate club has no isolated node, so every walk traverses exactly one edge
+        self.assertAlmostEqual(1 + 5000, sum(single_steps.values()))
+        serial = ERW_Kpath(graph, k=6, ruo=10000, beta=0.5, seed=3)
+        self.assertEqual(serial.significance, ERW_Kpath(graph, k=6, ruo=10000, beta=0.5, seed=3, n_jobs=2).significance)
+        self.assertLessEqual(sum(serial.significance.values()), 1 + 10000 * 6 * 0.5)
+        self.assertTrue(all(value >= 1 / m for value in serial.significance.values()))
+
+    def test_betweenness_centrality_parallel(self):
+        graph = nx.karate_club_graph()
+        expected = nx.edge_betweenness_centrality(graph, normalized=False)
+        actual = betweenness_centrality(graph, normalize=False, n_jobs=2)
+        self.assertEqual(set(expected), set(actual.significance))
+        for key in expected:
+            self.assertAlmostEqual(expected[key], actual.significance[key], delta=1e-9)
+
+    def test_ranking(self):
+        graph = nx.karate_club_graph()
+        expected = sorted(degree_product(graph).significance.items(), key=lambda item: -item[1])
+        for k in (1, 7, 78, 100):  # the top k before and after the full ranking is built
+            self.assertEqual(expected[:k], degree_product(graph).top_k(k))
+        significance = degree_product(graph)
+        self.assertEqual([item for item in expected if item[1] >= 100], significance.threshold(low=100))
+        self.assertEqual(expected[:5], significance.top_k(5))
+        self.assertEqual(1 + sum(value > significance.get(0, 1) for _, value in expected), significance.rank(1, 0))
+        with self.assertRaises(nx.NetworkXError):
+            significance.rank(0, 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from nneslib.edge import edge_significance
+from nneslib.node import node_significance
+from nneslib.utils.edge_stream import stream_degrees, write_edge_list
+
+
+class EdgeStreamTestCase(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.barabasi_albert_graph(200, 3, seed=0)
+        self.graph.add_edge(7, 7)
+        for u, v in self.graph.edges():
+            self.graph[u][v]["weight"] = 1 + (u + v) % 3
+        self.directory = tempfile.TemporaryDirectory()
+        self.text = os.path.join(self.directory.name, "edges.txt")
+        with open(self.text, "w") as file:
+            file.write("# source target weight\n")
+            file.writelines(f"{u} {v} {data['weight']}\n" for u, v, data in self.graph.edges(data=True))
+        self.binary = os.path.join(self.directory.name, "edges.nnes")
+        ends = np.array(list(self.graph.edges()))
+        write_edge_list(self.binary, ends[:, 0], ends[:, 1], [w for _, _, w in self.graph.edges(data="weight")])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_degree_product(self):
+        output = os.path.join(self.directory.name, "result.nnes")
+        for filepath in (self.text, self.binary):
+            for weighted, weight in ((False, None), (True, "weight")):
+                expected = edge_significance.degree_product(self.graph, weight, theta=0.5).significance
+                # a chunk size that does not divide the edges, new nodes appearing in every chunk
+                result = edge_significance.streaming_degree_product(filepath, output, weighted, theta=0.5,
+                                                                    chunk_size=97)
+                self.assertEqual(len(result.store.values), self.graph.number_of_edges())
+                for edge, value in result.significance.items():
+                    self.assertAlmostEqual(expected[edge], value)
+                del result
+
+    def test_degree_centrality(self):
+        expected = node_significance.degree_centrality(self.graph).significance
+        n = self.graph.number_of_nodes()
+        weighted = {node: degree / (n - 1) for node, degree in self.graph.degree(weight="weight")}
+        for filepath in (self.text, self.binary):
+            result = node_significance.streaming_degree_centrality(filepath, chunk_size=50)
+            self.assertEqual(result.labels, sorted(self.graph.nodes()))
+            for node, value in expected.items():
+                self.assertAlmostEqual(value, result.significance[node])
+            result = node_significance.streaming_degree_centrality(filepath, weighted=True, chunk_size=50)
+            for node, value in weighted.items():
+                self.assertAlmostEqual(value, result.significance[node])
+
+    def test_string_labels(self):
+        filepath = os.path.join(self.directory.name, "names.csv")
+        with open(filepath, "w") as file:
+            file.write("source,target\nb,a\nc,a\nc,c\n")
+        labels, degrees, m = stream_degrees(filepath, chunk_size=1, delimiter=",", skiprows=1)
+        self.assertEqual(labels.tolist(), ["a", "b", "c"])
+        np.testing.assert_array_equal(degrees, [2, 1, 3])
+        self.assertEqual(m, 3)
+        unweighted = os.path.join(self.directory.name, "unweighted.nnes")
+        write_edge_list(unweighted, [0, 1], [1, 2])
+        with self.assertRaises(ValueError):
+            stream_degrees(unweighted, weighted=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import networkx as nx
+from nneslib.classes.graph_context import GraphContext, compute_all
+from nneslib.edge import edge_significance
+from nneslib.node import node_significance
+
+
+class GraphContextTestCase(unittest.TestCase):
+    def test_compute_all(self):
+        graph = nx.karate_club_graph()
+        context = GraphContext(graph)
+        results = compute_all(graph, ["node.degree_centrality", node_significance.closeness_centrality,
+                                      ("edge.degree_product", {"theta": 2}), "edge.diffusion_importance",
+                                      "edge.brightness"], context)
+        self.assertEqual(nx.degree_centrality(graph), results[0].significance)
+        closeness = nx.closeness_centrality(graph)
+        for node in graph.nodes():
+            self.assertAlmostEqual(closeness[node], results[1].significance[node])
+        expected = {(u, v): (graph.degree(u) * graph.degree(v)) ** 2 for u, v in graph.edges()}
+        self.assertEqual(expected, results[2].significance)
+        self.assertEqual(edge_significance.diffusion_importance(graph).significance, results[3].significance)
+        self.assertEqual(edge_significance.brightness(graph).significance, results[4].significance)
+        with self.assertRaises(ValueError):
+            compute_all(graph, ["edge.unknown"])
+        with self.assertRaises(ValueError):
+            edge_significance.degree_product(nx.path_graph(3), context=context)
+
+    def test_invalidate(self):
+        graph = nx.path_graph(4)
+        context = GraphContext(graph)
+        self.assertEqual({(0, 1): 2.0, (1, 2): 4.0, (2, 3): 2.0},
+                         edge_significance.degree_product(graph, context=context).significance)
+        graph.add_edge(3, 0)
+        context.invalidate("degrees", "adjacency")
+        self.assertIn(("edges",), context.cached)
+        context.invalidate()
+        self.assertEqual([], context.cached)
+        self.assertEqual({edge: 4.0 for edge in graph.edges()},
+                         edge_significance.degree_product(graph, context=context).significance)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import networkx as nx
-from nneslib.node.node_significance import centrality_metric_spectrum, EffC
+from nneslib.classes.significance import Significance
+from nneslib.node.node_significance import centrality_metric_spectrum, EffC, betweenness_centrality, degree_centrality
 
 
 class NodeImportanceTestCase(unittest.TestCase):
@@ -23,6 +24,17 @@ class NodeImportanceTestCase(unittest.TestCase):
         for key in actual:
             self.assertAlmostEqual(expected[key], actual[key], delta=1e-2)
 
+    def test_centrality_metric_spectrum_sparse(self):
+        graph = nx.gnp_random_graph(120, 0.08, seed=3)
+        dense = centrality_metric_spectrum(graph, 3, backend="dense").significance
+        sparse = centrality_metric_spectrum(graph, 3, backend="sparse").significance
+        self.assertEqual(set(dense), set(sparse))
+        for key in dense:
+            self.assertAlmostEqual(dense[key], sparse[key], delta=1e-8)
+        auto = centrality_metric_spectrum(graph, 3)
+        self.assertEqual("auto", auto.method_parameters["backend"])
+        self.assertEqual("dense", auto.attrs["backend"])
+
     def test_EffC(self):
         graph = nx.Graph()
         graph.add_nodes_from([i for i in range(1, 10)])
@@ -37,5 +49,54 @@ class NodeImportanceTestCase(unittest.TestCase):
         for key in actual:
             self.assertAlmostEqual(expected[key], actual[key], delta=1e-4)
 
+    def test_EffC_parallel(self):
+        graph = nx.barabasi_albert_graph(60, 2, seed=7)
+        serial = EffC(graph).significance
+        parallel = EffC(graph, n_jobs=2).significance
+        self.assertEqual(set(serial), set(parallel))
+        for key in serial:
+            self.assertAlmostEqual(serial[key], parallel[key], delta=1e-12)
+
+    def test_betweenness_centrality_parallel(self):
+        graph = nx.gnp_random_graph(50, 0.1, seed=1)
+        expected = nx.betweenness_centrality(graph)
+        actual = betweenness_centrality(graph, n_jobs=2)
+        self.assertEqual(set(expected), set(actual.significance))
+        for key in expected:
+            self.assertAlmostEqual(expected[key], actual.significance[key], delta=1e-12)
+        self.assertEqual(50, actual.attrs["samples"])
+
+    def test_betweenness_centrality_adaptive(self):
+        # large enough for the bounds to stop the sampling before every source is swept
+        graph = nx.barabasi_albert_graph(1000, 3, seed=1)
+        expected = nx.betweenness_centrality(graph)
+        actual = betweenness_centrality(graph, epsilon=0.1, delta=0.1, seed=0)
+        self.assertLess(actual.attrs["samples"], 1000)
+        self.assertGreater(actual.attrs["epsilon"], 0)
+        self.assertLessEqual(actual.attrs["epsilon"], 0.1)
+        self.assertEqual(0.1, actual.attrs["delta"])
+        for key in expected:
+            self.assertAlmostEqual(expected[key], actual.significance[key], delta=0.1)
+
+    def test_ranking(self):
+        graph = nx.karate_club_graph()
+        significance = degree_centrality(graph)
+        self.assertEqual(significance.significance[0], significance.get(0))
+        with self.assertRaises(nx.NodeNotFound):
+            significance.get(100)
+        expected = sorted(significance.significance.items(), key=lambda item: -item[1])
+        self.assertEqual(expected[:5], significance.top_k(5))
+        self.assertEqual(expected[:1], significance.top_fraction(0.01))
+        for node, value in significance.significance.items():
+            self.assertEqual(1 + sum(other > value for _, other in expected), significance.rank(node))
+            self.assertAlmostEqual(100 * sum(other <= value for _, other in expected) / len(expected),
+                                   significance.percentile(node))
+        self.assertEqual([item for item in expected if 0.1 <= item[1] <= 0.3], significance.threshold(0.1, 0.3))
+        # a plain Significance ranks its dict
+        plain = Significance(dict(significance.significance), graph, "degree_centrality")
+        self.assertEqual(expected[:5], plain.top_k(5))
+        self.assertEqual(significance.rank(0), plain.rank(0))
+
+
 if __name__ == '__main__':
     unittest.main()
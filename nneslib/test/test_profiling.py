@@ -0,0 +1,47 @@
+import unittest
+import networkx as nx
+from nneslib.edge import edge_significance
+from nneslib.node import node_significance
+from nneslib.utils.profiling import Profiler, phase
+
+
+class ProfilingTestCase(unittest.TestCase):
+    def test_disabled(self):
+        graph = nx.karate_club_graph()
+        self.assertIsNone(edge_significance.degree_product(graph).attrs)
+        with phase("outside") as record:
+            self.assertIsNone(record)
+
+    def test_phases(self):
+        graph = nx.karate_club_graph()
+        expected = node_significance.centrality_metric_spectrum(graph, 2).significance
+        reported = []
+        with Profiler(callback=lambda method, record: reported.append((method, record["name"])),
+                      trace_memory=True) as profiler:
+            ns = node_significance.centrality_metric_spectrum(graph, 2)
+            es = edge_significance.diffusion_importance(graph)
+        self.assertEqual(expected, ns.significance)
+        profile = ns.attrs["profile"]
+        self.assertEqual("node_significance.centrality_metric_spectrum", profile["method"])
+        self.assertEqual((34, 78), (profile["nodes"], profile["edges"]))
+        self.assertEqual(["adjacency", "eigensolver", "scores", "result"],
+                         [record["name"] for record in profile["phases"]])
+        self.assertEqual("dense", profile["phases"][1]["backend"])
+        for record in profile["phases"]:
+            self.assertGreaterEqual(record["seconds"], 0)
+            self.assertIn("allocated_blocks", record)
+            self.assertIn("peak_bytes", record)
+        self.assertLessEqual(sum(record["seconds"] for record in profile["phases"]), profile["seconds"])
+        self.assertEqual(78, es.attrs["profile"]["phases"][1]["pairs"])
+        self.assertEqual(7, len(reported))
+        self.assertEqual(2, len(profiler.profiles))
+        self.assertIn("edge_significance.diffusion_importance/triangles", profiler.summary())
+        # the existing attrs are kept
+        with Profiler():
+            es = edge_significance.brightness(graph)
+        self.assertTrue(es.attrs["exact"])
+        self.assertEqual(["cliques", "brightness", "result"], [record["name"] for record in es.attrs["profile"]["phases"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
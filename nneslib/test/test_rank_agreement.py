@@ -0,0 +1,55 @@
+import unittest
+import networkx as nx
+import numpy as np
+from scipy import stats
+from nneslib.classes.edge_significance import EdgeSignificance
+from nneslib.edge.edge_significance import betweenness_centrality, degree_product
+from nneslib.evaluation.rank_agreement import agreement_matrix, rank_agreement
+from nneslib.node import node_significance
+
+
+class RankAgreementTestCase(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.karate_club_graph()
+
+    def test_edges(self):
+        first = degree_product(self.graph)
+        # reversed edge keys, one edge missing
+        reversed_edges = {(v, u): value for (u, v), value in betweenness_centrality(self.graph).significance.items()}
+        del reversed_edges[(1, 0)]
+        second = EdgeSignificance(reversed_edges, self.graph, "reversed")
+        agreement = rank_agreement(first, second, ks=[1, 5, 10, 1000])
+        edges = [(u, v) for u, v in self.graph.edges() if (v, u) in reversed_edges]
+        x = [first.significance[edge] for edge in edges]
+        y = [reversed_edges[(v, u)] for u, v in edges]
+        self.assertEqual(len(edges), agreement.size)
+        self.assertAlmostEqual(stats.kendalltau(x, y)[0], agreement.kendall_tau)
+        self.assertAlmostEqual(stats.spearmanr(x, y)[0], agreement.spearman)
+        keys = [(min(u, v), max(u, v)) for u, v in edges]
+        for k, overlap, jaccard in zip(agreement.ks, agreement.overlap, agreement.jaccard):
+            k = min(k, len(edges))
+            top_x = set(sorted(range(len(edges)), key=lambda i: (-x[i], keys[i]))[:k])
+            top_y = set(sorted(range(len(edges)), key=lambda i: (-y[i], keys[i]))[:k])
+            self.assertAlmostEqual(len(top_x & top_y) / k, overlap)
+            self.assertAlmostEqual(len(top_x & top_y) / len(top_x | top_y), jaccard)
+
+    def test_matrix(self):
+        results = [node_significance.degree_centrality(self.graph),
+                   node_significance.betweenness_centrality(self.graph),
+                   node_significance.closeness_centrality(self.graph)]
+        for metric in ["kendall", "spearman", "overlap", "jaccard"]:
+            matrix = agreement_matrix(results, metric, k=5)
+            np.testing.assert_allclose(matrix, matrix.T)
+            np.testing.assert_allclose(np.ones(3), np.diag(matrix))
+            agreement = rank_agreement(results[0], results[2], ks=[5])
+            expected = {"kendall": agreement.kendall_tau, "spearman": agreement.spearman,
+                        "overlap": agreement.overlap[0], "jaccard": agreement.jaccard[0]}[metric]
+            self.assertAlmostEqual(expected, matrix[0, 2])
+        with self.assertRaises(ValueError):
+            agreement_matrix(results, "overlap")
+        with self.assertRaises(ValueError):
+            rank_agreement(results[0], degree_product(self.graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import networkx as nx
+import numpy as np
+from nneslib.edge.edge_significance import betweenness_centrality as edge_betweenness
+from nneslib.classes.edge_significance import EdgeSignificance
+from nneslib.classes.node_significance import NodeSignificance
+from nneslib.evaluation.global_topology import giant_component_fraction, normalized_susceptibility
+from nneslib.evaluation.robustness import robustness_curve, robustness_curves
+from nneslib.node.node_significance import degree_centrality
+
+
+class RobustnessTestCase(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.barabasi_albert_graph(80, 2, seed=5)
+
+    def test_edge_attack(self):
+        significance = edge_betweenness(self.graph)
+        curve = robustness_curve(self.graph, significance, step=0.1)
+        ranking = sorted(significance.significance, key=significance.significance.get, reverse=True)
+        for fraction, r_gc, s in zip(curve.fractions, curve.giant_component_fraction, curve.normalized_susceptibility):
+            attacked = self.graph.copy()
+            attacked.remove_edges_from(ranking[:int(round(fraction * len(ranking)))])
+            self.assertAlmostEqual(giant_component_fraction(attacked), r_gc)
+            self.assertAlmostEqual(normalized_susceptibility(attacked), s)
+
+    def test_node_attack(self):
+        significance = degree_centrality(self.graph)
+        edge_curve, node_curve = robustness_curves(self.graph, [edge_betweenness(self.graph), significance], 0.25)
+        self.assertEqual(5, len(edge_curve.fractions))
+        ranking = sorted(significance.significance, key=significance.significance.get, reverse=True)
+        n = self.graph.number_of_nodes()
+        for fraction, r_gc, s in zip(node_curve.fractions, node_curve.giant_component_fraction,
+                                     node_curve.normalized_susceptibility):
+            attacked = self.graph.subgraph(ranking[int(round(fraction * n)):])
+            sizes = sorted([len(component) for component in nx.connected_components(attacked)], reverse=True)
+            self.assertAlmostEqual(sizes[0] / n if sizes else 0, r_gc)
+            self.assertAlmostEqual(np.sum(np.square(sizes[1:])) / n, s)
+
+    def test_partial_significance(self):
+        edges = edge_betweenness(self.graph).significance
+        reversed_edges = EdgeSignificance({(v, u): value for (u, v), value in edges.items()}, self.graph, "reversed")
+        top_edges = sorted(edges, key=edges.get, reverse=True)[:20]
+        partial_edges = EdgeSignificance({edge: edges[edge] for edge in top_edges}, self.graph, "partial")
+        nodes = degree_centrality(self.graph).significance
+        top_nodes = sorted(nodes, key=nodes.get, reverse=True)[:10]
+        partial_nodes = NodeSignificance({node: nodes[node] for node in top_nodes}, self.graph, "partial")
+        full_edges, full_nodes = robustness_curves(self.graph, [EdgeSignificance(edges, self.graph, "full"),
+                                                                NodeSignificance(nodes, self.graph, "full")], 0.1)
+        for curve, full, removed in [(robustness_curve(self.graph, reversed_edges, 0.1), full_edges, None),
+                                     (robustness_curve(self.graph, partial_edges, 0.1), full_edges, 20),
+                                     (robustness_curve(self.graph, partial_nodes, 0.1), full_nodes, 10)]:
+            total = len(edges) if full is full_edges else len(nodes)
+            same = slice(None) if removed is None else curve.fractions * total <= removed
+            np.testing.assert_allclose(full.giant_component_fraction[same], curve.giant_component_fraction[same])
+            np.testing.assert_allclose(full.normalized_susceptibility[same], curve.normalized_susceptibility[same])
+
+
+if __name__ == '__main__':
+    unittest.main()
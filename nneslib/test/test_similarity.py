@@ -0,0 +1,34 @@
+import unittest
+import networkx as nx
+from nneslib.utils.similarity import jaccard_similarity, jaccard_edges, jaccard_top_k, jaccard_threshold
+
+
+class SimilarityTestCase(unittest.TestCase):
+    def test_bulk_jaccard(self):
+        for graph in (nx.karate_club_graph(), nx.gnp_random_graph(50, 0.1, seed=3, directed=True)):
+            graph.add_edge(2, 2)
+            nodes = list(graph)
+            neighbors = {node: set(graph.successors(node) if graph.is_directed() else graph.adj[node]) - {node}
+                         for node in nodes}
+
+            def expected(u, v):
+                return jaccard_similarity(neighbors[u], neighbors[v]) if neighbors[u] | neighbors[v] else 0.0
+
+            edges = jaccard_edges(graph, chunk_size=7)
+            self.assertEqual(list(graph.edges()), list(edges))
+            for (u, v), value in edges.items():
+                self.assertAlmostEqual(0.0 if u == v else expected(u, v), value)
+            matrix = jaccard_threshold(graph, 0.25, chunk_size=5)
+            self.assertEqual({(i, j) for i, u in enumerate(nodes) for j, v in enumerate(nodes)
+                              if i != j and expected(u, v) >= 0.25}, set(zip(*matrix.nonzero())))
+            top = jaccard_top_k(graph, 3, chunk_size=9)
+            for i, u in enumerate(nodes):
+                ranked = sorted((-expected(u, v), j) for j, v in enumerate(nodes) if j != i and expected(u, v) > 0)
+                self.assertEqual([nodes[j] for _, j in ranked[:3]], [v for v, _ in top[u]])
+            self.assertEqual(top, jaccard_top_k(graph, 3))
+        with self.assertRaises(ValueError):
+            jaccard_threshold(graph, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import networkx as nx
+from nneslib.evaluation.spreading import spreading_influence
+
+
+class SpreadingTestCase(unittest.TestCase):
+    def test_expected_outbreak(self):
+        # on a path a - b - c with mu = 1, an end infects 1 + beta + beta^2 nodes on average and the middle 1 + 2 beta
+        result = spreading_influence(nx.path_graph(3), 0.3, realizations=50000, seed=0)
+        self.assertAlmostEqual(1.39, result.outbreak.significance[0], delta=0.01)
+        self.assertAlmostEqual(1.6, result.outbreak.significance[1], delta=0.01)
+        self.assertAlmostEqual(0.69 / 3, result.transmissions.significance[(0, 1)], delta=0.01)
+        self.assertEqual(150000, result.realizations)
+
+    def test_components(self):
+        graph = nx.disjoint_union(nx.karate_club_graph(), nx.path_graph(4))
+        result = spreading_influence(graph, 1.0, realizations=3, seed=1)
+        for component in nx.connected_components(graph):
+            for node in component:
+                self.assertEqual(len(component), result.outbreak.significance[node])
+        # every infection but the sources' travels through one edge
+        self.assertAlmostEqual(sum(result.outbreak.significance.values()) - 38,
+                               sum(result.transmissions.significance.values()) * 38)
+        directed = spreading_influence(nx.DiGraph([(0, 1), (1, 2)]), 1.0, realizations=2, seed=0)
+        self.assertEqual({0: 3, 1: 2, 2: 1}, directed.outbreak.significance)
+
+    def test_batches(self):
+        graph = nx.karate_club_graph()
+        single = spreading_influence(graph, 0.2, mu=0.3, sources=[0, 33], realizations=500, seed=5, batch_size=300)
+        pooled = spreading_influence(graph, 0.2, mu=0.3, sources=[0, 33], realizations=500, seed=5, batch_size=300,
+                                     n_jobs=2)
+        self.assertEqual(single.outbreak.significance, pooled.outbreak.significance)
+        self.assertEqual(single.transmissions.significance, pooled.transmissions.significance)
+        si = spreading_influence(graph, 1.0, model="SI", sources=[0], max_steps=1, realizations=1)
+        self.assertEqual(1 + graph.degree(0), si.outbreak.significance[0])
+        with self.assertRaises(ValueError):
+            spreading_influence(graph, 0.2, model="SI")
+        with self.assertRaises(ValueError):
+            spreading_influence(graph, 0.2, mu=0.0)
+        no_recovery = spreading_influence(nx.path_graph(5), 1.0, mu=0.0, sources=[0], max_steps=2, realizations=1)
+        self.assertEqual(3, no_recovery.outbreak.significance[0])
+        with self.assertRaises(ValueError):
+            spreading_influence(graph, 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,241 @@
+import math
+import time
+from heapq import heappush, heappop
+from itertools import count
+
+import networkx as nx
+import numpy as np
+
+from nneslib.classes.graph_context import GraphContext, graph_context
+from nneslib.utils.budget import BUDGET_PREFETCH, Budget
+from nneslib.utils.parallel import parallel_imap
+
+
+__all__ = ['brandes_betweenness', 'betweenness_scales']
+
+# Edge-indexed CSR adjacency of the graph, shared with the worker processes by `_init_worker`
+_BRANDES_GRAPH = {}
+
+
+def _init_worker(indptr: np.ndarray, neighbors: np.ndarray, slot_edges: np.ndarray, slot_weights: np.ndarray,
+                 n_edges: int, weighted: bool, deadline: float = None) -> None:
+    _BRANDES_GRAPH.update(indptr=indptr.tolist(), neighbors=neighbors.tolist(), slot_edges=slot_edges.tolist(),
+                          slot_weights=slot_weights.tolist(), n_edges=n_edges, weighted=weighted, deadline=deadline)
+
+
+def _shortest_paths(source: int) -> tuple:
+    """
+    Single source shortest paths, counting them and recording the predecessors and the edges they arrive by.
+
+    :return: the nodes in order of non-decreasing distance, the (predecessor, edge) lists and the path counts
+    """
+    indptr, neighbors, slot_edges = _BRANDES_GRAPH["indptr"], _BRANDES_GRAPH["neighbors"], _BRANDES_GRAPH["slot_edges"]
+    n = len(indptr) - 1
+    S, P, sigma = [], [[] for _ in range(n)], [0.0] * n
+    sigma[source] = 1.0
+    if not _BRANDES_GRAPH["weighted"]:
+        distance = [-1] * n
+        distance[source] = 0
+        queue, head = [source], 0
+        while head < len(queue):
+            v = queue[head]
+            head += 1
+            S.append(v)
+            next_distance = distance[v] + 1
+            for slot in range(indptr[v], indptr[v + 1]):
+                w = neighbors[slot]
+                if distance[w] < 0:
+                    distance[w] = next_distance
+                    queue.append(w)
+                if distance[w] == next_distance:
+                    sigma[w] += sigma[v]
+                    P[w].append((v, slot_edges[slot]))
+        return S, P, sigma
+    # Dijkstra, as networkx does: equal distances must compare equal as floats
+    slot_weights = _BRANDES_GRAPH["slot_weights"]
+    done, seen = [False] * n, {source: 0}
+    counter, queue = count(), [(0, 0, source, source, -1)]
+    while queue:
+        dist, _, pred, v, edge = heappop(queue)
+        if done[v]:
+            continue
+        done[v] = True
+        if v != source:
+            sigma[v] += sigma[pred]
+        S.append(v)
+        for slot in range(indptr[v], indptr[v + 1]):
+            w = neighbors[slot]
+            vw_dist = dist + slot_weights[slot]
+            if not done[w] and (w not in seen or vw_dist < seen[w]):
+                seen[w] = vw_dist
+                heappush(queue, (vw_dist, next(counter), v, w, slot_edges[slot]))
+                sigma[w] = 0.0
+                P[w] = [(v, slot_edges[slot])]
+            elif vw_dist == seen.get(w):
+                sigma[w] += sigma[v]
+                P[w].append((v, slot_edges[slot]))
+    return S, P, sigma
+
+
+def _dependencies(source: int) -> tuple:
+    """
+    The node and edge dependencies of one source, accumulated as in Brandes' algorithm.
+    """
+    S, P, sigma = _shortest_paths(source)
+    n = len(sigma)
+    delta, node_delta, edge_delta = [0.0] * n, np.zeros(n), np.zeros(_BRANDES_GRAPH["n_edges"])
+    while S:
+        w = S.pop()
+        coefficient = (1 + delta[w]) / sigma[w]
+        for v, edge in P[w]:
+            c = sigma[v] * coefficient
+            edge_delta[edge] += c
+            delta[v] += c
+        if w != source:
+            node_delta[w] = delta[w]
+    return node_delta, edge_delta
+
+
+def _chunk_dependencies(sources: list) -> tuple:
+    """
+    The sum and the sum of squares of the node and edge dependencies of several sources, and the number of sources
+    swept: a chunk stops at the `time.monotonic()` deadline of the budget, which the worker processes share.
+    """
+    deadline, swept = _BRANDES_GRAPH["deadline"], 0
+    node_sum, node_squares = np.zeros(len(_BRANDES_GRAPH["indptr"]) - 1), np.zeros(len(_BRANDES_GRAPH["indptr"]) - 1)
+    edge_sum, edge_squares = np.zeros(_BRANDES_GRAPH["n_edges"]), np.zeros(_BRANDES_GRAPH["n_edges"])
+    for source in sources:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        swept += 1
+        node_delta, edge_delta = _dependencies(source)
+        node_sum += node_delta
+        node_squares += node_delta * node_delta
+        edge_sum += edge_delta
+        edge_squares += edge_delta * edge_delta
+    return node_sum, node_squares, edge_sum, edge_squares, swept
+
+
+def betweenness_scales(n: int, normalized: bool, directed: bool) -> tuple:
+    """
+    The factors turning summed dependencies over all sources into networkx's node and edge betweenness.
+
+    :return: the node scale and the edge scale
+    """
+    if normalized:
+        node_scale = 1 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+        edge_scale = 1 / (n * (n - 1)) if n > 1 else 1.0
+    else:
+        node_scale = edge_scale = 1.0 if directed else 0.5
+    return node_scale, edge_scale
+
+
+def _empirical_bernstein(squares: np.ndarray, total: np.ndarray, samples: int, value_range: float,
+                         log_term: float) -> float:
+    """
+    The largest Maurer-Pontil empirical Bernstein deviation over the elements, for i.i.d. values in [0, value_range].
+    """
+    if samples < 2:
+        return math.inf
+    mean = total / samples
+    variance = np.maximum(squares / samples - mean * mean, 0) * samples / (samples - 1)
+    bound = np.sqrt(2 * variance * log_term / samples) + 7 * value_range * log_term / (3 * (samples - 1))
+    return float(bound.max()) if len(bound) else 0.0
+
+
+def brandes_betweenness(graph: nx.Graph, sources: int = None, weight: str = None, normalized: bool = True,
+                        edges: bool = False, n_jobs: int = None, chunk_size: int = 64, epsilon: float = None,
+                        delta: float = 0.1, seed: int = None, context: GraphContext = None,
+                        budget: Budget = None) -> tuple:
+    """
+    Brandes' betweenness centrality over an edge-indexed CSR adjacency, with the single source sweeps split into
+    chunks that run on a process pool and whose partial dependency vectors are summed.
+
+    Sources are drawn in a random order. By default all of them are swept; if `sources` is given only that many,
+    and the result is extrapolated by n / sources as networkx does. If `epsilon` is given, sources are drawn in
+    chunks until, with probability at least 1 - delta, every value is within epsilon of the exact one: the
+    empirical Bernstein bound of every element must be below epsilon, or the Hoeffding bound of the drawn sample size
+    must be. Each bound holds with probability 1 - delta / 2, union bounded over the elements and the checks.
+    Sweeping all sources is exact.
+    With a budget, the work units are the swept sources and the result is extrapolated from the sources swept when
+    it runs out. The deadline of its time limit is checked before every source, in the worker processes as well, so
+    the sweeps stop in time however large the chunks are.
+
+    :param graph: the networkx graph object to be used
+    :param sources: If not None, the number of sampled sources
+    :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+    :param normalized: whether to normalize the values as networkx does
+    :param edges: whether to compute edge rather than node betweenness
+    :param n_jobs: the number of worker processes, None or 1 runs in the calling process
+    :param chunk_size: the number of sources swept by one task
+    :param epsilon: If not None, the additive error bound of the adaptive sampling
+    :param delta: the failure probability of the adaptive sampling
+    :param seed: seed of the source order
+    :param context: If not None, the GraphContext holding the edge-indexed adjacency of graph
+    :param budget: If not None, the :class:`Budget` that may stop the sweeps early
+    :return: a dict of {node: betweenness} (or {edge: betweenness}) and a dict with the number of swept "samples",
+      for the adaptive sampling the achieved "epsilon" and the "delta" it holds with, and with a budget its report
+    """
+    nodes, edge_list, _, indptr, neighbors, slot_edges, slot_weights = \
+        graph_context(graph, context).edge_indexed_csr(weight)
+    n = len(nodes)
+    node_scale, edge_scale = betweenness_scales(n, normalized, graph.is_directed())
+    scale = edge_scale if edges else node_scale
+    elements = edge_list if edges else nodes
+    # A dependency is at most n - 2 for a node and n - 1 for an edge
+    value_range = scale * n * max(n - 1 if edges else n - 2, 1)
+    order = np.random.default_rng(seed).permutation(n).tolist()
+    planned = n if sources is None else min(sources, n)
+    if epsilon is not None and len(elements):
+        # delta is split evenly between the Bernstein and the Hoeffding bounds, each union bounded over both tails,
+        # the elements and the checks (at most one per round). The Maurer-Pontil bound of one tail at delta' has the
+        # log term log(2 / delta')
+        checks = max(math.ceil(math.log2(max(planned / chunk_size, 1))) + 1, 1)
+        bernstein_log = math.log(8 * len(elements) * checks / delta)
+        hoeffding_log = math.log(4 * len(elements) * checks / delta)
+        # sample size after which the Hoeffding bound alone guarantees epsilon, which only removes rounds
+        planned = min(planned, math.ceil(value_range ** 2 * hoeffding_log / (2 * epsilon ** 2)))
+    if budget is not None:
+        planned = budget.start(planned)
+    initargs = (indptr, neighbors, slot_edges, slot_weights, len(edge_list), weight is not None,
+                None if budget is None else budget.deadline)
+    total, squares, samples, achieved = np.zeros(len(elements)), np.zeros(len(elements)), 0, None
+    # With adaptive sampling, chunks are grouped in rounds of doubling size so the bound is checked O(log n) times
+    rounds, start, round_size = [], 0, chunk_size
+    while start < planned:
+        if epsilon is None:
+            round_size = planned
+        rounds.append([order[low:min(low + chunk_size, planned)]
+                       for low in range(start, min(start + round_size, planned), chunk_size)])
+        start, round_size = min(start + round_size, planned), round_size * 2
+    stopped = False
+    for chunks in rounds:
+        results = parallel_imap(_chunk_dependencies, chunks, n_jobs, _init_worker, initargs,
+                                None if budget is None else BUDGET_PREFETCH)
+        for node_sum, node_squares, edge_sum, edge_squares, swept in results:
+            total += edge_sum if edges else node_sum
+            squares += edge_squares if edges else node_squares
+            samples += swept
+            if budget is not None and not budget.advance(swept):
+                stopped = True
+                break
+        if stopped:
+            results.close()  # cancels the chunks not started yet
+            break
+        if epsilon is not None:
+            if samples == n:
+                achieved = 0.0
+                break
+            bernstein = _empirical_bernstein(squares * (scale * n) ** 2, total * scale * n, samples, value_range,
+                                             bernstein_log)
+            hoeffding = value_range * math.sqrt(hoeffding_log / (2 * samples))
+            achieved = min(bernstein, hoeffding)
+            if achieved <= epsilon:
+                break
+    values = total * scale * n / max(samples, 1)
+    info = {"samples": samples}
+    if epsilon is not None:
+        info.update(epsilon=achieved if len(elements) else 0.0, delta=delta)
+    if budget is not None:
+        info.update(budget.report())
+    return dict(zip(elements, values.tolist())), info
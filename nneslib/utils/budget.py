@@ -0,0 +1,136 @@
+import time
+from typing import Callable, Iterable
+
+from nneslib.utils.parallel import parallel_imap, parallel_map
+
+
+__all__ = ['Budget', 'budgeted_map']
+
+# Tasks per worker submitted ahead of the budget checks, so that a stop leaves little started work behind
+BUDGET_PREFETCH = 4
+
+
+class Budget(object):
+    def __init__(self, time_limit: float = None, max_work: int = None,
+                 callback: Callable[[int, int], object] = None):
+        """
+        The limits of an anytime computation, and how far it went.
+
+        A method given a budget splits its work into units (sources swept, node removals, walks, cliques, as its
+        documentation says) and checks the budget after every chunk of them. Once the time limit or the work limit is
+        reached, or :meth:`cancel` was called, it stops and returns a partial result computed from the completed
+        units. Its `attrs` then hold the "coverage" (the completed fraction of the work), whether it is "complete" and
+        what "stopped" it: "time", "work", "cancelled" or None.
+
+        A budget can be reused, every method call starts it again. A :meth:`cancel` is not undone by that: it also
+        stops the computations that have not started yet, e.g. when it comes from another thread before the method
+        starts its budget.
+
+        :param time_limit: If not None, the number of seconds after which the computation stops
+        :param max_work: If not None, the number of work units after which the computation stops
+        :param callback: If not None, called as callback(done, total) after every chunk of work, total being None when
+          the method can not know it. Returning False cancels the computation
+
+        .. rubric:: Example
+
+        >>> from nneslib.edge import edge_significance
+        >>> from nneslib.utils.budget import Budget
+        >>> import networkx as nx
+        >>> G = nx.barabasi_albert_graph(5000, 3, seed=0)
+        >>> es = edge_significance.betweenness_centrality(G, seed=0, budget=Budget(time_limit=1.0))
+        >>> es.attrs["coverage"], es.attrs["samples"]
+        """
+        self.time_limit = time_limit
+        self.max_work = max_work
+        self.callback = callback
+        self.done = 0
+        self.total = None
+        self.stopped = None
+        self.cancelled = False
+        self._start = None
+
+    def start(self, total: int = None) -> int:
+        """
+        Start the clock of a computation of `total` work units.
+
+        :return: the number of work units the computation may do
+        """
+        self.done, self.total, self.stopped = 0, total, None
+        self._start = time.monotonic()
+        if self.max_work is None:
+            return total
+        return self.max_work if total is None else min(total, self.max_work)
+
+    @property
+    def deadline(self) -> float:
+        """
+        The `time.monotonic()` time the computation has to stop at, None without a time limit.
+        """
+        return None if self.time_limit is None else self._start + self.time_limit
+
+    def cancel(self) -> None:
+        """
+        Stop the computation at its next check, e.g. from the callback or another thread, and every later one.
+        """
+        self.cancelled = True
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        Whether the computation has to stop.
+        """
+        if self.stopped is None:
+            if self.cancelled:
+                self.stopped = "cancelled"
+            elif self.max_work is not None and self.done >= self.max_work:
+                self.stopped = "work"
+            elif self.time_limit is not None and time.monotonic() >= self.deadline:
+                self.stopped = "time"
+        return self.stopped is not None
+
+    def advance(self, work: int) -> bool:
+        """
+        Record completed work units and report the progress.
+
+        :return: whether the computation may go on
+        """
+        self.done += work
+        if self.callback is not None and self.callback(self.done, self.total) is False:
+            self.stopped = "cancelled"
+        return not self.exhausted
+
+    def report(self, coverage: float = None, complete: bool = None) -> dict:
+        """
+        The attrs of a result computed under this budget.
+
+        :param coverage: If None, the fraction of the total work done
+        :param complete: If None, whether the total work was done
+        """
+        if coverage is None:
+            coverage = self.done / self.total if self.total else 1.0
+        if complete is None:
+            complete = self.total is not None and self.done >= self.total
+        return {"coverage": min(coverage, 1.0), "complete": complete, "stopped": None if complete else self.stopped,
+                "seconds": time.monotonic() - self._start}
+
+
+def budgeted_map(function: Callable, tasks: Iterable, budget: Budget, work: Callable, n_jobs: int = None,
+                 initializer: Callable = None, initargs: tuple = ()) -> list:
+    """
+    :func:`nneslib.utils.parallel.parallel_map`, stopping after the task that exhausts the budget. The tasks not
+    started yet are cancelled.
+
+    :param budget: If None, all tasks run
+    :param work: the function giving the number of work units of a task
+    :return: the results of the completed tasks, in task order
+    """
+    if budget is None:
+        return parallel_map(function, tasks, n_jobs, initializer, initargs)
+    tasks = list(tasks)
+    results, iterator = [], parallel_imap(function, tasks, n_jobs, initializer, initargs, BUDGET_PREFETCH)
+    for task, result in zip(tasks, iterator):
+        results.append(result)
+        if not budget.advance(work(task)):
+            break
+    iterator.close()
+    return results
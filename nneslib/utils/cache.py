@@ -0,0 +1,245 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+
+import networkx as nx
+import numpy as np
+
+from nneslib import __version__
+from nneslib.classes.csr_graph import CSRGraph
+
+__all__ = ['graph_fingerprint', 'ResultCache']
+
+# Number of nodes or edges hashed per update of the digest
+_HASH_CHUNK = 1 << 14
+
+# Arguments that change how a result is computed but not the result itself. A budget may truncate the result, which is
+# then not stored, see ResultCache.compute
+_UNKEYED_ARGUMENTS = ("context", "n_jobs", "budget")
+
+
+def _is_random(parameters: dict) -> bool:
+    """
+    Whether a call draws fresh randomness: it has a seed left to None and simulates walks (ruo) or samples sources
+    (k of the betweenness, epsilon).
+    """
+    if "seed" not in parameters or parameters["seed"] is not None:
+        return False
+    return "ruo" in parameters or parameters.get("k") is not None or parameters.get("epsilon") is not None
+
+
+def _json_default(value):
+    """
+    The JSON value of a NumPy scalar. Any other object has no stable key, its repr may hold a memory address.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Parameter value {value!r} of type {type(value)} is not JSON serializable")
+
+
+def graph_fingerprint(graph: nx.Graph) -> str:
+    """
+    Content hash of a graph: its kind, its nodes and its edges with all their attributes, in iteration order.
+
+    Two graphs with the same fingerprint give the same results, including the orientation of the (u, v) edge keys,
+    which follows graph.edges().
+
+    :param graph: the networkx graph object to be used. A CSRGraph is hashed from its arrays
+    :return: a sha256 hex digest
+    """
+    digest = hashlib.sha256()
+    if isinstance(graph, CSRGraph):
+        digest.update(f"{type(graph).__name__}|{graph.is_directed()}".encode())
+        nodes = graph.nodes()
+        for start in range(0, len(nodes), _HASH_CHUNK):
+            digest.update(repr(nodes[start:start + _HASH_CHUNK]).encode())
+        for name in ("indptr", "indices", "weights"):
+            array = getattr(graph, name)
+            digest.update(f"|{name}|".encode())
+            if array is not None:
+                digest.update(np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("<")).tobytes())
+        return digest.hexdigest()
+    digest.update(f"{type(graph).__name__}|{graph.is_directed()}|{graph.is_multigraph()}".encode())
+    nodes = list(graph.nodes())
+    for start in range(0, len(nodes), _HASH_CHUNK):
+        digest.update(repr(nodes[start:start + _HASH_CHUNK]).encode())
+    digest.update(b"|edges|")
+    chunk = []
+    for u, v, data in graph.edges(data=True):
+        chunk.append((u, v, sorted(data.items(), key=repr)))
+        if len(chunk) == _HASH_CHUNK:
+            digest.update(repr(chunk).encode())
+            chunk = []
+    digest.update(repr(chunk).encode())
+    return digest.hexdigest()
+
+
+class ResultCache(object):
+    def __init__(self, directory: str = None, max_bytes: int = 1 << 30):
+        """
+        A persistent cache of Significance results, keyed by the graph fingerprint, the method and its parameters, and
+        the nneslib version, so that an upgrade never reads the results of an older implementation.
+
+        Every result is one file of the cache directory. Reading a result refreshes its modification time, and when
+        the directory grows past max_bytes the least recently used results are evicted.
+
+        :param directory: the cache directory, created if needed. If None, $NNESLIB_CACHE or ~/.cache/nneslib
+        :param max_bytes: the size bound of the directory
+
+        .. rubric:: Example
+
+        >>> from nneslib.utils.cache import ResultCache
+        >>> from nneslib.node import node_significance
+        >>> import networkx as nx
+        >>> G = nx.karate_club_graph()
+        >>> cache = ResultCache("/tmp/nneslib-cache")
+        >>> ns = cache.compute(node_significance.EffC, G)
+        >>> ns = cache.compute(node_significance.EffC, G)  # read back from the cache
+        >>> cache.stats
+        """
+        if directory is None:
+            directory = os.environ.get("NNESLIB_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "nneslib"))
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(fingerprint: str, method_name: str, method_parameters: dict = None) -> str:
+        """
+        The cache key of a result, for the installed nneslib version.
+
+        :param fingerprint: the :func:`graph_fingerprint` of the graph
+        :param method_name: the name of the method
+        :param method_parameters: the parameters the result depends on, JSON serializable (NumPy scalars included)
+        :return: a sha256 hex digest
+        :raise: :class:`TypeError` if a parameter is not JSON serializable
+        """
+        parameters = json.dumps(method_parameters or {}, sort_keys=True, default=_json_default)
+        return hashlib.sha256(f"{__version__}|{fingerprint}|{method_name}|{parameters}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str, graph: nx.Graph):
+        """
+        Look a result up.
+
+        :param key: the cache key, see :meth:`key`
+        :param graph: the graph the returned Significance refers to
+        :return: the Significance object, or None on a miss. An entry that no longer unpickles, e.g. written by
+          another nneslib version whose classes moved, is removed and counts as a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                cls, significance, method_name, method_parameters, attrs = pickle.load(file)
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        except (EOFError, ValueError, AttributeError, ImportError, pickle.UnpicklingError):
+            self.misses += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        self.hits += 1
+        return cls(significance, graph, method_name, method_parameters, attrs)
+
+    def put(self, key: str, result) -> None:
+        """
+        Store a result, without its graph, and evict the least recently used results beyond max_bytes.
+
+        :param key: the cache key, see :meth:`key`
+        :param result: a NodeSignificance or EdgeSignificance object
+        """
+        # the profile of the computation does not describe a cache hit
+        attrs = {name: value for name, value in (getattr(result, "attrs", None) or {}).items() if name != "profile"}
+        record = (type(result), result.significance, result.method_name, result.method_parameters, attrs or None)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            pickle.dump(record, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self._path(key))  # readers never see a partial file
+        self._evict()
+
+    def _entries(self) -> list:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                try:
+                    status = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, name))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, name in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            size -= entry_size
+            self.evictions += 1
+
+    def compute(self, method, graph: nx.Graph, *args, **kwargs):
+        """
+        Return the result of method(graph, *args, **kwargs) from the cache, computing and storing it on a miss.
+
+        The key uses the module and name of method and all its bound arguments (defaults included), except context
+        and n_jobs which do not change the result. Random calls, which sample with a seed left to None, and calls with
+        a parameter that is not JSON serializable are never cached. A call with a budget may be answered from the
+        cache, but its own result is never stored, as it may be partial; nor is any result whose attrs say it is not
+        complete.
+
+        :param method: a method of :mod:`nneslib.node.node_significance` or :mod:`nneslib.edge.edge_significance`
+        :param graph: the networkx graph object to be used
+        :return: the Significance object
+        """
+        arguments = inspect.signature(method).bind(graph, *args, **kwargs)
+        arguments.apply_defaults()
+        parameters = {name: value for name, value in list(arguments.arguments.items())[1:]
+                      if name not in _UNKEYED_ARGUMENTS}
+        if _is_random(parameters):
+            return method(graph, *args, **kwargs)
+        context = arguments.arguments.get("context")
+        fingerprint = context.fingerprint if context is not None else graph_fingerprint(graph)
+        try:
+            key = self.key(fingerprint, f"{method.__module__}.{method.__qualname__}", parameters)
+        except TypeError:
+            return method(graph, *args, **kwargs)
+        result = self.get(key, graph)
+        if result is None:
+            result = method(graph, *args, **kwargs)
+            complete = (getattr(result, "attrs", None) or {}).get("complete", True)
+            if arguments.arguments.get("budget") is None and complete is not False:
+                self.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        """
+        Remove every cached result.
+        """
+        for _, _, name in self._entries():
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    @property
+    def stats(self) -> dict:
+        """
+        The hits, misses and evictions of this object, and the number of entries and bytes of the directory.
+        """
+        entries = self._entries()
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries)}
@@ -0,0 +1,158 @@
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+from nneslib.classes.csr_graph import CSRGraph
+
+__all__ = ['to_csr', 'edge_indexed_csr', 'binary_adjacency', 'lookup', 'common_neighbors']
+
+
+def to_csr(graph: nx.Graph, weight: str = None, nodelist: list = None) -> tuple:
+    """
+    Build the CSR (compressed sparse row) adjacency matrix of a graph.
+
+    Undirected edges are stored in both directions, parallel edges of multigraphs are summed. The matrix of a
+    :class:`CSRGraph` shares its arrays.
+
+    :param graph: the networkx graph object (or CSRGraph) to be used
+    :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+      Any edge attribute not present defaults to 1.
+    :param nodelist: the rows and columns are ordered according to the nodes in nodelist. If None, the ordering is
+      produced by graph.nodes().
+    :return: a (n, n) `scipy.sparse.csr_matrix` and the list of nodes labelling its rows/columns
+    """
+    if isinstance(graph, CSRGraph):
+        matrix, nodes = graph.adjacency(weight), graph.nodes()
+        if nodelist is None or list(nodelist) == nodes:
+            return matrix, nodes
+        permutation = np.array([graph.node_index[node] for node in nodelist], dtype=np.int64)
+        return matrix[permutation][:, permutation].tocsr(), list(nodelist)
+    nodes = list(graph.nodes()) if nodelist is None else list(nodelist)
+    index = {node: i for i, node in enumerate(nodes)}
+    n, m = len(nodes), graph.number_of_edges()
+    src = np.fromiter((index[u] for u, _ in graph.edges()), dtype=np.int64, count=m)
+    dst = np.fromiter((index[v] for _, v in graph.edges()), dtype=np.int64, count=m)
+    if weight is None:
+        data = np.ones(m)
+    else:
+        data = np.fromiter((w for _, _, w in graph.edges(data=weight, default=1)), dtype=np.float64, count=m)
+    if not graph.is_directed():  # For undirected graph A[u][v] == A[v][u], self-loops are stored once
+        off_diagonal = src != dst
+        src, dst = np.concatenate([src, dst[off_diagonal]]), np.concatenate([dst, src[off_diagonal]])
+        data = np.concatenate([data, data[off_diagonal]])
+    matrix = sp.csr_matrix((data, (src, dst)), shape=(n, n))
+    matrix.sum_duplicates()
+    return matrix, nodes
+
+
+def edge_indexed_csr(graph: nx.Graph, weight: str = None) -> tuple:
+    """
+    Build a CSR adjacency whose slots also know which edge of graph.edges() they belong to.
+
+    Self-loops are left out, and so are the parallel edges of multigraphs except the first one.
+
+    :param graph: the networkx graph object (or CSRGraph) to be used
+    :param weight: If None, all edge weights are 1. Otherwise holds the name of the edge attribute used as weight.
+      Any edge attribute not present defaults to 1.
+    :return: the nodes, the edges (in graph.edges() order), the (|E|, 2) node indices of the edge endpoints, and the
+      indptr, neighbor index, edge id and weight arrays of the CSR slots. An undirected edge has a slot in the row
+      of each endpoint, a directed one only in the row of its source.
+    """
+    if isinstance(graph, CSRGraph):
+        nodes, edges = graph.nodes(), graph.edges()
+        sources, targets, stored = graph.edge_arrays()
+        ends = np.stack([sources, targets], axis=1)
+        weights = np.ones(len(edges)) if weight is None or stored is None else stored.astype(np.float64)
+    else:
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = [(u, v) for u, v in graph.edges()]
+        ends = np.array([(index[u], index[v]) for u, v in edges], dtype=np.int64).reshape(-1, 2)
+        if weight is None:
+            weights = np.ones(len(edges))
+        else:
+            weights = np.fromiter((w for _, _, w in graph.edges(data=weight, default=1)), dtype=np.float64,
+                                  count=len(edges))
+    edge_ids = np.arange(len(edges))
+    n = len(nodes)
+    if graph.is_directed():
+        keys = ends[:, 0] * n + ends[:, 1]
+    else:
+        keys = np.minimum(ends[:, 0], ends[:, 1]) * n + np.maximum(ends[:, 0], ends[:, 1])
+    _, first = np.unique(keys, return_index=True)
+    kept = np.zeros(len(edges), dtype=bool)
+    kept[first] = True
+    kept &= ends[:, 0] != ends[:, 1]
+    rows, cols, slot_edges = ends[kept, 0], ends[kept, 1], edge_ids[kept]
+    if not graph.is_directed():
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        slot_edges = np.concatenate([slot_edges, slot_edges])
+    order = np.lexsort((cols, rows))
+    rows, cols, slot_edges = rows[order], cols[order], slot_edges[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return nodes, edges, ends, indptr, cols, slot_edges, weights[slot_edges]
+
+
+def binary_adjacency(adjacency: sp.csr_matrix) -> sp.csr_matrix:
+    """
+    The 0/1 pattern of an adjacency matrix without its self-loops.
+
+    :param adjacency: a (n, n) sparse matrix
+    :return: a (n, n) `scipy.sparse.csr_matrix` with sorted indices
+    """
+    coo = sp.coo_matrix(adjacency)
+    keep = (coo.row != coo.col) & (coo.data != 0)
+    binary = sp.csr_matrix((np.ones(np.count_nonzero(keep)), (coo.row[keep], coo.col[keep])), shape=adjacency.shape)
+    binary.sum_duplicates()
+    binary.data[:] = 1
+    return binary
+
+
+def lookup(matrix: sp.csr_matrix, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """
+    Vectorized element lookup in a CSR matrix.
+
+    :param matrix: a `scipy.sparse.csr_matrix` without duplicate entries
+    :param rows: the row index of every wanted element
+    :param cols: the column index of every wanted element
+    :return: the values of matrix[rows[i], cols[i]], 0 where the element is not stored
+    """
+    matrix = matrix.tocsr()
+    matrix.sort_indices()
+    n_cols = np.int64(matrix.shape[1])
+    stored = np.repeat(np.arange(matrix.shape[0], dtype=np.int64), np.diff(matrix.indptr)) * n_cols + matrix.indices
+    wanted = np.asarray(rows, dtype=np.int64) * n_cols + np.asarray(cols, dtype=np.int64)
+    if len(stored) == 0:
+        return np.zeros(len(wanted), dtype=matrix.dtype)
+    position = np.minimum(np.searchsorted(stored, wanted), len(stored) - 1)
+    return np.where(stored[position] == wanted, matrix.data[position], 0)
+
+
+def common_neighbors(adjacency: sp.csr_matrix, sources: np.ndarray, targets: np.ndarray,
+                     chunk_size: int = None) -> np.ndarray:
+    """
+    Count the common neighbours of node pairs, i.e. the entries :math:`(A^2)_{st}` of a binary adjacency matrix.
+    For the pairs that are edges this is :math:`A \\circ A^2`, the number of triangles through every edge.
+
+    :param adjacency: a binary (n, n) adjacency matrix, see :func:`binary_adjacency`
+    :param sources: the first node index of every pair
+    :param targets: the second node index of every pair
+    :param chunk_size: If None, :math:`A^2` is built at once. Otherwise only chunk_size of its rows are held in
+      memory at a time, for graphs whose fill-in does not fit.
+    :return: the number of common neighbours of every pair
+    """
+    sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+    n = adjacency.shape[0]
+    chunk_size = max(n, 1) if chunk_size is None else chunk_size
+    order = np.argsort(sources, kind="stable")
+    sorted_sources = sources[order]
+    counts = np.zeros(len(sources))
+    for start in range(0, n, chunk_size):
+        low, high = np.searchsorted(sorted_sources, [start, start + chunk_size])
+        if low == high:
+            continue
+        paths = adjacency[start:start + chunk_size] @ adjacency
+        pairs = order[low:high]
+        counts[pairs] = lookup(paths, sources[pairs] - start, targets[pairs])
+    return counts
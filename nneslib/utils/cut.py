@@ -1,5 +1,29 @@
 import networkx as nx
-from typing import List
+import numpy as np
+import scipy.sparse as sp
+from typing import List, NamedTuple, Union
+
+from nneslib.classes.graph_context import GraphContext, graph_context
+
+
+__all__ = ['ratio_cut', 'CutScores', 'partition_cuts']
+
+# Default bound on the stored entries of the A @ H product of one chunk of partitions
+_CHUNK_ENTRIES = 1 << 24
+
+
+def _community_cuts(adjacency: sp.csr_matrix, indicator: sp.csr_matrix, directed: bool) -> np.ndarray:
+    """
+    The cut size of every community, i.e. column of the (n, K) 0/1 indicator matrix H.
+
+    With :math:`s` the row sums of A, the weight leaving community k is :math:`(H^Ts)_k - (H^TAH)_{kk}`, the
+    diagonal coming from one sparse product. A directed cut also counts the weight entering the community.
+    """
+    internal = np.asarray(indicator.multiply(adjacency @ indicator).sum(axis=0)).ravel()
+    cuts = indicator.T @ np.asarray(adjacency.sum(axis=1)).ravel() - internal
+    if directed:
+        cuts += indicator.T @ np.asarray(adjacency.sum(axis=0)).ravel() - internal
+    return np.maximum(cuts, 0)  # rounding may leave tiny negative cuts of isolated communities
 
 
 def ratio_cut(graph: nx.Graph, sequences: List[list]) -> float:
@@ -9,9 +33,112 @@ def ratio_cut(graph: nx.Graph, sequences: List[list]) -> float:
     .. math:: RatioCut(C_1,\\dots,C_c) = \\sum_{i=1}^c \\frac{R(C_i, \\bar{C}_i)}{|C_i|}
 
     where the :math:`|C_i|` is the size of the community. and :math:`R` is the size of the cut between two sets of nodes.
+    All cut sizes come from one sparse indicator-matrix product, see :func:`partition_cuts` to score many partitions.
+
     :param graph: the networkx graph object to be used
     :param sequences: A list of sequences of nodes in graph
     :return: The score of the RatioCut
     """
-    ratiocut = sum([nx.cut_size(graph, sequence)/len(sequence) for sequence in sequences])
-    return ratiocut
+    context = GraphContext(graph)
+    index = context.node_index
+    members = [{index[node] for node in sequence} for sequence in sequences]
+    rows = np.fromiter((node for community in members for node in community), dtype=np.int64)
+    cols = np.repeat(np.arange(len(members)), [len(community) for community in members])
+    indicator = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(index), len(members)))
+    cuts = _community_cuts(context.adjacency(), indicator, graph.is_directed())
+    return float(sum(cut / len(sequence) for cut, sequence in zip(cuts.tolist(), sequences)))
+
+
+class CutScores(NamedTuple):
+    """
+    The cut scores of partitions: one value per partition, or floats for a single partition.
+
+    `cut_size` is the total weight of the edges between communities. `conductance` is the one of the worst community,
+    :math:`\\max_k R(C_k, \\bar{C}_k) / \\min(vol(C_k), vol(\\bar{C}_k))`.
+    """
+    cut_size: Union[np.ndarray, float]
+    ratio_cut: Union[np.ndarray, float]
+    normalized_cut: Union[np.ndarray, float]
+    conductance: Union[np.ndarray, float]
+
+
+def _labels(partitions, nodes: list) -> tuple:
+    """
+    The (p, n) label array of partitions given as a label array, a stack of them, a {node: label} dict or a list of
+    such dicts, and whether a single partition was given.
+    """
+    if isinstance(partitions, dict):
+        return _labels([partitions], nodes)[0], True
+    if isinstance(partitions, list) and partitions and isinstance(partitions[0], dict):
+        partitions = [[partition[node] for node in nodes] for partition in partitions]
+    single = np.ndim(partitions) == 1
+    labels = np.asarray([partitions] if single else partitions)
+    if labels.ndim != 2 or labels.shape[1] != len(nodes):
+        raise ValueError(f"Expected partitions labelling the {len(nodes)} nodes, got an array of shape {labels.shape}")
+    return labels, single
+
+
+def partition_cuts(graph: nx.Graph, partitions, weight: str = None, chunk_size: int = None,
+                   context: GraphContext = None) -> CutScores:
+    """
+    Score many partitions of the nodes at once: ratio cut, normalized cut and conductance.
+
+    .. math:: Ncut(C_1,\\dots,C_c) = \\sum_{i=1}^c \\frac{R(C_i, \\bar{C}_i)}{vol(C_i)}
+
+    The communities of a chunk of partitions are stacked into one sparse (n, K) indicator matrix H, and all of their
+    cut sizes come from the diagonal of :math:`H^TAH`, computed by one product against the CSR adjacency. The volume
+    of a community is the sum of its degrees (in + out for directed graphs); the cut of a directed community counts
+    the edges leaving and entering it. A community of volume 0 adds 0 to the normalized cut and has conductance 0.
+
+    :param graph: the networkx graph object to be used
+    :param partitions: a partition as an array of the community label of every node in graph.nodes() order, or as a
+      {node: label} dict; or a (p, n) array or a list of such partitions
+    :param weight: If None, all edge weights are considered equal. Otherwise holds the name of the edge attribute used as weight.
+    :param chunk_size: the number of partitions per product. If None, chunks keep A @ H around 16M stored entries
+    :param context: If not None, the GraphContext of graph to take the adjacency matrix and the degrees from
+    :return: a CutScores of arrays with one value per partition, or of floats for a single partition
+    :raise: :class:`ValueError` if a partition does not label every node
+
+    .. rubric:: Example
+
+    >>> from nneslib.utils.cut import partition_cuts
+    >>> import networkx as nx
+    >>> import numpy as np
+    >>> G = nx.karate_club_graph()
+    >>> partitions = np.random.default_rng(0).integers(0, 2, size=(1000, 34))
+    >>> scores = partition_cuts(G, partitions)
+    >>> best = partitions[np.argmin(scores.normalized_cut)]
+    """
+    context = graph_context(graph, context)
+    adjacency, degrees, nodes = context.adjacency(weight), context.degrees(weight), context.nodes
+    labels, single = _labels(partitions, nodes)
+    p, n = labels.shape
+    total_volume = degrees.sum()
+    if chunk_size is None:
+        chunk_size = max(1, _CHUNK_ENTRIES // max(adjacency.nnz, 1))
+    scores = np.zeros((4, p))
+    for start in range(0, p, chunk_size):
+        chunk = labels[start:start + chunk_size]
+        # the communities of partition i are the columns offsets[i]:offsets[i + 1] of H
+        inverse = [np.unique(row, return_inverse=True)[1].ravel() for row in chunk]
+        counts = [int(row.max()) + 1 if len(row) else 0 for row in inverse]
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        cols = np.concatenate([row + offset for row, offset in zip(inverse, offsets[:-1])])
+        rows = np.tile(np.arange(n), len(chunk))
+        indicator = sp.csr_matrix((np.ones(len(cols)), (rows, cols)), shape=(n, offsets[-1]))
+        cuts = _community_cuts(adjacency, indicator, graph.is_directed())
+        sizes = np.bincount(cols, minlength=offsets[-1])
+        volumes = np.bincount(cols, weights=np.tile(degrees, len(chunk)), minlength=offsets[-1])
+        smaller = np.minimum(volumes, total_volume - volumes)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = np.where(volumes > 0, cuts / volumes, 0.0)
+            conductance = np.where(smaller > 0, cuts / smaller, 0.0)
+        starts = offsets[:-1][np.array(counts) > 0]
+        present = np.flatnonzero(np.array(counts) > 0) + start
+        scores[0, present] = np.add.reduceat(cuts, starts) / 2
+        scores[1, present] = np.add.reduceat(cuts / np.maximum(sizes, 1), starts)
+        scores[2, present] = np.add.reduceat(normalized, starts)
+        scores[3, present] = np.maximum.reduceat(conductance, starts)
+    if single:
+        return CutScores(*(float(score[0]) for score in scores))
+    return CutScores(*scores)
@@ -0,0 +1,172 @@
+from itertools import islice
+from typing import Iterator
+
+import numpy as np
+
+from nneslib.classes.binary_format import MAGIC, read_arrays, write_arrays
+from nneslib.classes.csr_graph import _unique
+
+
+__all__ = ['EDGE_CHUNK_SIZE', 'write_edge_list', 'edge_chunks', 'stream_degrees', 'label_lookup', 'label_indices']
+
+# Edges read, and held in memory, at a time by the streaming methods
+EDGE_CHUNK_SIZE = 1 << 20
+
+# Integer labels below this bound (or a few times the number of nodes) are indexed by a table rather than a search
+DENSE_SPAN = 1 << 20
+
+
+def write_edge_list(filepath: str, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray = None) -> None:
+    """
+    Write an edge list to a binary file of :func:`nneslib.classes.binary_format.write_arrays`, which the streaming
+    methods memory-map instead of parsing text.
+
+    :param filepath: the file path to write
+    :param sources: the integer labels of the source nodes
+    :param targets: the integer labels of the target nodes
+    :param weights: If not None, the weight of every edge
+    """
+    arrays = {"sources": np.asarray(sources, dtype=np.int64), "targets": np.asarray(targets, dtype=np.int64)}
+    if weights is not None:
+        arrays["weights"] = np.asarray(weights, dtype=np.float64)
+    write_arrays(filepath, {"kind": "edge_list"}, arrays)
+
+
+def _is_binary(filepath: str) -> bool:
+    with open(filepath, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def _text_chunks(filepath: str, chunk_size: int, weighted: bool, delimiter: str, comments: str, skiprows: int,
+                 dtype) -> Iterator[tuple]:
+    options = dict(delimiter=delimiter, comments=comments, ndmin=2)
+    with open(filepath) as file:
+        for _ in islice(file, skiprows):
+            pass
+        while True:
+            lines = list(islice(file, chunk_size))
+            if not lines:
+                return
+            ends = np.loadtxt(lines, dtype=dtype, usecols=(0, 1), **options)
+            weights = np.loadtxt(lines, dtype=np.float64, usecols=(2,), **options).ravel() if weighted else None
+            if len(ends):
+                yield ends[:, 0], ends[:, 1], weights
+
+
+def _binary_chunks(filepath: str, chunk_size: int, weighted: bool) -> Iterator[tuple]:
+    arrays = read_arrays(filepath)[1]
+    if weighted and "weights" not in arrays:
+        raise ValueError(f"{filepath} has no weights")
+    for start in range(0, len(arrays["sources"]), chunk_size):
+        end = start + chunk_size
+        weights = np.asarray(arrays["weights"][start:end]) if weighted else None
+        yield np.asarray(arrays["sources"][start:end]), np.asarray(arrays["targets"][start:end]), weights
+
+
+def edge_chunks(filepath: str, chunk_size: int = EDGE_CHUNK_SIZE, weighted: bool = False, delimiter: str = None,
+                comments: str = "#", skiprows: int = 0, dtype=np.int64) -> Iterator[tuple]:
+    """
+    Read an edge list chunk by chunk, from a binary file of :func:`write_edge_list` (memory-mapped) or a text file with
+    one "source target [weight]" line per edge (chunk_size lines at a time).
+
+    :param filepath: the file path to read
+    :param chunk_size: the number of edges (text lines) per chunk
+    :param weighted: whether to read the weights, from the third column of a text file
+    :param delimiter: the column separator of a text file, None for any whitespace
+    :param comments: the prefix of the comment lines of a text file
+    :param skiprows: the number of header lines of a text file to skip
+    :param dtype: the dtype of the labels of a text file
+    :return: an iterator of (sources, targets, weights) label arrays, weights being None if not weighted
+    :raise: :class:`ValueError` if a label does not parse as dtype, or a binary file has no weights
+    """
+    if _is_binary(filepath):
+        return _binary_chunks(filepath, chunk_size, weighted)
+    return _text_chunks(filepath, chunk_size, weighted, delimiter, comments, skiprows, dtype)
+
+
+def _is_dense(values: np.ndarray, n: int) -> bool:
+    """
+    Whether integer labels are indexed by a table spanning them, no longer than DENSE_SPAN or a few times n.
+    """
+    if values.dtype.kind not in "iu":
+        return False
+    return not len(values) or (values.min() >= 0 and values.max() < max(4 * n, DENSE_SPAN))
+
+
+def label_indices(labels: np.ndarray, values: np.ndarray, lookup: np.ndarray = None) -> np.ndarray:
+    """
+    The indices of the labels values among the sorted labels, through the table lookup of :func:`label_lookup` if
+    given. Otherwise, the distinct values are searched in sorted order, much faster than random queries.
+    """
+    if lookup is not None:
+        return lookup[values]
+    distinct, inverse = _unique(values, return_inverse=True)
+    return np.searchsorted(labels, distinct)[inverse]
+
+
+def label_lookup(labels: np.ndarray) -> np.ndarray:
+    """
+    The table of the index of every integer label, None if the labels are not dense, see :func:`label_indices`.
+    """
+    if not _is_dense(labels, len(labels)):
+        return None
+    lookup = np.full(labels[-1] + 1 if len(labels) else 0, -1, dtype=np.int64)
+    lookup[labels] = np.arange(len(labels))
+    return lookup
+
+
+def _degree_pass(chunks: Iterator[tuple]) -> tuple:
+    """
+    Dense integer labels are counted directly by bincount over a table of all labels. Other labels, or integer labels
+    too sparse for a table, are kept sorted with their degrees, merging the new labels of every chunk.
+    """
+    labels, degrees, m = None, None, 0
+    counts, present = np.zeros(0), np.zeros(0, dtype=bool)
+    for sources, targets, weights in chunks:
+        ends = np.concatenate([sources, targets])
+        weights = None if weights is None else np.tile(weights, 2)
+        m += len(sources)
+        if labels is None and _is_dense(ends, np.count_nonzero(present) + len(ends)):
+            size = max(len(counts), int(ends.max()) + 1 if len(ends) else 0)
+            counts = np.pad(counts, (0, size - len(counts))) + np.bincount(ends, weights, size)
+            present = np.pad(present, (0, size - len(present)))
+            present[ends] = True
+            continue
+        if labels is None:
+            labels = np.flatnonzero(present).astype(ends.dtype, copy=False)
+            degrees = counts[present]
+        distinct = _unique(ends)
+        positions = np.searchsorted(labels, distinct).clip(max=max(len(labels) - 1, 0))
+        new = distinct[labels[positions] != distinct] if len(labels) else distinct
+        if len(new):
+            # new nodes: move the degrees to their places among the merged labels
+            merged = np.sort(np.concatenate([labels, new]))
+            moved = np.zeros(len(merged))
+            moved[np.searchsorted(merged, labels)] = degrees
+            labels, degrees = merged, moved
+        degrees += np.bincount(label_indices(labels, ends), weights, len(labels))
+    if labels is None:
+        labels, degrees = np.flatnonzero(present), counts[present]
+    return labels, degrees, m
+
+
+def stream_degrees(filepath: str, chunk_size: int = EDGE_CHUNK_SIZE, weighted: bool = False, delimiter: str = None,
+                   comments: str = "#", skiprows: int = 0) -> tuple:
+    """
+    Count the (weighted) degree of every node in one pass over an edge list, see :func:`edge_chunks`. Only the sorted
+    labels, the degrees and one chunk are held in memory, O(n + chunk_size) rather than O(m).
+
+    Every line counts, so repeated edges count as parallel edges. As graph.degree() counts it, a self-loop adds 2 and
+    the degree of a directed edge list is the in-degree plus the out-degree. The labels of a text file are integers if
+    they all parse as such, strings otherwise.
+
+    :return: the sorted node labels, their degrees (floats) and the number of edges
+    """
+    options = dict(weighted=weighted, delimiter=delimiter, comments=comments, skiprows=skiprows)
+    try:
+        labels, degrees, m = _degree_pass(edge_chunks(filepath, chunk_size, **options))
+    except ValueError:
+        if _is_binary(filepath):
+            raise
+        labels, degrees, m = _degree_pass(edge_chunks(filepath, chunk_size, dtype=str, **options))
+    return labels, degrees, m
@@ -0,0 +1,81 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+
+__all__ = ['effective_n_jobs', 'parallel_imap', 'parallel_map']
+
+
+def effective_n_jobs(n_jobs: int = None) -> int:
+    """
+    Resolve the number of worker processes to use.
+
+    :param n_jobs: None or 1 means no process pool. A negative value counts back from the number of CPUs, so -1 uses
+      all of them.
+    :return: the number of worker processes
+    :raise: :class:`ValueError` if n_jobs is 0
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs == 0:
+        raise ValueError("n_jobs == 0 has no meaning")
+    if n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def parallel_imap(function: Callable, tasks: Iterable, n_jobs: int = None,
+                  initializer: Callable = None, initargs: tuple = (), prefetch: int = None) -> Iterator:
+    """
+    Lazily apply `function` to every task, yielding the results in task order.
+
+    The tasks run in the calling process when a single job is requested, otherwise they are spread over a
+    :class:`concurrent.futures.ProcessPoolExecutor`. `function` and `initializer` must be picklable, i.e. defined at
+    module level. Large read-only inputs should be handed to the workers once through `initializer` rather than
+    inside every task.
+
+    All tasks are submitted at once, so a slow task never leaves the other workers idle. A consumer that may stop
+    early, such as a budget, passes `prefetch` to keep only that many tasks per worker submitted ahead of the
+    results it consumed. Closing the iterator early cancels the tasks not started yet and only waits for the running
+    ones.
+
+    :param function: the function applied to every task
+    :param tasks: an iterable of task arguments
+    :param n_jobs: the number of worker processes, see :func:`effective_n_jobs`
+    :param initializer: called once in every worker (or once in the calling process) before any task
+    :param initargs: arguments passed to initializer
+    :param prefetch: If not None, the number of tasks per worker submitted ahead of the results consumed
+    :return: an iterator over the results
+    """
+    tasks = list(tasks)
+    n_jobs = min(effective_n_jobs(n_jobs), len(tasks))
+    if n_jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield function(task)
+        return
+    window = len(tasks) if prefetch is None else max(prefetch, 1) * n_jobs
+    executor = ProcessPoolExecutor(n_jobs, initializer=initializer, initargs=initargs)
+    futures = deque()
+    try:
+        remaining = iter(tasks)
+        futures.extend(executor.submit(function, task) for task in islice(remaining, window))
+        while futures:
+            result = futures.popleft().result()
+            futures.extend(executor.submit(function, task) for task in islice(remaining, 1))
+            yield result
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def parallel_map(function: Callable, tasks: Iterable, n_jobs: int = None,
+                 initializer: Callable = None, initargs: tuple = ()) -> list:
+    """
+    Apply `function` to every task and return the results in task order. See :func:`parallel_imap`.
+    """
+    return list(parallel_imap(function, tasks, n_jobs, initializer, initargs))
@@ -0,0 +1,136 @@
+import contextvars
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from functools import wraps
+from typing import Callable
+
+
+__all__ = ['Profiler', 'profiled', 'phase']
+
+# The active Profiler, and the (profiler, record) of the method being profiled
+_PROFILER = contextvars.ContextVar("nneslib_profiler", default=None)
+_RECORD = contextvars.ContextVar("nneslib_profile_record", default=None)
+_DISABLED = nullcontext()
+
+
+class Profiler(object):
+    def __init__(self, callback: Callable[[str, dict], None] = None, trace_memory: bool = False):
+        """
+        Collect the phases the significance methods report while the profiler is active.
+
+        Inside a `with Profiler()` block, every result of :mod:`nneslib.node.node_significance` and
+        :mod:`nneslib.edge.edge_significance` gets `attrs["profile"]`, a dict with the "method", its total "seconds",
+        the "nodes" and "edges" of the graph and the list of its "phases". A phase holds its "name", "seconds",
+        "allocated_blocks" (the net change of the memory blocks allocated by the interpreter) and the problem sizes the
+        method reports, e.g. the number of sources of a shortest-path phase. Outside of a profiler the hooks only cost
+        a context variable lookup.
+
+        :param callback: If not None, called as callback(method, phase) whenever a phase ends
+        :param trace_memory: whether to record the "peak_bytes" of every phase with tracemalloc, which slows down
+          allocations while it is on
+
+        .. rubric:: Example
+
+        >>> from nneslib.edge import edge_significance
+        >>> from nneslib.utils.profiling import Profiler
+        >>> import networkx as nx
+        >>> G = nx.karate_club_graph()
+        >>> with Profiler() as profiler:
+        ...     es = edge_significance.diffusion_importance(G)
+        >>> es.attrs["profile"]["phases"]
+        """
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.profiles = []
+        self._token = None
+        self._tracing = False
+
+    def __enter__(self) -> "Profiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._token = _PROFILER.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _PROFILER.reset(self._token)
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def summary(self) -> dict:
+        """
+        The total seconds of every "method/phase" over the profiled calls.
+        """
+        totals = {}
+        for profile in self.profiles:
+            for record in profile["phases"]:
+                key = f"{profile['method']}/{record['name']}"
+                totals[key] = totals.get(key, 0.0) + record["seconds"]
+        return totals
+
+
+class _Phase(object):
+    def __init__(self, profiler: Profiler, record: dict, name: str, sizes: dict):
+        self.profiler = profiler
+        self.record = record
+        self.phase = dict(name=name, **sizes)
+
+    def __enter__(self) -> dict:
+        if self.profiler.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._traced = tracemalloc.get_traced_memory()[0]
+        self._blocks = sys.getallocatedblocks()
+        self._start = time.perf_counter()
+        return self.phase
+
+    def __exit__(self, *exc_info) -> None:
+        self.phase["seconds"] = time.perf_counter() - self._start
+        self.phase["allocated_blocks"] = sys.getallocatedblocks() - self._blocks
+        if self.profiler.trace_memory and tracemalloc.is_tracing():
+            self.phase["peak_bytes"] = tracemalloc.get_traced_memory()[1] - self._traced
+        self.record["phases"].append(self.phase)
+        if self.profiler.callback is not None:
+            self.profiler.callback(self.record["method"], self.phase)
+
+
+def phase(name: str, **sizes):
+    """
+    Time a phase of the method being profiled. Without an active :class:`Profiler` this is a shared no-op context.
+
+    :param name: the phase name, e.g. "adjacency" or "eigensolver"
+    :param sizes: the problem sizes of the phase, recorded with it
+    :return: a context manager, yielding the phase dict (to add sizes known at the end) when profiling
+    """
+    active = _RECORD.get()
+    if active is None:
+        return _DISABLED
+    return _Phase(active[0], active[1], name, sizes)
+
+
+def profiled(function: Callable) -> Callable:
+    """
+    Decorate a method taking the graph first and returning a Significance, so that its phases are recorded in
+    `attrs["profile"]` of the result while a :class:`Profiler` is active.
+    """
+    method = f"{function.__module__.rsplit('.', 1)[-1]}.{function.__name__}"
+
+    @wraps(function)
+    def wrapper(graph, *args, **kwargs):
+        profiler = _PROFILER.get()
+        if profiler is None:
+            return function(graph, *args, **kwargs)
+        record = {"method": method, "nodes": graph.number_of_nodes(), "edges": graph.number_of_edges(), "phases": []}
+        token = _RECORD.set((profiler, record))
+        start = time.perf_counter()
+        try:
+            result = function(graph, *args, **kwargs)
+        finally:
+            _RECORD.reset(token)
+        record["seconds"] = time.perf_counter() - start
+        result.attrs = dict(result.attrs or {}, profile=record)
+        profiler.profiles.append(record)
+        return result
+    return wrapper
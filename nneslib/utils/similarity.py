@@ -1,3 +1,16 @@
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+from nneslib.classes.graph_context import GraphContext, graph_context
+
+
+__all__ = ['jaccard_similarity', 'jaccard_edges', 'jaccard_top_k', 'jaccard_threshold']
+
+# Default bound on the stored entries of one chunk of rows of A @ A^T
+_CHUNK_ENTRIES = 1 << 24
+
+
 def jaccard_similarity(i: set, j: set):
     """
     Calculate Jaccard similarity.
@@ -9,3 +22,134 @@ def jaccard_similarity(i: set, j: set):
     :return: jaccard similarity of two set of nodes.
     """
     return len(i & j) / len(i | j)
+
+
+def _chunks(costs: np.ndarray, chunk_size: int = None) -> list:
+    """
+    Split consecutive items into chunks of chunk_size items, or, if None, into chunks of about `_CHUNK_ENTRIES` total
+    cost.
+
+    :return: the list of (start, end) of the chunks
+    """
+    n = len(costs)
+    if chunk_size is not None:
+        return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    total = np.cumsum(costs)
+    bounds = np.searchsorted(total, np.arange(_CHUNK_ENTRIES, total[-1] if n else 0, _CHUNK_ENTRIES), side="right")
+    bounds = np.unique(np.concatenate([[0], bounds, [n]]))
+    return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _jaccard_blocks(adjacency: sp.csr_matrix, chunk_size: int = None):
+    """
+    Yield the rows [start, end) of the Jaccard matrix as COO arrays, leaving out the diagonal and the pairs without
+    common neighbors. The intersections of a chunk come from one sparse product :math:`A_{[start, end)}A^T` and the
+    unions from the degrees, :math:`|N(u) \\cup N(v)| = d_u + d_v - |N(u) \\cap N(v)|`.
+
+    :return: the rows, columns and similarities of the stored pairs
+    """
+    degrees = np.diff(adjacency.indptr)
+    transposed = adjacency.T.tocsc()
+    # the stored entries of row u of A A^T are at most the number of paths u -> w <- v
+    paths = adjacency @ np.asarray(adjacency.sum(axis=0)).ravel()
+    for start, end in _chunks(paths, chunk_size):
+        block = (adjacency[start:end] @ transposed).tocoo()
+        rows, cols, intersections = block.row + start, block.col, block.data
+        off_diagonal = rows != cols
+        rows, cols, intersections = rows[off_diagonal], cols[off_diagonal], intersections[off_diagonal]
+        yield rows, cols, intersections / (degrees[rows] + degrees[cols] - intersections)
+
+
+def jaccard_edges(graph: nx.Graph, chunk_size: int = None, context: GraphContext = None) -> dict:
+    """
+    The Jaccard similarity of the neighbor sets of the endpoints of every edge, e.g. to find redundant links.
+
+    .. math:: J(u, v) = \\frac{|N(u) \\cap N(v)|}{|N(u) \\cup N(v)|}
+
+    Neighbor sets leave out the node itself, and are successor sets in a directed graph. J is 0 when both sets are
+    empty. The intersections are the entries of :math:`AA^T` at the edges, computed chunk by chunk of edges as the
+    elementwise products of the sparse rows of their endpoints, and the unions come from the degrees.
+
+    :param graph: the networkx graph object to be used
+    :param chunk_size: the number of edges per chunk. If None, chunks hold about 16M entries of adjacency rows
+    :param context: If not None, the GraphContext of graph to take the adjacency matrix from
+    :return: a dict of {edge: similarity}, in graph.edges() order
+
+    .. rubric:: Example
+
+    >>> from nneslib.utils.similarity import jaccard_edges
+    >>> import networkx as nx
+    >>> G = nx.karate_club_graph()
+    >>> similarity = jaccard_edges(G)
+    """
+    context = graph_context(graph, context)
+    adjacency = context.binary_adjacency()
+    sources, targets = context.edge_ends
+    degrees = np.diff(adjacency.indptr)
+    intersections = np.zeros(len(sources))
+    for start, end in _chunks(degrees[sources] + degrees[targets], chunk_size):
+        # the entries of A A^T at the edges, as the products of the rows of their endpoints
+        rows = adjacency[sources[start:end]].multiply(adjacency[targets[start:end]])
+        intersections[start:end] = np.asarray(rows.sum(axis=1)).ravel()
+    unions = degrees[sources] + degrees[targets] - intersections
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where((unions > 0) & (sources != targets), intersections / unions, 0.0)
+    return dict(zip(context.edges, values.tolist()))
+
+
+def jaccard_top_k(graph: nx.Graph, k: int, chunk_size: int = None, context: GraphContext = None) -> dict:
+    """
+    The k nodes most similar to every node, over all pairs of nodes, see :func:`jaccard_edges`.
+
+    Only the pairs with a common neighbor can have a positive similarity, and those are the stored entries of
+    :math:`AA^T`, which is built chunk by chunk of its rows so that the dense n x n result never exists. Ties are
+    broken by node order.
+
+    :param graph: the networkx graph object to be used
+    :param k: the number of similar nodes kept per node. Fewer are returned for nodes with fewer nodes at distance 2
+    :param chunk_size: the number of rows of :math:`AA^T` held in memory at once. If None, chunks have about 16M
+      stored entries
+    :param context: If not None, the GraphContext of graph to take the adjacency matrix from
+    :return: a dict of {node: [(similar node, similarity), ...]}, from the most similar one
+    """
+    context = graph_context(graph, context)
+    nodes = context.nodes
+    top = {node: [] for node in nodes}
+    for rows, cols, values in _jaccard_blocks(context.binary_adjacency(), chunk_size):
+        order = np.lexsort((cols, -values, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        first = np.searchsorted(rows, rows, side="left")
+        keep = np.arange(len(rows)) - first < k
+        for row, col, value in zip(rows[keep].tolist(), cols[keep].tolist(), values[keep].tolist()):
+            top[nodes[row]].append((nodes[col], value))
+    return top
+
+
+def jaccard_threshold(graph: nx.Graph, threshold: float, chunk_size: int = None,
+                      context: GraphContext = None) -> sp.csr_matrix:
+    """
+    All pairs of distinct nodes whose similarity is at least threshold, see :func:`jaccard_edges`. The chunks of
+    :math:`AA^T` are filtered as they are built, so only the kept pairs are held in memory.
+
+    :param graph: the networkx graph object to be used
+    :param threshold: the minimum similarity, in (0, 1]
+    :param chunk_size: the number of rows of :math:`AA^T` held in memory at once. If None, chunks have about 16M
+      stored entries
+    :param context: If not None, the GraphContext of graph to take the adjacency matrix from
+    :return: a symmetric (n, n) `scipy.sparse.csr_matrix` of the kept similarities, in graph.nodes() order
+    :raise: :class:`ValueError` if threshold is not in (0, 1], which would keep pairs without common neighbors
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+    context = graph_context(graph, context)
+    n = len(context.nodes)
+    kept_rows, kept_cols, kept_values = [], [], []
+    for rows, cols, values in _jaccard_blocks(context.binary_adjacency(), chunk_size):
+        keep = values >= threshold
+        kept_rows.append(rows[keep])
+        kept_cols.append(cols[keep])
+        kept_values.append(values[keep])
+    if not kept_rows:
+        return sp.csr_matrix((n, n))
+    return sp.csr_matrix((np.concatenate(kept_values), (np.concatenate(kept_rows), np.concatenate(kept_cols))),
+                         shape=(n, n))
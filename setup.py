@@ -1,11 +1,16 @@
+import re
+
 import setuptools
 
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
+with open("nneslib/__init__.py", "r") as fh:
+    version = re.search(r'__version__ = "(.+)"', fh.read()).group(1)
+
 setuptools.setup(
     name="nneslib",
-    version="0.1",
+    version=version,
     author="Mingyi Liu",
     author_email="icecity96@outlook.com",
     description="nneslib is a Python library for evaluating nodes/edges importance in a graph",